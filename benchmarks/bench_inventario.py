@@ -0,0 +1,484 @@
+"""
+============================================================
+Benchmark: bench_inventario.py
+============================================================
+Descripción: Mide el tiempo de las operaciones CRUD, la
+búsqueda y los reportes sobre inventarios sintéticos de
+distintos tamaños. Los reportes se ejecutan con la salida
+estándar suprimida y los resultados se guardan en JSON
+para comparar entre commits. Una segunda pasada con
+tracemalloc registra la memoria máxima de cada operación
+(sus tiempos no se usan, porque tracemalloc los infla).
+
+Los módulos agregados después de la primera versión
+(columnar, busqueda, cache_reportes, paralelo, binario)
+se importan si existen; en commits anteriores a ellos
+las mediciones que los usan se omiten.
+
+Uso (desde la carpeta del proyecto):
+    python -m benchmarks.bench_inventario
+    python -m benchmarks.bench_inventario --tamanos 1000 100000
+    python -m benchmarks.bench_inventario --sin-memoria
+    python -m benchmarks.bench_inventario --comparar antes.json despues.json
+============================================================
+"""
+
+import argparse
+import builtins
+import contextlib
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from modulos.cambios import Inventario, insertar_producto, modificar_campo, quitar_producto
+from modulos.operaciones import generar_codigo, buscar_producto, listar_productos
+from modulos.servicios import (
+    pagina_productos,
+    calcular_reporte_por_categoria,
+    calcular_reporte_stock_bajo,
+    calcular_reporte_valor
+)
+from modulos.reportes import (
+    reporte_por_categoria,
+    reporte_stock_bajo,
+    reporte_valor_inventario
+)
+
+# Módulos opcionales: None si el commit medido no los tiene
+try:
+    from modulos.columnar import InventarioColumnar
+except ImportError:
+    InventarioColumnar = None
+try:
+    from modulos.busqueda import buscar_por_nombre
+except ImportError:
+    buscar_por_nombre = None
+try:
+    from modulos.cache_reportes import limpiar_cache
+except ImportError:
+    limpiar_cache = None
+try:
+    from modulos.paralelo import calcular_reportes_paralelo
+except ImportError:
+    calcular_reportes_paralelo = None
+try:
+    from modulos.binario import escribir_binario, cargar_binario, abrir_binario
+except ImportError:
+    escribir_binario = cargar_binario = abrir_binario = None
+
+TAMANOS_POR_DEFECTO = (1000, 100000, 1000000)
+
+# -------------------------------------------------------------
+# Distribuciones sintéticas: pocas categorías concentran la
+# mayoría de los productos y cada proveedor atiende algunas
+# categorías con más frecuencia que otras.
+# -------------------------------------------------------------
+PESOS_CATEGORIAS = {
+    "Accesorios": 35,
+    "Electrónica": 25,
+    "Almacenamiento": 15,
+    "Audio": 12,
+    "Networking": 8,
+    "Software": 5
+}
+PROVEEDORES_POR_CATEGORIA = {
+    "Accesorios": ("OfficeSupply", "TechDistributor", "OfficialHP"),
+    "Electrónica": ("TechDistributor", "SamsungOfficial", "AppleStore", "OfficialHP"),
+    "Almacenamiento": ("TechDistributor", "SamsungOfficial"),
+    "Audio": ("SonyStore", "AppleStore", "OfficeSupply"),
+    "Networking": ("TechDistributor", "OfficialHP"),
+    "Software": ("AppleStore", "OfficeSupply")
+}
+MARCAS = ("Logitech", "Samsung", "Sony", "Dell", "HP", "Razer", "Kingston", "Apple", "TP-Link", "Corsair")
+TIPOS = {
+    "Accesorios": ("Mouse", "Teclado", "Cámara Web", "Base", "Hub USB"),
+    "Electrónica": ("Laptop", "Monitor", "Tablet", "Proyector"),
+    "Almacenamiento": ("Disco Duro", "SSD", "Pendrive", "Memoria SD"),
+    "Audio": ("Auriculares", "Parlante", "Micrófono"),
+    "Networking": ("Router", "Switch", "Access Point"),
+    "Software": ("Licencia Office", "Antivirus", "Suite Diseño")
+}
+
+OPERACIONES_POR_MEDICION = 1000
+CONSULTAS_BUSQUEDA = 200
+REPETICIONES_REPORTE = 3
+
+
+def generar_inventario(cantidad, semilla=42, tipo=Inventario):
+    """
+    Construye un inventario sintético con distribuciones
+    realistas de categoría, proveedor, precio y stock.
+
+    Parámetros:
+        cantidad (int): Cantidad de productos
+        semilla (int): Semilla del generador aleatorio
+        tipo (type): Inventario (dict) o InventarioColumnar
+    Retorna:
+        dict: Inventario sintético
+    """
+    azar = random.Random(semilla)
+    categorias = list(PESOS_CATEGORIAS)
+    pesos = list(PESOS_CATEGORIAS.values())
+    inventario = tipo()
+
+    for numero in range(1, cantidad + 1):
+        categoria = azar.choices(categorias, pesos)[0]
+        tipo_producto = azar.choice(TIPOS[categoria])
+        # Precio log-normal: muchos productos baratos y pocos caros
+        precio = round(min(max(azar.lognormvariate(10.5, 1.2), 100.0), 5000000.0), 2)
+        # Stock con ~5% agotado y cola larga de reposición
+        stock = 0 if azar.random() < 0.05 else int(azar.expovariate(1 / 25))
+        inventario[f"P{numero:03d}"] = {
+            "nombre": f"{tipo_producto} {azar.choice(MARCAS)} {azar.randint(100, 9999)}",
+            "precio": precio,
+            "stock": stock,
+            "categoria": categoria,
+            "proveedor": azar.choice(PROVEEDORES_POR_CATEGORIA[categoria])
+        }
+    return inventario
+
+
+@contextlib.contextmanager
+def salida_suprimida():
+    """
+    Redirige la salida estándar a os.devnull para que la
+    terminal no domine la medición.
+    """
+    with open(os.devnull, "w", encoding="utf-8") as nulo, contextlib.redirect_stdout(nulo):
+        yield
+
+
+@contextlib.contextmanager
+def entradas_simuladas(respuestas):
+    """
+    Reemplaza input() por una secuencia fija de respuestas.
+
+    Parámetros:
+        respuestas (list): Textos que devolverá input()
+    """
+    original = builtins.input
+    iterador = iter(respuestas)
+    builtins.input = lambda mensaje="": next(iterador)
+    try:
+        yield
+    finally:
+        builtins.input = original
+
+
+def medir(funcion, repeticiones=1):
+    """
+    Ejecuta una función varias veces y registra los tiempos.
+    Si tracemalloc está activo, registra además la memoria
+    máxima que usó por encima de la que había al empezar.
+
+    Parámetros:
+        funcion (function): Función sin parámetros
+        repeticiones (int): Cantidad de ejecuciones
+    Retorna:
+        dict: tiempos (list), minimo y mediana en segundos
+        (y memoria_maxima en bytes con tracemalloc activo)
+    """
+    rastreando = tracemalloc.is_tracing()
+    if rastreando:
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    resultado = {
+        "tiempos": tiempos,
+        "minimo": min(tiempos),
+        "mediana": statistics.median(tiempos)
+    }
+    if rastreando:
+        resultado["memoria_maxima"] = tracemalloc.get_traced_memory()[1] - base
+    return resultado
+
+
+def medir_por_operacion(funcion, cantidad):
+    """
+    Mide una función que ejecuta 'cantidad' operaciones y
+    agrega el tiempo promedio por operación.
+
+    Parámetros:
+        funcion (function): Función sin parámetros
+        cantidad (int): Operaciones que realiza la función
+    Retorna:
+        dict: Resultado de medir() más por_operacion
+    """
+    resultado = medir(funcion)
+    resultado["operaciones"] = cantidad
+    resultado["por_operacion"] = resultado["minimo"] / cantidad
+    return resultado
+
+
+def medir_memoria(cantidad, tipo):
+    """
+    Construye el inventario con tracemalloc activo para
+    obtener la memoria máxima usada.
+
+    Parámetros:
+        cantidad (int): Cantidad de productos
+        tipo (type): Inventario (dict) o InventarioColumnar
+    Retorna:
+        dict: memoria_actual y memoria_maxima en bytes
+    """
+    tracemalloc.start()
+    inventario = generar_inventario(cantidad, tipo=tipo)
+    actual, maxima = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del inventario
+    return {"memoria_actual": actual, "memoria_maxima": maxima,
+            "bytes_por_producto": actual / cantidad}
+
+
+def ejecutar_escenario(cantidad, tipo=Inventario, memoria=True):
+    """
+    Mide todas las operaciones sobre un inventario del
+    tamaño indicado. Con memoria=True repite las mediciones
+    con tracemalloc activo y agrega a cada operación su
+    memoria_maxima (los tiempos son los de la primera pasada).
+
+    Parámetros:
+        cantidad (int): Cantidad de productos
+        tipo (type): Inventario (dict) o InventarioColumnar
+        memoria (bool): Medir la memoria de cada operación
+    Retorna:
+        dict: {operacion: resultado}
+    """
+    resultados = {"memoria": medir_memoria(cantidad, tipo)}
+    resultados.update(medir_operaciones(cantidad, tipo))
+    if memoria:
+        tracemalloc.start()
+        try:
+            con_memoria = medir_operaciones(cantidad, tipo)
+        finally:
+            tracemalloc.stop()
+        for operacion, medicion in con_memoria.items():
+            if "memoria_maxima" in medicion:
+                resultados[operacion]["memoria_maxima"] = medicion["memoria_maxima"]
+    return resultados
+
+
+def medir_operaciones(cantidad, tipo):
+    """
+    Construye un inventario y mide cada operación sobre él.
+    Las que dependen de un módulo opcional ausente se omiten.
+
+    Parámetros:
+        cantidad (int): Cantidad de productos
+        tipo (type): Inventario (dict) o InventarioColumnar
+    Retorna:
+        dict: {operacion: resultado}
+    """
+    resultados = {}
+    inicio = time.perf_counter()
+    inventario = generar_inventario(cantidad, tipo=tipo)
+    resultados["construir_inventario"] = {"minimo": time.perf_counter() - inicio}
+
+    azar = random.Random(7)
+    codigos = list(inventario)
+    muestra = [dict(inventario[azar.choice(codigos)]) for _ in range(OPERACIONES_POR_MEDICION)]
+    nuevos = []
+
+    # --- Reportes (la primera ejecución construye los índices) ---
+    # Se vacía la caché en cada repetición para medir el cálculo
+    def sin_cache(reporte):
+        if limpiar_cache is not None:
+            limpiar_cache(inventario)
+        reporte(inventario)
+
+    with salida_suprimida():
+        for nombre, reporte in (("reporte_por_categoria", reporte_por_categoria),
+                                ("reporte_stock_bajo", reporte_stock_bajo),
+                                ("reporte_valor_inventario", reporte_valor_inventario)):
+            resultados[nombre] = medir(lambda: sin_cache(reporte), REPETICIONES_REPORTE)
+    # Los reportes de nuevo sin cambios en el inventario (tablero)
+    resultados["reportes_en_cache"] = medir(
+        lambda: [calcular(inventario) for calcular in (calcular_reporte_por_categoria,
+                                                       calcular_reporte_stock_bajo,
+                                                       calcular_reporte_valor)],
+        REPETICIONES_REPORTE
+    )
+
+    # --- Los tres reportes desde cero, repartidos entre todos los núcleos ---
+    # (la memoria registrada es solo la del proceso principal)
+    if calcular_reportes_paralelo is not None:
+        resultados["reportes_paralelo"] = medir(lambda: calcular_reportes_paralelo(inventario))
+
+    # --- Listado paginado: primera página y luego salir ---
+    def listar_primera_pagina():
+        with entradas_simuladas(["x"]):
+            listar_productos(inventario)
+
+    with salida_suprimida():
+        resultados["listar_productos"] = medir(listar_primera_pagina, REPETICIONES_REPORTE)
+    resultados["pagina_ordenada_precio"] = medir(
+        lambda: pagina_productos(inventario, 50, cantidad // 2, orden="precio"),
+        REPETICIONES_REPORTE
+    )
+
+    # --- CRUD ---
+    resultados["generar_codigo"] = medir_por_operacion(
+        lambda: [generar_codigo(inventario) for _ in range(OPERACIONES_POR_MEDICION)],
+        OPERACIONES_POR_MEDICION
+    )
+
+    def insertar():
+        for producto in muestra:
+            codigo = generar_codigo(inventario)
+            insertar_producto(inventario, codigo, producto)
+            nuevos.append(codigo)
+
+    def modificar():
+        for codigo in nuevos:
+            modificar_campo(inventario, codigo, "stock", azar.randint(0, 100))
+
+    def quitar():
+        for codigo in nuevos:
+            quitar_producto(inventario, codigo)
+
+    resultados["insertar_producto"] = medir_por_operacion(insertar, OPERACIONES_POR_MEDICION)
+    resultados["modificar_campo"] = medir_por_operacion(modificar, OPERACIONES_POR_MEDICION)
+    resultados["quitar_producto"] = medir_por_operacion(quitar, OPERACIONES_POR_MEDICION)
+
+    # --- Búsqueda ---
+    palabras = [inventario[azar.choice(codigos)]["nombre"].split()[0][:4]
+                for _ in range(CONSULTAS_BUSQUEDA)]
+    if buscar_por_nombre is not None:
+        resultados["buscar_por_nombre"] = medir_por_operacion(
+            lambda: [buscar_por_nombre(inventario, palabra, limite=20) for palabra in palabras],
+            CONSULTAS_BUSQUEDA
+        )
+        # Misma consulta con una letra cambiada, en modo aproximado
+        con_error = [palabra[:2] + "x" + palabra[3:] for palabra in palabras]
+        resultados["buscar_aproximado"] = medir_por_operacion(
+            lambda: [buscar_por_nombre(inventario, palabra, limite=20, aproximada=True)
+                     for palabra in con_error],
+            CONSULTAS_BUSQUEDA
+        )
+
+    def buscar_en_menu():
+        respuestas = []
+        for palabra in palabras[:10]:
+            respuestas += ["2", palabra]
+        with entradas_simuladas(respuestas), salida_suprimida():
+            for _ in range(10):
+                buscar_producto(inventario)
+
+    resultados["buscar_producto_menu"] = medir_por_operacion(buscar_en_menu, 10)
+
+    # --- Instantánea binaria: guardar, cargar completa y abrir con mmap ---
+    if escribir_binario is None:
+        return resultados
+    with tempfile.TemporaryDirectory() as carpeta:
+        ruta = os.path.join(carpeta, "inventario.snapshot.bin")
+        resultados["guardar_instantanea"] = medir(lambda: escribir_binario(ruta, inventario))
+        resultados["cargar_instantanea"] = medir(lambda: cargar_binario(ruta, tipo()))
+
+        def abrir_y_consultar():
+            with abrir_binario(ruta) as instantanea:
+                for codigo in codigos[:OPERACIONES_POR_MEDICION]:
+                    instantanea[codigo]
+
+        resultados["abrir_instantanea_mmap"] = medir(abrir_y_consultar)
+    return resultados
+
+
+def commit_actual():
+    """
+    Obtiene el hash del commit actual de git (si existe).
+
+    Retorna:
+        str: Hash corto del commit o None
+    """
+    try:
+        salida = subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                                capture_output=True, text=True, check=True)
+        return salida.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def comparar(ruta_antes, ruta_despues):
+    """
+    Muestra la razón de tiempos entre dos ejecuciones.
+
+    Parámetros:
+        ruta_antes (str): JSON de la ejecución base
+        ruta_despues (str): JSON de la ejecución nueva
+    """
+    with open(ruta_antes, encoding="utf-8") as archivo:
+        antes = json.load(archivo)
+    with open(ruta_despues, encoding="utf-8") as archivo:
+        despues = json.load(archivo)
+
+    print(f"  {antes['commit']} -> {despues['commit']}")
+    for tamano, escenario in despues["escenarios"].items():
+        base = antes["escenarios"].get(tamano)
+        if base is None:
+            continue
+        print(f"\n  📦 {tamano} productos")
+        for operacion, resultado in escenario.items():
+            if operacion == "memoria" or operacion not in base:
+                continue
+            nuevo = resultado["minimo"]
+            viejo = base[operacion]["minimo"]
+            razon = viejo / nuevo if nuevo else float("inf")
+            print(f"  {operacion:<26} {viejo:>10.4f}s {nuevo:>10.4f}s  x{razon:,.2f}")
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Benchmarks del inventario")
+    parser.add_argument("--tamanos", type=int, nargs="+", default=list(TAMANOS_POR_DEFECTO))
+    parser.add_argument("--columnar", action="store_true",
+                        help="Usar InventarioColumnar en lugar de dict")
+    parser.add_argument("--sin-memoria", action="store_true",
+                        help="No repetir las mediciones con tracemalloc")
+    parser.add_argument("--salida", default="bench_output.json")
+    parser.add_argument("--comparar", nargs=2, metavar=("ANTES", "DESPUES"))
+    opciones = parser.parse_args(argumentos)
+
+    if opciones.comparar:
+        comparar(*opciones.comparar)
+        return
+
+    if opciones.columnar and InventarioColumnar is None:
+        parser.error("--columnar requiere modulos/columnar.py")
+    tipo = InventarioColumnar if opciones.columnar else Inventario
+    resultado = {
+        "commit": commit_actual(),
+        "fecha": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "almacenamiento": tipo.__name__,
+        "escenarios": {}
+    }
+
+    for tamano in opciones.tamanos:
+        print(f"  ⏱️  Midiendo {tamano} productos...", file=sys.stderr)
+        escenario = ejecutar_escenario(tamano, tipo, memoria=not opciones.sin_memoria)
+        resultado["escenarios"][str(tamano)] = escenario
+        for operacion, medicion in escenario.items():
+            if operacion == "memoria":
+                continue
+            memoria = medicion.get("memoria_maxima")
+            extra = f"  {memoria / 1024:>10,.0f} KiB" if memoria is not None else ""
+            print(f"     {operacion:<26} {medicion['minimo']:.4f}s{extra}", file=sys.stderr)
+
+    with open(opciones.salida, "w", encoding="utf-8") as archivo:
+        json.dump(resultado, archivo, indent=2)
+    print(f"  ✅ Resultados guardados en {opciones.salida}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+============================================================
+Benchmark: bench_stock.py
+============================================================
+Descripción: Mide el rendimiento de las reservas de stock
+con varios hilos que venden a la vez, la mayoría sobre
+unos pocos productos muy demandados. Compara los
+candados por franja de modulos/stock.py con un candado
+único por inventario (franjas=1) y verifica que no se
+pierdan ventas.
+
+Uso (desde la carpeta del proyecto):
+    python -m benchmarks.bench_stock
+    python -m benchmarks.bench_stock --hilos 1 4 16 --operaciones 20000
+============================================================
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+
+from benchmarks.bench_inventario import generar_inventario, commit_actual
+from modulos.stock import preparar_stock, reservar, confirmar, liberar, FRANJAS
+
+PRODUCTOS = 10000
+PRODUCTOS_DEMANDADOS = 4
+PROPORCION_DEMANDADOS = 0.8
+PROPORCION_CANCELADAS = 0.1
+
+
+def vender(inventario, codigos, demandados, operaciones, semilla, resultado):
+    """
+    Simula un punto de venta: reserva una unidad y la
+    confirma (o a veces la cancela).
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+        codigos (list): Todos los códigos
+        demandados (list): Códigos con más ventas
+        operaciones (int): Ventas a simular
+        semilla (int): Semilla del generador aleatorio
+        resultado (dict): Acumula confirmadas y rechazadas
+    """
+    azar = random.Random(semilla)
+    confirmadas = {}
+    rechazadas = 0
+    for _ in range(operaciones):
+        lista = demandados if azar.random() < PROPORCION_DEMANDADOS else codigos
+        codigo = azar.choice(lista)
+        es_valido, id_reserva = reservar(inventario, codigo, 1)
+        if not es_valido:
+            rechazadas += 1
+            continue
+        if azar.random() < PROPORCION_CANCELADAS:
+            liberar(inventario, id_reserva)
+        elif confirmar(inventario, id_reserva)[0]:
+            confirmadas[codigo] = confirmadas.get(codigo, 0) + 1
+    resultado["confirmadas"].append(confirmadas)
+    resultado["rechazadas"].append(rechazadas)
+
+
+def ejecutar(hilos, operaciones, franjas):
+    """
+    Ejecuta una medición y comprueba el stock final.
+
+    Parámetros:
+        hilos (int): Cantidad de hilos vendiendo
+        operaciones (int): Ventas por hilo
+        franjas (int): Candados del estado de stock
+    Retorna:
+        dict: segundos, operaciones_por_segundo y consistente
+    """
+    inventario = generar_inventario(PRODUCTOS)
+    codigos = list(inventario)
+    demandados = codigos[:PRODUCTOS_DEMANDADOS]
+    for codigo in codigos:
+        inventario[codigo]["stock"] = 10 ** 9
+    inicial = {codigo: datos["stock"] for codigo, datos in inventario.items()}
+    preparar_stock(inventario, franjas)
+
+    resultado = {"confirmadas": [], "rechazadas": []}
+    trabajadores = [
+        threading.Thread(target=vender, args=(inventario, codigos, demandados, operaciones, semilla, resultado))
+        for semilla in range(hilos)
+    ]
+    inicio = time.perf_counter()
+    for trabajador in trabajadores:
+        trabajador.start()
+    for trabajador in trabajadores:
+        trabajador.join()
+    segundos = time.perf_counter() - inicio
+
+    # Cada venta confirmada debe haber descontado exactamente una unidad
+    vendidas = {}
+    for confirmadas in resultado["confirmadas"]:
+        for codigo, cantidad in confirmadas.items():
+            vendidas[codigo] = vendidas.get(codigo, 0) + cantidad
+    consistente = all(inventario[c]["stock"] == inicial[c] - vendidas.get(c, 0) for c in codigos)
+
+    total = hilos * operaciones
+    return {
+        "segundos": segundos,
+        "operaciones_por_segundo": total / segundos,
+        "rechazadas": sum(resultado["rechazadas"]),
+        "consistente": consistente
+    }
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Benchmark de reservas de stock concurrentes")
+    parser.add_argument("--hilos", type=int, nargs="+", default=[1, 4, 8, 16])
+    parser.add_argument("--operaciones", type=int, default=10000, help="Ventas por hilo")
+    parser.add_argument("--salida", default=None, help="Archivo JSON para guardar los resultados")
+    opciones = parser.parse_args(argumentos)
+
+    resultados = {"commit": commit_actual(), "mediciones": []}
+    print(f"  {'Hilos':>5}  {'Candado':<12} {'ops/s':>12} {'Consistente':>12}")
+    for hilos in opciones.hilos:
+        for nombre, franjas in (("inventario", 1), ("franjas", FRANJAS)):
+            medicion = ejecutar(hilos, opciones.operaciones, franjas)
+            medicion.update({"hilos": hilos, "candado": nombre})
+            resultados["mediciones"].append(medicion)
+            print(f"  {hilos:>5}  {nombre:<12} {medicion['operaciones_por_segundo']:>12,.0f} "
+                  f"{'sí' if medicion['consistente'] else 'NO':>12}")
+
+    if opciones.salida:
+        with open(opciones.salida, "w", encoding="utf-8") as archivo:
+            json.dump(resultados, archivo, indent=2)
+        print(f"  ✅ Resultados guardados en {opciones.salida}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -11,23 +11,7 @@ generar reportes y estadísticas.
 ============================================================
 """
 
-# Importación de módulos del proyecto
-from modulos.datos import inventario, categorias_validas, proveedores
-from modulos.menu import mostrar_menu_principal
-from modulos.operaciones import (
-    agregar_producto,
-    buscar_producto,
-    actualizar_producto,
-    eliminar_producto,
-    listar_productos
-)
-from modulos.reportes import (
-    reporte_por_categoria,
-    reporte_stock_bajo,
-    reporte_valor_inventario,
-    reporte_productos_unicos
-)
-from modulos.validaciones import validar_opcion_menu
+import sys
 
 
 def ejecutar_sistema():
@@ -35,19 +19,73 @@ def ejecutar_sistema():
     Función principal que ejecuta el sistema de gestión.
     Implementa un menú iterativo usando while True con break.
     """
+    # Importación de módulos del proyecto (solo el modo interactivo
+    # los necesita todos; el modo por lotes importa lo justo)
+    from modulos.datos import inventario, categorias_validas, proveedores
+    from modulos.menu import mostrar_menu_principal
+    from modulos.operaciones import (
+        agregar_producto,
+        buscar_producto,
+        actualizar_producto,
+        eliminar_producto,
+        listar_productos,
+        filtrar_productos,
+        actualizacion_masiva
+    )
+    from modulos.reportes import (
+        reporte_por_categoria,
+        reporte_stock_bajo,
+        reporte_valor_inventario,
+        reporte_productos_unicos
+    )
+    from modulos.importacion import importar_productos
+    from modulos.almacenamiento import abrir_almacen, cerrar_almacen
+    from modulos.configuracion import cargar_configuracion, obtener_config
+    from modulos.eventos import conectar_archivo, desconectar_archivo, tomar_error
+    from modulos.validaciones import validar_opcion_menu
+    from modulos import metricas
+
     print("=" * 60)
     print("  SISTEMA DE GESTIÓN DE PRODUCTOS")
     print("  Empresa de Tecnología - Automatización Interna")
     print("=" * 60)
 
+    # Leer la configuración (config.json y variables SGP_*)
+    try:
+        cargar_configuracion()
+    except (ValueError, OSError) as error:
+        print(f"\n  ❌ Error en la configuración: {error}")
+        return
+    if obtener_config("modo_perfil") not in metricas.MODOS_PERFIL:
+        print(f"\n  ❌ Error en la configuración: modo_perfil debe ser "
+              f"{' o '.join(metricas.MODOS_PERFIL)}.")
+        return
+
+    # Guardar el inventario por columnas (millones de productos)
+    if obtener_config("inventario_columnar"):
+        from modulos.columnar import a_columnar
+        inventario = a_columnar(inventario)
+
+    # Cargar el inventario guardado (instantánea + diario)
+    abrir_almacen(inventario)
+
+    # Publicar los cambios para otros sistemas (si está configurado)
+    suscripcion = None
+    if obtener_config("archivo_eventos"):
+        suscripcion = conectar_archivo(inventario, obtener_config("archivo_eventos"))
+
+    # Registrar métricas de las operaciones (si está configurado)
+    if obtener_config("metricas") or obtener_config("archivo_metricas"):
+        metricas.activar()
+
     while True:
         # Mostrar menú y capturar opción
         mostrar_menu_principal()
         opcion = input("\n  Seleccione una opción: ").strip()
 
         # Validar que la opción sea un número válido
-        if not validar_opcion_menu(opcion, 1, 9):
-            print("\n  ⚠️  Opción no válida. Ingrese un número del 1 al 9.")
+        if not validar_opcion_menu(opcion, 1, 13):
+            print("\n  ⚠️  Opción no válida. Ingrese un número del 1 al 13.")
             continue
 
         opcion = int(opcion)
@@ -62,25 +100,55 @@ def ejecutar_sistema():
             6: lambda: reporte_por_categoria(inventario),
             7: lambda: reporte_stock_bajo(inventario),
             8: lambda: reporte_valor_inventario(inventario),
+            10: lambda: reporte_productos_unicos(inventario),
+            11: lambda: filtrar_productos(inventario),
+            12: lambda: actualizacion_masiva(inventario),
+            13: lambda: importar_productos(inventario, categorias_validas, proveedores),
         }
 
         if opcion == 9:
             # Salida del sistema con break
             print("\n  ✅ Gracias por usar el Sistema de Gestión de Productos.")
             print("  ✅ ¡Hasta luego!\n")
+            cerrar_almacen(inventario)
+            if suscripcion is not None:
+                try:
+                    desconectar_archivo(inventario, *suscripcion)
+                except (OSError, TypeError, ValueError) as error:
+                    print(f"  ❌ No se pudieron escribir los eventos de cambio: {error}")
+            if obtener_config("archivo_metricas"):
+                metricas.guardar_metricas(obtener_config("archivo_metricas"))
             break
 
         # Ejecutar la acción correspondiente usando get()
         accion = acciones.get(opcion)
-        if accion:
+        if accion and opcion == obtener_config("perfilar_opcion"):
+            # Perfilar solo esta acción (tiempo o memoria)
+            modo = obtener_config("modo_perfil")
+            ruta = f"perfil_opcion_{opcion}.{'prof' if modo == 'cprofile' else 'memoria'}"
+            print("\n" + "-" * 60)
+            _, resumen = metricas.perfilar(accion, modo=modo, ruta=ruta)
+            print("-" * 60)
+            print(f"  🔬 Perfil ({modo}) guardado en {ruta}\n")
+            print(resumen)
+        elif accion:
             print("\n" + "-" * 60)
             accion()
             print("-" * 60)
 
+        # Los cambios ya se aplicaron, pero otros sistemas no se enteraron
+        fallo = tomar_error(inventario)
+        if fallo is not None:
+            print(f"\n  ❌ No se pudieron publicar {fallo[0]} evento(s) de cambio: {fallo[1]}")
+
         # Pausa antes de volver al menú
         input("\n  Presione Enter para continuar...")
 
 
 # Punto de entrada del programa
 if __name__ == "__main__":
+    # Con argumentos (--lotes ...) se ejecuta sin menú
+    if len(sys.argv) > 1:
+        from modulos.lotes import main
+        sys.exit(main())
     ejecutar_sistema()
\ No newline at end of file
@@ -7,9 +7,29 @@ de Productos. Organiza los módulos del proyecto.
 ============================================================
 Módulos disponibles:
     - datos.py:         Estructuras de datos iniciales
+    - configuracion.py: Configuración (archivo, entorno, O(1))
     - validaciones.py:  Funciones de validación
     - operaciones.py:   Operaciones CRUD del sistema
     - reportes.py:      Reportes y estadísticas
     - menu.py:          Menú interactivo
+    - importacion.py:   Carga masiva desde archivos CSV
+    - cambios.py:       Registro de mutaciones del inventario
+    - almacenamiento.py: Persistencia con diario e instantáneas
+    - binario.py:       Formato binario de instantáneas (mmap)
+    - eventos.py:       Eventos de cambio (suscriptores y archivo)
+    - lotes.py:         Modo por lotes (sin menú)
+    - masivo.py:        Actualización masiva de precio o stock
+    - codigos.py:       Asignación de códigos de producto
+    - busqueda.py:      Índice de búsqueda por nombre (exacta y aproximada)
+    - agregados.py:     Totales incrementales para reportes
+    - cache_reportes.py: Caché LRU de reportes por generación
+    - metricas.py:      Métricas de operaciones y perfiles
+    - indices.py:       Índices secundarios (stock bajo, grupos, precios)
+    - columnar.py:      Almacenamiento compacto por columnas
+    - vectorizado.py:   Cálculos de reportes con NumPy (opcional)
+    - paralelo.py:      Reportes repartidos en varios procesos
+    - servidor.py:      Servicio HTTP/JSON con asyncio
+    - stock.py:         Reservas y ajustes de stock entre hilos
+    - servicios.py:     Capa de datos sin entrada/salida
 ============================================================
 """
\ No newline at end of file
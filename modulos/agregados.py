@@ -0,0 +1,265 @@
+"""
+============================================================
+Módulo: agregados.py
+============================================================
+Descripción: Totales del inventario mantenidos en forma
+incremental. Cada alta, modificación o baja ajusta los
+totales globales y por categoría, y el producto de
+mayor valor se guarda en un montículo (heap), por lo
+que los reportes no necesitan recorrer los productos.
+Los extremos de precio salen del índice de precios
+(ver indices.py).
+
+Los valores y la suma de precios se acumulan en centavos
+enteros, porque sumar y restar floats en cada cambio
+acumula errores de redondeo. Las claves "valor" y
+"suma_precios" se derivan de los centavos.
+============================================================
+"""
+
+import heapq
+
+from modulos.cambios import obtener_auxiliar
+from modulos.codigos import clave_codigo
+
+
+def centavos(precio):
+    """
+    Convierte un precio a centavos enteros.
+
+    Parámetros:
+        precio (float): Precio del producto
+    Retorna:
+        int: Precio en centavos
+    """
+    return round(precio * 100)
+
+
+def _nueva_categoria():
+    """
+    Crea los totales vacíos de una categoría.
+
+    Retorna:
+        dict: Totales con productos, stock, centavos, valor y codigos
+    """
+    # 'codigos' es un dict usado como conjunto ordenado
+    return {"productos": 0, "stock": 0, "centavos": 0, "valor": 0.0, "codigos": {}}
+
+
+def _derivar_valores(agregados, categoria):
+    """
+    Actualiza los valores en moneda a partir de los
+    centavos acumulados.
+
+    Parámetros:
+        agregados (dict): Estructura de agregados
+        categoria (dict): Totales de la categoría modificada
+    """
+    agregados["valor"] = agregados["centavos"] / 100
+    agregados["suma_precios"] = agregados["centavos_precios"] / 100
+    categoria["valor"] = categoria["centavos"] / 100
+
+
+def _sumar(agregados, codigo, datos):
+    """
+    Suma un producto a los totales y al montículo.
+
+    Parámetros:
+        agregados (dict): Estructura de agregados
+        codigo (str): Código del producto
+        datos (dict): Datos del producto
+    """
+    precio = centavos(datos["precio"])
+    stock = datos["stock"]
+    valor = precio * stock
+
+    agregados["productos"] += 1
+    agregados["stock"] += stock
+    agregados["centavos"] += valor
+    agregados["centavos_precios"] += precio
+
+    categoria = agregados["categorias"].get(datos["categoria"])
+    if categoria is None:
+        categoria = agregados["categorias"][datos["categoria"]] = _nueva_categoria()
+    categoria["productos"] += 1
+    categoria["stock"] += stock
+    categoria["centavos"] += valor
+    categoria["codigos"][codigo] = None
+    _derivar_valores(agregados, categoria)
+
+    agregados["vigentes"][codigo] = valor
+    heapq.heappush(agregados["valores_max"], (-valor, clave_codigo(codigo), codigo))
+
+
+def _restar(agregados, codigo, datos):
+    """
+    Resta un producto de los totales. Su entrada en el
+    montículo queda obsoleta y se descarta al consultar.
+
+    Parámetros:
+        agregados (dict): Estructura de agregados
+        codigo (str): Código del producto
+        datos (dict): Datos del producto antes del cambio
+    """
+    precio = centavos(datos["precio"])
+    stock = datos["stock"]
+    valor = precio * stock
+
+    agregados["productos"] -= 1
+    agregados["stock"] -= stock
+    agregados["centavos"] -= valor
+    agregados["centavos_precios"] -= precio
+
+    categoria = agregados["categorias"][datos["categoria"]]
+    categoria["productos"] -= 1
+    categoria["stock"] -= stock
+    categoria["centavos"] -= valor
+    del categoria["codigos"][codigo]
+    _derivar_valores(agregados, categoria)
+    if categoria["productos"] == 0:
+        del agregados["categorias"][datos["categoria"]]
+
+    del agregados["vigentes"][codigo]
+
+
+def _reconstruir_monticulo(agregados):
+    """
+    Reconstruye el montículo solo con las entradas
+    vigentes cuando las obsoletas se acumulan.
+
+    Parámetros:
+        agregados (dict): Estructura de agregados
+    """
+    agregados["valores_max"] = [(-valor, clave_codigo(codigo), codigo)
+                                for codigo, valor in agregados["vigentes"].items()]
+    heapq.heapify(agregados["valores_max"])
+
+
+def _construir_vectorizado(inventario):
+    """
+    Calcula los agregados iniciales con NumPy: totales con
+    sumas enteras (centavos) sobre columnas y agrupación
+    con bincount.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+    Retorna:
+        dict: Estructura de agregados
+    """
+    from modulos.vectorizado import extraer_columnas, totales_por_categoria
+    columnas = extraer_columnas(inventario)
+    codigos = columnas["codigos"]
+    precios = (columnas["precios"] * 100).round().astype("int64")
+    valores = precios * columnas["stocks"]
+
+    categorias = {}
+    for categoria, totales in totales_por_categoria(columnas).items():
+        suma = int(valores[totales["filas"]].sum())
+        categorias[categoria] = {
+            "productos": totales["productos"],
+            "stock": totales["stock"],
+            "centavos": suma,
+            "valor": suma / 100,
+            "codigos": dict.fromkeys(codigos[fila] for fila in totales["filas"].tolist())
+        }
+
+    lista_valores = valores.tolist()
+    suma_valores = int(valores.sum())
+    suma_precios = int(precios.sum())
+    agregados = {
+        "productos": len(codigos),
+        "stock": int(columnas["stocks"].sum()),
+        "centavos": suma_valores,
+        "valor": suma_valores / 100,
+        "centavos_precios": suma_precios,
+        "suma_precios": suma_precios / 100,
+        "categorias": categorias,
+        "vigentes": dict(zip(codigos, lista_valores)),
+        "valores_max": [(-valor, clave_codigo(codigo), codigo) for valor, codigo in zip(lista_valores, codigos)]
+    }
+    heapq.heapify(agregados["valores_max"])
+    return agregados
+
+
+def construir_agregados(inventario):
+    """
+    Calcula los agregados recorriendo una sola vez el
+    inventario (con NumPy si está disponible y el
+    inventario es grande).
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+    Retorna:
+        dict: Estructura de agregados
+    """
+    from modulos.vectorizado import conviene_vectorizar
+    if conviene_vectorizar(inventario):
+        return _construir_vectorizado(inventario)
+
+    agregados = {
+        "productos": 0,
+        "stock": 0,
+        "centavos": 0,
+        "valor": 0.0,
+        "centavos_precios": 0,
+        "suma_precios": 0.0,
+        "categorias": {},
+        "vigentes": {},
+        "valores_max": []
+    }
+    for codigo, datos in inventario.items():
+        _sumar(agregados, codigo, datos)
+    return agregados
+
+
+def _actualizar_agregados(agregados, accion, codigo, anterior, actual):
+    """
+    Ajusta los agregados ante una mutación del inventario.
+
+    Parámetros:
+        agregados (dict): Estructura de agregados
+        accion (str): Tipo de mutación (ver cambios.notificar)
+        codigo (str): Código del producto afectado
+        anterior (dict): Producto antes del cambio
+        actual (dict): Producto después del cambio o None
+    """
+    if anterior is not None:
+        _restar(agregados, codigo, anterior)
+    if actual is not None:
+        _sumar(agregados, codigo, actual)
+
+    if len(agregados["valores_max"]) > 2 * len(agregados["vigentes"]) + 64:
+        _reconstruir_monticulo(agregados)
+
+
+def obtener_agregados(inventario):
+    """
+    Obtiene los agregados del inventario, construyéndolos
+    la primera vez.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+    Retorna:
+        dict: Estructura de agregados
+    """
+    return obtener_auxiliar(inventario, "agregados", construir_agregados, _actualizar_agregados)
+
+
+def producto_mayor_valor(agregados):
+    """
+    Obtiene el producto con mayor valor (precio * stock),
+    descartando las entradas obsoletas del montículo.
+
+    Parámetros:
+        agregados (dict): Estructura de agregados
+    Retorna:
+        str: Código del producto o None si no hay productos
+    """
+    monticulo = agregados["valores_max"]
+    vigentes = agregados["vigentes"]
+    while monticulo:
+        valor, _, codigo = monticulo[0]
+        if vigentes.get(codigo) == -valor:
+            return codigo
+        heapq.heappop(monticulo)
+    return None
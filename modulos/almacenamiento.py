@@ -0,0 +1,268 @@
+"""
+============================================================
+Módulo: almacenamiento.py
+============================================================
+Descripción: Persistencia del inventario en disco. Cada
+mutación se agrega a un diario (journal) de solo
+escritura al final y, periódicamente, el diario se
+compacta en una instantánea (snapshot) completa en
+formato binario (ver binario.py). Al iniciar se carga
+la instantánea y se reproduce solo la cola del diario.
+La instantánea se decodifica completa (cargar_binario):
+el inventario de trabajo es modificable, por lo que el
+arranque sigue siendo O(n); la lectura perezosa con mmap
+(abrir_binario) es solo para consultas de solo lectura.
+============================================================
+"""
+
+import json
+import os
+import shutil
+import sys
+
+from modulos.cambios import registrar_auxiliar, obtener_auxiliar, quitar_auxiliar
+from modulos.codigos import numero_codigo, marca_actual, establecer_marca
+from modulos.binario import escribir_binario, cargar_binario
+
+# Carpeta por defecto del almacén (junto a main.py)
+RUTA_ALMACEN = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "almacen")
+
+ARCHIVO_INSTANTANEA = "inventario.snapshot.bin"
+# Instantánea en JSON de versiones anteriores (solo se lee)
+ARCHIVO_INSTANTANEA_JSON = "inventario.snapshot.json"
+ARCHIVO_DIARIO = "inventario.journal"
+# Copia del diario que se guarda si tiene una línea dañada
+SUFIJO_DANADO = ".danado"
+
+# Mínimo de entradas en el diario antes de compactar
+UMBRAL_COMPACTACION = 1000
+
+
+def _escribir_instantanea(ruta, inventario, secuencia):
+    """
+    Escribe la instantánea de forma atómica: primero en un
+    archivo temporal y luego lo reemplaza.
+
+    Parámetros:
+        ruta (str): Carpeta del almacén
+        inventario (dict): Diccionario de productos
+        secuencia (int): Última secuencia incluida
+    """
+    escribir_binario(os.path.join(ruta, ARCHIVO_INSTANTANEA), inventario,
+                     secuencia, marca_actual(inventario))
+    # La instantánea JSON anterior ya quedó reemplazada
+    ruta_json = os.path.join(ruta, ARCHIVO_INSTANTANEA_JSON)
+    if os.path.exists(ruta_json):
+        os.remove(ruta_json)
+
+
+def _reparar_diario(ruta_diario):
+    """
+    Recorta una última línea incompleta del diario (por
+    ejemplo, tras un corte de energía) para que las nuevas
+    entradas no queden pegadas a ella.
+
+    Parámetros:
+        ruta_diario (str): Ruta del archivo de diario
+    """
+    if not os.path.exists(ruta_diario):
+        return
+    with open(ruta_diario, "rb+") as archivo:
+        tamano = archivo.seek(0, os.SEEK_END)
+        if tamano == 0:
+            return
+        archivo.seek(-1, os.SEEK_END)
+        if archivo.read(1) == b"\n":
+            return
+        # Retroceder por bloques hasta el último salto de línea
+        posicion = tamano
+        while posicion > 0:
+            inicio = max(0, posicion - 4096)
+            archivo.seek(inicio)
+            bloque = archivo.read(posicion - inicio)
+            corte = bloque.rfind(b"\n")
+            if corte != -1:
+                archivo.truncate(inicio + corte + 1)
+                return
+            posicion = inicio
+        archivo.truncate(0)
+
+
+def _leer_diario(ruta_diario, desde, descarte):
+    """
+    Generador que lee las entradas del diario con
+    secuencia mayor a 'desde'. La lectura se detiene en
+    la primera línea dañada: las siguientes no se pueden
+    aplicar sin la que falta.
+
+    Parámetros:
+        ruta_diario (str): Ruta del archivo de diario
+        desde (int): Secuencia de la instantánea
+        descarte (dict): Si hay una línea dañada, recibe
+            "posicion" (byte donde empieza) y "lineas"
+            (cantidad de entradas descartadas, ella incluida)
+    Retorna:
+        generator: Entradas del diario (dict)
+    """
+    if not os.path.exists(ruta_diario):
+        return
+    posicion = 0
+    with open(ruta_diario, "rb") as archivo:
+        for linea in archivo:
+            try:
+                entrada = json.loads(linea)
+            except ValueError:
+                descarte["posicion"] = posicion
+                descarte["lineas"] = 1 + sum(1 for resto in archivo if resto.strip())
+                return
+            posicion += len(linea)
+            if entrada["n"] > desde:
+                yield entrada
+
+
+def _aplicar_entrada(inventario, entrada):
+    """
+    Aplica una entrada del diario sobre el inventario.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+        entrada (dict): Entrada leída del diario
+    """
+    if entrada["op"] == "guardar":
+        inventario[entrada["codigo"]] = entrada["producto"]
+    elif entrada["op"] == "eliminar":
+        inventario.pop(entrada["codigo"], None)
+
+
+def _registrar_cambio(almacen, accion, codigo, anterior, actual):
+    """
+    Agrega la mutación al final del diario. Cada escritura
+    ocupa una sola línea, sin reescribir el inventario.
+    Compacta cuando el diario supera el umbral.
+
+    Parámetros:
+        almacen (dict): Estado del almacén
+        accion (str): Tipo de mutación (ver cambios.notificar)
+        codigo (str): Código del producto afectado
+        anterior (dict): Producto antes del cambio
+        actual (dict): Producto después del cambio o None
+    """
+    almacen["secuencia"] += 1
+    if actual is None:
+        entrada = {"n": almacen["secuencia"], "op": "eliminar", "codigo": codigo}
+    else:
+        entrada = {"n": almacen["secuencia"], "op": "guardar",
+                   "codigo": codigo, "producto": dict(actual)}
+
+    diario = almacen["diario"]
+    diario.write(json.dumps(entrada, ensure_ascii=False) + "\n")
+    diario.flush()
+    if almacen["sincronizar"]:
+        os.fsync(diario.fileno())
+
+    almacen["pendientes"] += 1
+    # El umbral crece con el inventario para que el costo de
+    # compactar, repartido entre las escrituras, sea O(1)
+    if almacen["pendientes"] >= max(almacen["umbral"], len(almacen["inventario"])):
+        compactar(almacen["inventario"])
+
+
+def abrir_almacen(inventario, ruta=RUTA_ALMACEN, umbral=UMBRAL_COMPACTACION, sincronizar=False):
+    """
+    Abre el almacén en disco y lo asocia al inventario.
+    Si existe una instantánea, el inventario se reemplaza
+    por su contenido más la cola del diario; si no existe,
+    se guarda el inventario actual como instantánea inicial.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+        ruta (str): Carpeta del almacén
+        umbral (int): Entradas mínimas antes de compactar
+        sincronizar (bool): Forzar fsync en cada escritura
+    Retorna:
+        dict: Estado del almacén (con "descartadas", las entradas
+            del diario que no se pudieron leer)
+    """
+    os.makedirs(ruta, exist_ok=True)
+    ruta_instantanea = os.path.join(ruta, ARCHIVO_INSTANTANEA)
+    ruta_json = os.path.join(ruta, ARCHIVO_INSTANTANEA_JSON)
+    ruta_diario = os.path.join(ruta, ARCHIVO_DIARIO)
+
+    secuencia = 0
+    pendientes = 0
+    descarte = {}
+    if os.path.exists(ruta_instantanea) or os.path.exists(ruta_json):
+        if os.path.exists(ruta_instantanea):
+            secuencia, ultimo_codigo = cargar_binario(ruta_instantanea, inventario)
+        else:
+            with open(ruta_json, encoding="utf-8") as archivo:
+                instantanea = json.load(archivo)
+            secuencia = instantanea["secuencia"]
+            ultimo_codigo = instantanea.get("ultimo_codigo", 0)
+            inventario.clear()
+            inventario.update(instantanea["inventario"])
+
+        # Reproducir solo lo escrito después de la instantánea
+        _reparar_diario(ruta_diario)
+        for entrada in _leer_diario(ruta_diario, secuencia, descarte):
+            _aplicar_entrada(inventario, entrada)
+            secuencia = entrada["n"]
+            pendientes += 1
+            ultimo_codigo = max(ultimo_codigo, numero_codigo(entrada["codigo"]) or 0)
+        if descarte:
+            # Guardar el diario completo para revisarlo y recortarlo en la
+            # línea dañada: lo que se escriba después tiene que poder leerse
+            shutil.copyfile(ruta_diario, ruta_diario + SUFIJO_DANADO)
+            with open(ruta_diario, "rb+") as archivo:
+                archivo.truncate(descarte["posicion"])
+            print(f"  ⚠️  Diario dañado: se descartaron {descarte['lineas']} entrada(s) "
+                  f"después de la secuencia {secuencia} (copia en {ruta_diario + SUFIJO_DANADO})",
+                  file=sys.stderr)
+
+        # Recordar códigos ya usados aunque el producto se haya eliminado
+        establecer_marca(inventario, ultimo_codigo)
+    else:
+        _escribir_instantanea(ruta, inventario, secuencia)
+        open(ruta_diario, "w").close()
+
+    almacen = {
+        "ruta": ruta,
+        "inventario": inventario,
+        "diario": open(ruta_diario, "a", encoding="utf-8"),
+        "secuencia": secuencia,
+        "pendientes": pendientes,
+        "umbral": umbral,
+        "sincronizar": sincronizar,
+        "descartadas": descarte.get("lineas", 0)
+    }
+    registrar_auxiliar(inventario, "almacen", almacen, _registrar_cambio)
+    return almacen
+
+
+def compactar(inventario):
+    """
+    Escribe una instantánea completa del inventario y
+    vacía el diario.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+    """
+    almacen = obtener_auxiliar(inventario, "almacen")
+    if almacen is None:
+        return
+    _escribir_instantanea(almacen["ruta"], inventario, almacen["secuencia"])
+    almacen["diario"].close()
+    almacen["diario"] = open(os.path.join(almacen["ruta"], ARCHIVO_DIARIO), "w", encoding="utf-8")
+    almacen["pendientes"] = 0
+
+
+def cerrar_almacen(inventario):
+    """
+    Cierra el diario del almacén asociado al inventario.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+    """
+    almacen = quitar_auxiliar(inventario, "almacen")
+    if almacen is not None:
+        almacen["diario"].close()
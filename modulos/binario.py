@@ -0,0 +1,401 @@
+"""
+============================================================
+Módulo: binario.py
+============================================================
+Descripción: Formato binario compacto para guardar y
+restaurar el inventario. Los números van en columnas de
+ancho fijo y los textos (códigos, nombres, categorías y
+proveedores) en una tabla de textos donde cada texto
+distinto aparece una sola vez.
+
+El archivo se puede abrir con mmap sin leerlo completo:
+InventarioBinario decodifica cada producto recién al
+pedirlo, así abrir un catálogo grande cuesta lo mismo
+que uno chico. cargar_binario() decodifica todo de una
+vez para llenar un inventario modificable.
+
+Estructura (little-endian):
+    cabecera     "SGPB", versión, productos (n), textos (m),
+                 secuencia y último código del almacén
+    precios      n x float64
+    stocks       n x int64
+    desplaz.     (m + 1) x uint64, inicio de cada texto
+    codigos      n x uint32  \\
+    nombres      n x uint32   |  número de texto
+    categorias   n x uint32   |
+    proveedores  n x uint32  /
+    orden        n x uint32, filas ordenadas por código
+    textos       UTF-8 concatenado
+============================================================
+"""
+
+import csv
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Mapping
+
+from modulos.importacion import COLUMNAS_CSV, leer_filas_csv
+
+FIRMA = b"SGPB"
+VERSION = 1
+
+# firma, versión, reservado, productos, textos, secuencia, último código
+CABECERA = struct.Struct("<4sHHQQQQ")
+
+# Columnas numéricas en el orden del archivo: (nombre, formato de array)
+COLUMNAS_NUMERICAS = (("precios", "d"), ("stocks", "q"))
+COLUMNAS_TEXTO = ("codigos", "nombres", "categorias", "proveedores")
+
+
+def _secciones(productos, textos):
+    """
+    Calcula dónde empieza cada sección del archivo.
+
+    Parámetros:
+        productos (int): Cantidad de productos
+        textos (int): Cantidad de textos distintos
+    Retorna:
+        dict: {seccion: (inicio, formato, cantidad)} y
+        "textos": inicio de los textos en UTF-8
+    """
+    secciones = {}
+    posicion = CABECERA.size
+    disposicion = [(nombre, formato, productos) for nombre, formato in COLUMNAS_NUMERICAS]
+    disposicion.append(("desplazamientos", "Q", textos + 1))
+    disposicion.extend((nombre, "I", productos) for nombre in COLUMNAS_TEXTO + ("orden",))
+    for nombre, formato, cantidad in disposicion:
+        secciones[nombre] = (posicion, formato, cantidad)
+        posicion += struct.calcsize("<" + formato) * cantidad
+    secciones["textos"] = posicion
+    return secciones
+
+
+def _a_bytes(formato, valores):
+    """
+    Convierte una columna a bytes en little-endian.
+
+    Parámetros:
+        formato (str): Código de tipo de array
+        valores (iterable): Valores de la columna
+    Retorna:
+        bytes: Contenido de la sección
+    """
+    columna = array(formato, valores)
+    if sys.byteorder != "little":
+        columna.byteswap()
+    return columna.tobytes()
+
+
+def escribir_binario(ruta, inventario, secuencia=0, ultimo_codigo=0):
+    """
+    Guarda el inventario en formato binario de forma
+    atómica: primero en un archivo temporal y luego lo
+    reemplaza.
+
+    Parámetros:
+        ruta (str): Ruta del archivo
+        inventario (dict): Diccionario de productos
+        secuencia (int): Última secuencia del diario incluida
+        ultimo_codigo (int): Número del último código usado
+    """
+    ids = {}
+    columnas = {nombre: [] for nombre in COLUMNAS_TEXTO}
+    precios = []
+    stocks = []
+    for codigo, datos in inventario.items():
+        columnas["codigos"].append(ids.setdefault(codigo, len(ids)))
+        columnas["nombres"].append(ids.setdefault(datos["nombre"], len(ids)))
+        columnas["categorias"].append(ids.setdefault(datos["categoria"], len(ids)))
+        columnas["proveedores"].append(ids.setdefault(datos["proveedor"], len(ids)))
+        precios.append(datos["precio"])
+        stocks.append(datos["stock"])
+
+    codificados = [texto.encode("utf-8") for texto in ids]
+    desplazamientos = [0]
+    for texto in codificados:
+        desplazamientos.append(desplazamientos[-1] + len(texto))
+    codigos = list(inventario)
+    orden = sorted(range(len(codigos)), key=codigos.__getitem__)
+
+    temporal = ruta + ".tmp"
+    with open(temporal, "wb") as archivo:
+        archivo.write(CABECERA.pack(FIRMA, VERSION, 0, len(codigos), len(ids), secuencia, ultimo_codigo))
+        archivo.write(_a_bytes("d", precios))
+        archivo.write(_a_bytes("q", stocks))
+        archivo.write(_a_bytes("Q", desplazamientos))
+        for nombre in COLUMNAS_TEXTO:
+            archivo.write(_a_bytes("I", columnas[nombre]))
+        archivo.write(_a_bytes("I", orden))
+        archivo.write(b"".join(codificados))
+        archivo.flush()
+        os.fsync(archivo.fileno())
+    os.replace(temporal, ruta)
+
+
+def _leer_cabecera(datos, ruta):
+    """
+    Lee y verifica la cabecera del archivo.
+
+    Parámetros:
+        datos (bytes o mmap): Contenido del archivo
+        ruta (str): Ruta (para los mensajes de error)
+    Retorna:
+        tuple: (productos, textos, secuencia, ultimo_codigo)
+    """
+    if len(datos) < CABECERA.size:
+        raise ValueError(f"'{ruta}' no es una instantánea binaria (archivo truncado).")
+    firma, version, _, productos, textos, secuencia, ultimo_codigo = CABECERA.unpack_from(datos)
+    if firma != FIRMA:
+        raise ValueError(f"'{ruta}' no es una instantánea binaria.")
+    if version != VERSION:
+        raise ValueError(f"Versión de instantánea binaria no soportada: {version}")
+    if len(datos) < _secciones(productos, textos)["textos"]:
+        raise ValueError(f"'{ruta}' está truncado.")
+    return productos, textos, secuencia, ultimo_codigo
+
+
+def _columna(vista, secciones, nombre):
+    """
+    Obtiene una columna del archivo. En equipos
+    little-endian es una vista sin copia; en los demás se
+    copia invirtiendo el orden de bytes.
+
+    Parámetros:
+        vista (memoryview): Vista del archivo
+        secciones (dict): Resultado de _secciones()
+        nombre (str): Nombre de la sección
+    Retorna:
+        memoryview o array: Valores de la columna
+    """
+    inicio, formato, cantidad = secciones[nombre]
+    tramo = vista[inicio:inicio + struct.calcsize("<" + formato) * cantidad]
+    if sys.byteorder == "little":
+        return tramo.cast(formato)
+    columna = array(formato, tramo.tobytes())
+    columna.byteswap()
+    return columna
+
+
+class InventarioBinario(Mapping):
+    """
+    Inventario de solo lectura sobre una instantánea
+    binaria abierta con mmap. Se usa como el diccionario de
+    productos; cada producto se decodifica al pedirlo y la
+    búsqueda por código es binaria sobre la sección de
+    orden. Cerrar con cerrar() (o usar con 'with').
+    """
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        with open(ruta, "rb") as archivo:
+            self._mapa = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            (self._productos, textos,
+             self.secuencia, self.ultimo_codigo) = _leer_cabecera(self._mapa, ruta)
+        except ValueError:
+            self._mapa.close()
+            raise
+        self._vista = memoryview(self._mapa)
+        secciones = _secciones(self._productos, textos)
+        self._columnas = {nombre: _columna(self._vista, secciones, nombre)
+                          for nombre in ("precios", "stocks", "desplazamientos", "orden") + COLUMNAS_TEXTO}
+        self._inicio_textos = secciones["textos"]
+
+    def _bytes(self, identificador):
+        desplazamientos = self._columnas["desplazamientos"]
+        inicio = self._inicio_textos + desplazamientos[identificador]
+        return self._mapa[inicio:self._inicio_textos + desplazamientos[identificador + 1]]
+
+    def _texto(self, identificador):
+        return str(self._bytes(identificador), "utf-8")
+
+    def _fila(self, codigo):
+        """Busca la fila de un código (None si no está)."""
+        # UTF-8 conserva el orden de los textos: se compara sin decodificar
+        buscado = codigo.encode("utf-8")
+        orden = self._columnas["orden"]
+        codigos = self._columnas["codigos"]
+        bajo, alto = 0, self._productos
+        while bajo < alto:
+            medio = (bajo + alto) // 2
+            if self._bytes(codigos[orden[medio]]) < buscado:
+                bajo = medio + 1
+            else:
+                alto = medio
+        if bajo < self._productos and self._bytes(codigos[orden[bajo]]) == buscado:
+            return orden[bajo]
+        return None
+
+    def producto(self, fila):
+        """
+        Decodifica el producto de una fila.
+
+        Parámetros:
+            fila (int): Posición en el archivo
+        Retorna:
+            dict: Datos del producto (como en el inventario)
+        """
+        columnas = self._columnas
+        return {
+            "nombre": self._texto(columnas["nombres"][fila]),
+            "precio": columnas["precios"][fila],
+            "stock": columnas["stocks"][fila],
+            "categoria": self._texto(columnas["categorias"][fila]),
+            "proveedor": self._texto(columnas["proveedores"][fila])
+        }
+
+    def __getitem__(self, codigo):
+        fila = self._fila(codigo) if isinstance(codigo, str) else None
+        if fila is None:
+            raise KeyError(codigo)
+        return self.producto(fila)
+
+    def __contains__(self, codigo):
+        return isinstance(codigo, str) and self._fila(codigo) is not None
+
+    def __iter__(self):
+        codigos = self._columnas["codigos"]
+        for fila in range(self._productos):
+            yield self._texto(codigos[fila])
+
+    def __len__(self):
+        return self._productos
+
+    def __repr__(self):
+        return f"InventarioBinario({self.ruta!r}, {self._productos} productos)"
+
+    def cerrar(self):
+        """
+        Libera las vistas y cierra el mapa del archivo.
+        """
+        if self._mapa.closed:
+            return
+        for columna in self._columnas.values():
+            if isinstance(columna, memoryview):
+                columna.release()
+        self._vista.release()
+        self._mapa.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+
+def abrir_binario(ruta):
+    """
+    Abre una instantánea binaria para leerla sin cargarla.
+
+    Parámetros:
+        ruta (str): Ruta del archivo
+    Retorna:
+        InventarioBinario: Inventario de solo lectura
+    """
+    return InventarioBinario(ruta)
+
+
+def cargar_binario(ruta, inventario):
+    """
+    Carga una instantánea binaria completa en un
+    inventario, reemplazando su contenido. Cada texto se
+    decodifica una sola vez.
+
+    Parámetros:
+        ruta (str): Ruta del archivo
+        inventario (dict): Diccionario de productos a llenar
+    Retorna:
+        tuple: (secuencia, ultimo_codigo) guardados en el archivo
+    """
+    with open(ruta, "rb") as archivo:
+        datos = archivo.read()
+    productos, textos, secuencia, ultimo_codigo = _leer_cabecera(datos, ruta)
+    secciones = _secciones(productos, textos)
+    with memoryview(datos) as vista:
+        columnas = {}
+        for nombre in ("precios", "stocks", "desplazamientos") + COLUMNAS_TEXTO:
+            columna = _columna(vista, secciones, nombre)
+            columnas[nombre] = columna.tolist()
+            if isinstance(columna, memoryview):
+                columna.release()
+
+    textos_utf8 = datos[secciones["textos"]:]
+    desplazamientos = columnas["desplazamientos"]
+    tabla = [textos_utf8[desde:hasta].decode("utf-8")
+             for desde, hasta in zip(desplazamientos, desplazamientos[1:])]
+
+    inventario.clear()
+    inventario.update(
+        (tabla[codigo], {"nombre": tabla[nombre], "precio": precio, "stock": stock,
+                         "categoria": tabla[categoria], "proveedor": tabla[proveedor]})
+        for codigo, nombre, precio, stock, categoria, proveedor in zip(
+            columnas["codigos"], columnas["nombres"], columnas["precios"],
+            columnas["stocks"], columnas["categorias"], columnas["proveedores"])
+    )
+    return secuencia, ultimo_codigo
+
+
+# -------------------------------------------------------------
+# CONVERSIÓN CON CSV
+# -------------------------------------------------------------
+def _texto_precio(precio):
+    """
+    Escribe el precio como en el CSV (dos decimales) si así
+    se conserva exacto; si no, con todos sus dígitos.
+
+    Parámetros:
+        precio (float): Precio del producto
+    Retorna:
+        str: Precio en texto
+    """
+    texto = f"{precio:.2f}"
+    return texto if float(texto) == precio else repr(float(precio))
+
+
+def csv_a_binario(ruta_csv, ruta_binario):
+    """
+    Convierte un CSV de productos (formato de importación)
+    a una instantánea binaria, sin validar las reglas de
+    negocio.
+
+    Parámetros:
+        ruta_csv (str): Archivo CSV de origen
+        ruta_binario (str): Archivo binario de destino
+    Retorna:
+        int: Cantidad de productos convertidos
+    """
+    inventario = {}
+    for linea, fila in leer_filas_csv(ruta_csv):
+        try:
+            codigo, nombre, precio, stock, categoria, proveedor = (campo.strip() for campo in fila)
+            inventario[codigo] = {"nombre": nombre, "precio": float(precio), "stock": int(stock),
+                                  "categoria": categoria, "proveedor": proveedor}
+        except ValueError:
+            raise ValueError(f"Línea {linea}: fila no válida {fila}") from None
+    escribir_binario(ruta_binario, inventario)
+    return len(inventario)
+
+
+def binario_a_csv(ruta_binario, ruta_csv):
+    """
+    Escribe el contenido de una instantánea binaria como
+    CSV de productos, con el encabezado de importación.
+
+    Parámetros:
+        ruta_binario (str): Archivo binario de origen
+        ruta_csv (str): Archivo CSV de destino
+    Retorna:
+        int: Cantidad de productos escritos
+    """
+    with abrir_binario(ruta_binario) as inventario, \
+            open(ruta_csv, "w", newline="", encoding="utf-8") as archivo:
+        escritor = csv.writer(archivo, lineterminator="\n")
+        escritor.writerow(COLUMNAS_CSV)
+        for fila, codigo in enumerate(inventario):
+            datos = inventario.producto(fila)
+            escritor.writerow((codigo, datos["nombre"], _texto_precio(datos["precio"]),
+                               datos["stock"], datos["categoria"], datos["proveedor"]))
+        return len(inventario)
@@ -0,0 +1,448 @@
+"""
+============================================================
+Módulo: busqueda.py
+============================================================
+Descripción: Índice de búsqueda por nombre de producto.
+Combina un índice invertido (palabra -> códigos) con un
+árbol de prefijos (trie) de palabras. Se actualiza con
+cada alta, modificación o baja, por lo que una búsqueda
+no recorre todo el inventario.
+
+Las palabras se guardan normalizadas (sin tildes y en
+minúsculas) al indexar, así "camara" encuentra "Cámara".
+Una palabra de la consulta también encuentra las que la
+contienen en el medio ("tech" -> "Logitech"), como la
+búsqueda por subcadena original; el índice de bigramas
+limita las palabras a revisar.
+Para la búsqueda aproximada ("logitek" -> "Logitech")
+un índice de bigramas elige las palabras candidatas y
+solo a ellas se les calcula la distancia de edición.
+============================================================
+"""
+
+import re
+import unicodedata
+from collections import Counter
+
+from modulos.cambios import obtener_auxiliar
+from modulos.codigos import clave_codigo
+
+# Marca de fin de palabra dentro del trie
+_FIN = "$"
+
+# Borde que se agrega a cada palabra antes de partirla en bigramas
+_BORDE = "#"
+N_GRAMA = 2
+
+# Puntaje por palabra: coincidencia exacta, por prefijo, dentro de
+# la palabra ("tech" en "logitech") o aproximada
+PUNTAJE_EXACTO = 4
+PUNTAJE_PREFIJO = 2
+PUNTAJE_SUBCADENA = 1
+PUNTAJE_APROXIMADO = 1
+
+
+def normalizar(texto):
+    """
+    Normaliza un texto para comparar: minúsculas (casefold)
+    y sin tildes ni diéresis.
+
+    Parámetros:
+        texto (str): Texto a normalizar
+    Retorna:
+        str: Texto normalizado
+    """
+    if texto.isascii():
+        return texto.lower()
+    descompuesto = unicodedata.normalize("NFKD", texto.casefold())
+    return "".join(letra for letra in descompuesto if not unicodedata.combining(letra))
+
+
+def tokenizar(texto):
+    """
+    Divide un texto en palabras normalizadas (minúsculas,
+    sin tildes, solo letras y dígitos).
+
+    Parámetros:
+        texto (str): Texto a dividir
+    Retorna:
+        list: Palabras del texto
+    """
+    return re.findall(r"\w+", normalizar(texto))
+
+
+def tolerancia(palabra):
+    """
+    Cantidad de errores de tipeo que se toleran según el
+    largo de la palabra buscada.
+
+    Parámetros:
+        palabra (str): Palabra de la consulta
+    Retorna:
+        int: 0 hasta 3 letras, 1 hasta 7 y 2 desde 8
+    """
+    if len(palabra) <= 3:
+        return 0
+    return 1 if len(palabra) <= 7 else 2
+
+
+def distancia_edicion(a, b, maximo=None):
+    """
+    Distancia de edición entre dos palabras: inserciones,
+    eliminaciones, reemplazos y letras vecinas invertidas
+    ("lgoitech"), cada uno con costo 1.
+
+    Parámetros:
+        a (str): Primera palabra
+        b (str): Segunda palabra
+        maximo (int): Si se indica, deja de calcular al
+            superarlo y devuelve maximo + 1
+    Retorna:
+        int: Cantidad mínima de ediciones
+    """
+    fila_previa = None
+    fila_anterior = list(range(len(b) + 1))
+    for i, letra_a in enumerate(a, 1):
+        fila = [i] + [0] * len(b)
+        for j, letra_b in enumerate(b, 1):
+            fila[j] = min(fila_anterior[j] + 1, fila[j - 1] + 1,
+                          fila_anterior[j - 1] + (letra_a != letra_b))
+            if i > 1 and j > 1 and letra_a == b[j - 2] and a[i - 2] == letra_b:
+                fila[j] = min(fila[j], fila_previa[j - 2] + 1)
+        if maximo is not None and min(fila) > maximo:
+            return maximo + 1
+        fila_previa, fila_anterior = fila_anterior, fila
+    return fila_anterior[-1]
+
+
+def a_una_edicion(a, b):
+    """
+    Indica si dos palabras están a distancia de edición 1
+    o menos, en tiempo lineal (caso más común de la
+    búsqueda aproximada).
+
+    Parámetros:
+        a (str): Primera palabra
+        b (str): Segunda palabra
+    Retorna:
+        bool: True si distancia_edicion(a, b) <= 1
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    if len(a) - len(b) > 1:
+        return False
+    i = 0
+    while i < len(b) and a[i] == b[i]:
+        i += 1
+    if i == len(b):
+        return True
+    if len(a) > len(b):
+        return a[i + 1:] == b[i:]
+    return a[i + 1:] == b[i + 1:] or (a[i] == b[i + 1] and a[i + 1] == b[i]
+                                      and a[i + 2:] == b[i + 2:])
+
+
+def _ngramas(palabra):
+    """
+    Bigramas distintos de una palabra con borde
+    ("casa" -> #c, ca, as, sa, a#).
+
+    Parámetros:
+        palabra (str): Palabra normalizada
+    Retorna:
+        set: Bigramas de la palabra
+    """
+    con_borde = f"{_BORDE}{palabra}{_BORDE}"
+    return {con_borde[i:i + N_GRAMA] for i in range(len(con_borde) - N_GRAMA + 1)}
+
+
+def _agregar_al_trie(trie, palabra):
+    """
+    Inserta una palabra en el árbol de prefijos.
+
+    Parámetros:
+        trie (dict): Nodo raíz del trie
+        palabra (str): Palabra a insertar
+    """
+    nodo = trie
+    for letra in palabra:
+        nodo = nodo.setdefault(letra, {})
+    nodo[_FIN] = True
+
+
+def _quitar_del_trie(trie, palabra):
+    """
+    Quita una palabra del trie y poda las ramas vacías.
+
+    Parámetros:
+        trie (dict): Nodo raíz del trie
+        palabra (str): Palabra a quitar
+    """
+    camino = [trie]
+    for letra in palabra:
+        nodo = camino[-1].get(letra)
+        if nodo is None:
+            return
+        camino.append(nodo)
+    camino[-1].pop(_FIN, None)
+
+    # Podar desde la hoja hacia la raíz mientras el nodo quede vacío
+    for indice in range(len(palabra), 0, -1):
+        if camino[indice]:
+            break
+        del camino[indice - 1][palabra[indice - 1]]
+
+
+def _palabras_con_prefijo(trie, prefijo):
+    """
+    Generador con todas las palabras del trie que
+    comienzan con el prefijo dado.
+
+    Parámetros:
+        trie (dict): Nodo raíz del trie
+        prefijo (str): Prefijo buscado
+    Retorna:
+        generator: Palabras completas
+    """
+    nodo = trie
+    for letra in prefijo:
+        nodo = nodo.get(letra)
+        if nodo is None:
+            return
+
+    pendientes = [(nodo, prefijo)]
+    while pendientes:
+        nodo, palabra = pendientes.pop()
+        for letra, hijo in nodo.items():
+            if letra == _FIN:
+                yield palabra
+            else:
+                pendientes.append((hijo, palabra + letra))
+
+
+def _indexar(indice, codigo, nombre):
+    """
+    Agrega las palabras del nombre de un producto al índice.
+
+    Parámetros:
+        indice (dict): Índice de búsqueda
+        codigo (str): Código del producto
+        nombre (str): Nombre del producto
+    """
+    palabras = tokenizar(nombre)
+    indice["palabras_por_codigo"][codigo] = palabras
+    for palabra in set(palabras):
+        codigos = indice["invertido"].get(palabra)
+        if codigos is None:
+            codigos = indice["invertido"][palabra] = set()
+            _agregar_al_trie(indice["trie"], palabra)
+            for grama in _ngramas(palabra):
+                indice["ngramas"].setdefault(grama, set()).add(palabra)
+        codigos.add(codigo)
+
+
+def _desindexar(indice, codigo):
+    """
+    Quita del índice las palabras de un producto.
+
+    Parámetros:
+        indice (dict): Índice de búsqueda
+        codigo (str): Código del producto
+    """
+    palabras = indice["palabras_por_codigo"].pop(codigo, ())
+    for palabra in set(palabras):
+        codigos = indice["invertido"].get(palabra)
+        if codigos is None:
+            continue
+        codigos.discard(codigo)
+        if not codigos:
+            del indice["invertido"][palabra]
+            _quitar_del_trie(indice["trie"], palabra)
+            for grama in _ngramas(palabra):
+                palabras_grama = indice["ngramas"][grama]
+                palabras_grama.discard(palabra)
+                if not palabras_grama:
+                    del indice["ngramas"][grama]
+
+
+def construir_indice(inventario):
+    """
+    Construye el índice de búsqueda recorriendo una sola
+    vez el inventario.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+    Retorna:
+        dict: Índice con las claves invertido, trie, ngramas
+        (bigrama -> palabras) y palabras_por_codigo
+    """
+    indice = {"invertido": {}, "trie": {}, "ngramas": {}, "palabras_por_codigo": {}}
+    for codigo, datos in inventario.items():
+        _indexar(indice, codigo, datos["nombre"])
+    return indice
+
+
+def _actualizar_indice(indice, accion, codigo, anterior, actual):
+    """
+    Mantiene el índice al día ante una mutación. Solo
+    reindexa cuando cambia el nombre.
+
+    Parámetros:
+        indice (dict): Índice de búsqueda
+        accion (str): Tipo de mutación (ver cambios.notificar)
+        codigo (str): Código del producto afectado
+        anterior (dict): Producto antes del cambio
+        actual (dict): Producto después del cambio o None
+    """
+    if anterior is not None and actual is not None and anterior["nombre"] == actual["nombre"]:
+        return
+    if anterior is not None:
+        _desindexar(indice, codigo)
+    if actual is not None:
+        _indexar(indice, codigo, actual["nombre"])
+
+
+def obtener_indice(inventario):
+    """
+    Obtiene el índice de búsqueda del inventario,
+    construyéndolo la primera vez.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+    Retorna:
+        dict: Índice de búsqueda
+    """
+    return obtener_auxiliar(inventario, "busqueda", construir_indice, _actualizar_indice)
+
+
+def _palabras_parecidas(indice, palabra):
+    """
+    Generador con las palabras del índice a distancia de
+    edición tolerable de la palabra buscada. Cada edición
+    altera a lo sumo 3 bigramas (2, o 3 si invierte dos
+    letras), así que una palabra a k ediciones comparte al
+    menos (bigramas - 3k) con la buscada: solo esas
+    candidatas se comparan.
+
+    Parámetros:
+        indice (dict): Índice de búsqueda
+        palabra (str): Palabra normalizada de la consulta
+    Retorna:
+        generator: Palabras indexadas parecidas
+    """
+    maximo = tolerancia(palabra)
+    if maximo == 0:
+        return
+    gramas = _ngramas(palabra)
+    minimo_comunes = len(gramas) - (N_GRAMA + 1) * maximo
+
+    comunes = Counter()
+    for grama in gramas:
+        comunes.update(indice["ngramas"].get(grama, ()))
+    for candidata, cantidad in comunes.items():
+        if cantidad < minimo_comunes or abs(len(candidata) - len(palabra)) > maximo:
+            continue
+        if maximo == 1:
+            parecida = a_una_edicion(palabra, candidata)
+        else:
+            parecida = distancia_edicion(palabra, candidata, maximo) <= maximo
+        if parecida:
+            yield candidata
+
+
+def _palabras_que_contienen(indice, palabra):
+    """
+    Generador con las palabras del índice que contienen la
+    palabra buscada sin empezar con ella (las que empiezan
+    con ella ya salen del trie). Solo se revisan las que
+    tienen todos sus bigramas.
+
+    Parámetros:
+        indice (dict): Índice de búsqueda
+        palabra (str): Palabra normalizada de la consulta
+    Retorna:
+        generator: Palabras indexadas que la contienen
+    """
+    if len(palabra) < N_GRAMA:
+        return
+    grupos = []
+    for i in range(len(palabra) - N_GRAMA + 1):
+        grupo = indice["ngramas"].get(palabra[i:i + N_GRAMA])
+        if grupo is None:
+            return
+        grupos.append(grupo)
+    grupos.sort(key=len)
+    menor, *resto = grupos
+    for candidata in menor:
+        if (palabra in candidata and not candidata.startswith(palabra)
+                and all(candidata in grupo for grupo in resto)):
+            yield candidata
+
+
+def _puntuar(parcial, codigos, puntaje):
+    """
+    Guarda para cada código el mejor puntaje obtenido.
+
+    Parámetros:
+        parcial (dict): {codigo: puntaje} de una palabra
+        codigos (set): Códigos que contienen la palabra
+        puntaje (int): Puntaje de la coincidencia
+    """
+    for codigo in codigos:
+        if puntaje > parcial.get(codigo, 0):
+            parcial[codigo] = puntaje
+
+
+def buscar_por_nombre(inventario, consulta, limite=None, aproximada=False):
+    """
+    Busca productos cuyo nombre contenga todas las palabras
+    de la consulta (completas, como prefijo o dentro de otra
+    palabra, sin importar tildes ni mayúsculas). Con
+    aproximada=True también
+    valen las palabras con errores de tipeo (ver
+    tolerancia()). Los resultados se ordenan por
+    relevancia: primero las coincidencias exactas y los
+    nombres más cortos.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+        consulta (str): Texto a buscar
+        limite (int): Máximo de resultados (None = todos)
+        aproximada (bool): Tolerar errores de tipeo
+    Retorna:
+        list: Códigos de los productos encontrados
+    """
+    palabras_consulta = tokenizar(consulta)
+    if not palabras_consulta:
+        return []
+
+    indice = obtener_indice(inventario)
+    puntajes = None
+
+    for palabra in palabras_consulta:
+        # Puntaje de esta palabra para cada código que la contiene
+        parcial = {}
+        for completa in _palabras_con_prefijo(indice["trie"], palabra):
+            puntaje = PUNTAJE_EXACTO if completa == palabra else PUNTAJE_PREFIJO
+            _puntuar(parcial, indice["invertido"][completa], puntaje)
+        for contiene in _palabras_que_contienen(indice, palabra):
+            _puntuar(parcial, indice["invertido"][contiene], PUNTAJE_SUBCADENA)
+        if aproximada:
+            for parecida in _palabras_parecidas(indice, palabra):
+                _puntuar(parcial, indice["invertido"][parecida], PUNTAJE_APROXIMADO)
+
+        # Intersección: el producto debe coincidir con todas las palabras
+        if puntajes is None:
+            puntajes = parcial
+        else:
+            puntajes = {codigo: puntajes[codigo] + puntaje
+                        for codigo, puntaje in parcial.items() if codigo in puntajes}
+        if not puntajes:
+            return []
+
+    palabras_por_codigo = indice["palabras_por_codigo"]
+    codigos = sorted(
+        puntajes,
+        key=lambda codigo: (-puntajes[codigo], len(palabras_por_codigo[codigo]), clave_codigo(codigo))
+    )
+    return codigos[:limite] if limite is not None else codigos
@@ -0,0 +1,200 @@
+"""
+============================================================
+Módulo: cache_reportes.py
+============================================================
+Descripción: Caché de reportes por inventario. Cada
+reporte se guarda con su nombre y parámetros (por
+ejemplo, stock bajo con stock_minimo=5) junto a la
+generación del inventario en que se calculó.
+
+La generación es un contador que aumenta con cada alta,
+modificación o baja (ver cambios.notificar) y con cada
+cambio de la configuración. Un reporte guardado vale
+solo mientras la generación no cambie; así un tablero
+que consulta los mismos reportes cada pocos segundos
+no los recalcula si el inventario no cambió. Si una
+mutación ocurre mientras se calcula un reporte (por
+ejemplo, en el servidor), el resultado ya nace vencido.
+
+Las variantes con parámetros se descartan por LRU: se
+guardan como máximo TAM_CACHE reportes por inventario.
+Los reportes guardados se comparten: no deben
+modificarse.
+============================================================
+"""
+
+import inspect
+import threading
+from collections import OrderedDict
+from functools import wraps
+
+from modulos.cambios import obtener_auxiliar
+from modulos.configuracion import al_cambiar_config
+
+# Reportes guardados por inventario (los menos usados salen primero)
+TAM_CACHE = 32
+
+# Generación de la configuración: cualquier cambio vence todos los reportes
+_generacion_config = 0
+
+
+@al_cambiar_config
+def _vencer_por_config(clave, anterior, nuevo):
+    """
+    Vence los reportes guardados cuando cambia un valor de
+    la configuración (umbrales de stock, límites, etc.).
+    """
+    global _generacion_config
+    _generacion_config += 1
+
+
+def _nueva_cache(inventario):
+    """
+    Crea el estado de la caché de reportes de un inventario.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+    Retorna:
+        dict: Generación, entradas y contadores
+    """
+    return {
+        "generacion": 0,
+        "entradas": OrderedDict(),   # {(nombre, parametros): (generacion, reporte)}
+        "candado": threading.Lock(),
+        "aciertos": 0,
+        "fallos": 0
+    }
+
+
+def _nueva_generacion(cache, accion, codigo, anterior, actual):
+    """
+    Aumenta la generación ante cualquier mutación del
+    inventario; los reportes guardados quedan vencidos.
+
+    Parámetros:
+        cache (dict): Estado de la caché
+        accion (str): Tipo de mutación (ver cambios.notificar)
+        codigo (str): Código del producto afectado
+        anterior (dict): Producto antes del cambio
+        actual (dict): Producto después del cambio o None
+    """
+    with cache["candado"]:
+        cache["generacion"] += 1
+
+
+def obtener_cache(inventario):
+    """
+    Obtiene la caché de reportes del inventario, creándola
+    la primera vez.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+    Retorna:
+        dict: Estado de la caché
+    """
+    return obtener_auxiliar(inventario, "reportes", _nueva_cache, _nueva_generacion)
+
+
+def generacion(inventario):
+    """
+    Devuelve la generación actual del inventario (cambia
+    con cada mutación y con cada cambio de configuración).
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+    Retorna:
+        tuple: (generación del inventario, de la configuración)
+    """
+    return (obtener_cache(inventario)["generacion"], _generacion_config)
+
+
+def reporte_en_cache(inventario, nombre, calcular, *parametros):
+    """
+    Devuelve el reporte guardado si sigue vigente; si no,
+    lo calcula y lo guarda.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+        nombre (str): Nombre del reporte
+        calcular (function): Recibe (inventario, *parametros)
+        *parametros: Parámetros del reporte (parte de la clave)
+    Retorna:
+        El reporte
+    """
+    cache = obtener_cache(inventario)
+    clave = (nombre, parametros)
+    vigente = generacion(inventario)
+    with cache["candado"]:
+        guardado = cache["entradas"].get(clave)
+        if guardado is not None and guardado[0] == vigente:
+            cache["entradas"].move_to_end(clave)
+            cache["aciertos"] += 1
+            return guardado[1]
+        cache["fallos"] += 1
+
+    # Calcular fuera del candado: la generación leída antes vence
+    # el resultado si el inventario cambia mientras tanto
+    reporte = calcular(inventario, *parametros)
+    with cache["candado"]:
+        cache["entradas"][clave] = (vigente, reporte)
+        cache["entradas"].move_to_end(clave)
+        while len(cache["entradas"]) > TAM_CACHE:
+            cache["entradas"].popitem(last=False)
+    return reporte
+
+
+def en_cache(nombre):
+    """
+    Decorador para funciones de reporte con la forma
+    funcion(inventario, *parametros): guarda sus resultados
+    con reporte_en_cache(). Los parámetros se pueden pasar
+    por posición o por nombre; la clave usa todos los
+    parámetros con sus valores por defecto completos, así
+    f(inv), f(inv, None) y f(inv, stock_minimo=None)
+    comparten el mismo reporte guardado.
+
+    Parámetros:
+        nombre (str): Nombre del reporte
+    Retorna:
+        function: Decorador
+    """
+    def decorador(funcion):
+        firma = inspect.signature(funcion)
+
+        @wraps(funcion)
+        def envoltura(inventario, *parametros, **opciones):
+            argumentos = firma.bind(inventario, *parametros, **opciones)
+            argumentos.apply_defaults()
+            return reporte_en_cache(inventario, nombre, funcion, *argumentos.args[1:])
+        return envoltura
+    return decorador
+
+
+def limpiar_cache(inventario):
+    """
+    Descarta todos los reportes guardados del inventario.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+    """
+    cache = obtener_cache(inventario)
+    with cache["candado"]:
+        cache["entradas"].clear()
+
+
+def estadisticas_cache(inventario):
+    """
+    Resume el uso de la caché de reportes.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+    Retorna:
+        dict: aciertos, fallos, entradas y generacion
+    """
+    cache = obtener_cache(inventario)
+    return {
+        "aciertos": cache["aciertos"],
+        "fallos": cache["fallos"],
+        "entradas": len(cache["entradas"]),
+        "generacion": cache["generacion"]
+    }
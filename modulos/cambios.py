@@ -0,0 +1,212 @@
+"""
+============================================================
+Módulo: cambios.py
+============================================================
+Descripción: Registro central de las mutaciones del
+inventario. Las estructuras auxiliares (almacenamiento,
+índices, etc.) se asocian a un inventario y reciben
+cada alta, modificación o baja para mantenerse al día.
+Las funciones insertar_producto, modificar_campo y
+quitar_producto son la única vía para mutar el inventario.
+============================================================
+"""
+
+import weakref
+
+
+class Inventario(dict):
+    """
+    Diccionario de productos que admite referencias débiles
+    (un dict común no las admite): sus estructuras auxiliares
+    se liberan solas cuando el inventario deja de usarse.
+    """
+
+
+# -------------------------------------------------------------
+# DICCIONARIO: Estructuras auxiliares por inventario
+# Estructura: {id(inventario): (referencia, {nombre: (estructura, actualizar)})}
+# referencia() devuelve el inventario; se compara la identidad
+# para no confundir inventarios con el mismo id. Con un
+# Inventario (o un InventarioColumnar) es una referencia débil
+# y la entrada se borra cuando el inventario se libera, antes
+# de que su id pueda reutilizarse. Un dict común queda
+# registrado hasta liberar_auxiliares().
+# -------------------------------------------------------------
+_auxiliares = {}
+
+
+def _referencia(inventario):
+    """
+    Crea la referencia al inventario que guarda el registro.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+    Retorna:
+        function: Sin argumentos, devuelve el inventario (o
+        None si ya se liberó)
+    """
+    try:
+        referencia = weakref.ref(inventario)
+    except TypeError:
+        return lambda: inventario
+    weakref.finalize(inventario, _auxiliares.pop, id(inventario), None)
+    return referencia
+
+
+def _entrada(inventario, crear=True):
+    """
+    Devuelve el diccionario de auxiliares del inventario,
+    creándolo si todavía no existe.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+        crear (bool): Si es False y no existe, devuelve un
+            diccionario vacío sin registrar el inventario
+    Retorna:
+        dict: {nombre: (estructura, actualizar)}
+    """
+    entrada = _auxiliares.get(id(inventario))
+    if entrada is None or entrada[0]() is not inventario:
+        if not crear:
+            return {}
+        entrada = (_referencia(inventario), {})
+        _auxiliares[id(inventario)] = entrada
+    return entrada[1]
+
+
+def registrar_auxiliar(inventario, nombre, estructura, actualizar):
+    """
+    Asocia una estructura auxiliar a un inventario.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+        nombre (str): Nombre único de la estructura
+        estructura: Objeto que se desea mantener
+        actualizar (function): Función llamada como
+            actualizar(estructura, accion, codigo, anterior, actual)
+    """
+    _entrada(inventario)[nombre] = (estructura, actualizar)
+
+
+def obtener_auxiliar(inventario, nombre, construir=None, actualizar=None):
+    """
+    Obtiene la estructura auxiliar de un inventario. Si no
+    existe y se indica cómo construirla, la construye y
+    la registra.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+        nombre (str): Nombre de la estructura
+        construir (function): Recibe el inventario y
+            devuelve la estructura inicial
+        actualizar (function): Ver registrar_auxiliar()
+    Retorna:
+        La estructura o None si no existe
+    """
+    registro = _entrada(inventario, crear=False).get(nombre)
+    if registro is not None:
+        return registro[0]
+    if construir is None:
+        return None
+    estructura = construir(inventario)
+    registrar_auxiliar(inventario, nombre, estructura, actualizar)
+    return estructura
+
+
+def quitar_auxiliar(inventario, nombre):
+    """
+    Desasocia una estructura auxiliar del inventario.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+        nombre (str): Nombre de la estructura
+    Retorna:
+        La estructura quitada o None
+    """
+    registro = _entrada(inventario, crear=False).pop(nombre, None)
+    return registro[0] if registro else None
+
+
+def liberar_auxiliares(inventario):
+    """
+    Olvida todas las estructuras auxiliares del inventario
+    (por ejemplo, al terminar de usar un dict común, que no
+    se libera solo). Cierre antes el almacén si está abierto.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+    """
+    entrada = _auxiliares.get(id(inventario))
+    if entrada is not None and entrada[0]() is inventario:
+        del _auxiliares[id(inventario)]
+
+
+def notificar(inventario, accion, codigo, anterior, actual):
+    """
+    Informa una mutación a todas las estructuras auxiliares
+    del inventario. Las estructuras deben quitar 'anterior'
+    (si no es None) y agregar 'actual' (si no es None).
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+        accion (str): "alta", "modificacion" o "baja"
+        codigo (str): Código del producto afectado
+        anterior (dict): Copia del producto antes del cambio
+        actual (dict): Producto después del cambio
+    """
+    entrada = _auxiliares.get(id(inventario))
+    if entrada is None or entrada[0]() is not inventario:
+        return
+    for estructura, actualizar in list(entrada[1].values()):
+        if actualizar is not None:
+            actualizar(estructura, accion, codigo, anterior, actual)
+
+
+def insertar_producto(inventario, codigo, producto):
+    """
+    Guarda un producto en el inventario (alta o reemplazo)
+    y notifica el cambio a las estructuras auxiliares.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+        codigo (str): Código del producto
+        producto (dict): Datos del producto
+    """
+    anterior = inventario.get(codigo)
+    if anterior is not None:
+        anterior = dict(anterior)
+    inventario[codigo] = producto
+    notificar(inventario, "alta", codigo, anterior, producto)
+
+
+def modificar_campo(inventario, codigo, campo, valor):
+    """
+    Modifica un campo de un producto existente y notifica
+    el cambio a las estructuras auxiliares.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+        codigo (str): Código del producto
+        campo (str): Nombre del campo a modificar
+        valor: Nuevo valor ya validado
+    """
+    producto = inventario[codigo]
+    anterior = dict(producto)
+    producto[campo] = valor
+    notificar(inventario, "modificacion", codigo, anterior, producto)
+
+
+def quitar_producto(inventario, codigo):
+    """
+    Elimina un producto del inventario y notifica el
+    cambio a las estructuras auxiliares.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+        codigo (str): Código del producto
+    Retorna:
+        dict: El producto eliminado
+    """
+    producto = inventario.pop(codigo)
+    notificar(inventario, "baja", codigo, producto, None)
+    return producto
@@ -0,0 +1,157 @@
+"""
+============================================================
+Módulo: codigos.py
+============================================================
+Descripción: Asignación de códigos de producto. Mantiene
+una marca del mayor número asignado (high-water mark)
+por inventario, de modo que generar un código cuesta
+O(1) y los códigos de productos eliminados no se
+vuelven a usar.
+============================================================
+"""
+
+from modulos.cambios import obtener_auxiliar
+from modulos.validaciones import validar_codigo_producto
+
+
+def numero_codigo(codigo):
+    """
+    Extrae la parte numérica de un código de producto.
+
+    Parámetros:
+        codigo (str): Código (Ej: P001, P1250)
+    Retorna:
+        int: El número del código o None si no es válido
+    """
+    if not validar_codigo_producto(codigo):
+        return None
+    return int(codigo[1:])
+
+
+def clave_codigo(codigo):
+    """
+    Clave para ordenar códigos por su número (P999 antes
+    que P1000); los códigos no válidos van al final.
+
+    Parámetros:
+        codigo (str): Código del producto
+    Retorna:
+        tuple: Clave comparable
+    """
+    numero = numero_codigo(codigo)
+    return (0, numero, "") if numero is not None else (1, 0, codigo)
+
+
+def formatear_codigo(numero):
+    """
+    Construye el código de producto para un número.
+
+    Parámetros:
+        numero (int): Número del producto
+    Retorna:
+        str: Código con al menos 3 dígitos (Ej: P008, P1000)
+    """
+    return f"P{numero:03d}"
+
+
+def _construir_asignador(inventario):
+    """
+    Calcula la marca inicial recorriendo una sola vez
+    los códigos del inventario.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+    Retorna:
+        dict: Estado del asignador {"marca": int}
+    """
+    numeros = (numero_codigo(codigo) for codigo in inventario.keys())
+    return {"marca": max((n for n in numeros if n is not None), default=0)}
+
+
+def _actualizar_asignador(asignador, accion, codigo, anterior, actual):
+    """
+    Sube la marca cuando se inserta un código mayor (por
+    ejemplo, desde una importación). Las bajas no la
+    modifican.
+
+    Parámetros:
+        asignador (dict): Estado del asignador
+        accion (str): Tipo de mutación (ver cambios.notificar)
+        codigo (str): Código del producto afectado
+        anterior (dict): Producto antes del cambio
+        actual (dict): Producto después del cambio o None
+    """
+    if actual is None:
+        return
+    numero = numero_codigo(codigo)
+    if numero is not None and numero > asignador["marca"]:
+        asignador["marca"] = numero
+
+
+def _asignador(inventario):
+    """
+    Obtiene (o construye) el asignador del inventario.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+    Retorna:
+        dict: Estado del asignador
+    """
+    return obtener_auxiliar(inventario, "codigos", _construir_asignador, _actualizar_asignador)
+
+
+def marca_actual(inventario):
+    """
+    Devuelve el mayor número de código asignado hasta ahora.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+    Retorna:
+        int: La marca del asignador
+    """
+    return _asignador(inventario)["marca"]
+
+
+def establecer_marca(inventario, numero):
+    """
+    Sube la marca del asignador (nunca la baja). Se usa
+    al restaurar el inventario desde disco para recordar
+    códigos de productos ya eliminados.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+        numero (int): Número mínimo de la marca
+    """
+    asignador = _asignador(inventario)
+    if numero > asignador["marca"]:
+        asignador["marca"] = numero
+
+
+def reservar_codigos(inventario, cantidad):
+    """
+    Reserva un bloque contiguo de códigos nuevos.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+        cantidad (int): Cantidad de códigos a reservar
+    Retorna:
+        list: Códigos reservados en orden
+    """
+    asignador = _asignador(inventario)
+    inicio = asignador["marca"] + 1
+    asignador["marca"] += cantidad
+    return [formatear_codigo(numero) for numero in range(inicio, inicio + cantidad)]
+
+
+def siguiente_codigo(inventario):
+    """
+    Reserva y devuelve el siguiente código disponible.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+    Retorna:
+        str: Nuevo código de producto
+    """
+    asignador = _asignador(inventario)
+    asignador["marca"] += 1
+    return formatear_codigo(asignador["marca"])
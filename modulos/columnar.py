@@ -0,0 +1,250 @@
+"""
+============================================================
+Módulo: columnar.py
+============================================================
+Descripción: Almacenamiento compacto del inventario por
+columnas. Los precios y el stock se guardan en arreglos
+numéricos (array) y las categorías y proveedores se
+codifican como números que apuntan a una tabla de
+textos. Se usa igual que el diccionario de productos,
+por lo que operaciones y reportes funcionan sin cambios.
+============================================================
+"""
+
+import sys
+from array import array
+from collections.abc import MutableMapping
+
+# Campos de cada producto, en el orden del diccionario original
+CAMPOS = ("nombre", "precio", "stock", "categoria", "proveedor")
+
+# Compactar cuando las filas borradas superan este mínimo
+# y además la mitad de las filas
+MIN_BORRADOS_COMPACTAR = 1024
+
+
+class TablaTextos:
+    """
+    Codificación por diccionario: cada texto distinto se
+    guarda una sola vez y se representa con un número.
+    """
+
+    def __init__(self):
+        self.textos = []
+        self.ids = {}
+
+    def codificar(self, texto):
+        """
+        Devuelve el número del texto, agregándolo si es nuevo.
+
+        Parámetros:
+            texto (str): Texto a codificar
+        Retorna:
+            int: Identificador del texto
+        """
+        identificador = self.ids.get(texto)
+        if identificador is None:
+            identificador = len(self.textos)
+            self.textos.append(sys.intern(texto))
+            self.ids[texto] = identificador
+        return identificador
+
+
+class ProductoVista(MutableMapping):
+    """
+    Vista de un producto almacenado por columnas. Se lee y
+    se modifica como el diccionario de un producto.
+    """
+
+    __slots__ = ("_inventario", "_codigo")
+
+    def __init__(self, inventario, codigo):
+        self._inventario = inventario
+        self._codigo = codigo
+
+    def __getitem__(self, campo):
+        return self._inventario._leer_campo(self._codigo, campo)
+
+    def __setitem__(self, campo, valor):
+        self._inventario._escribir_campo(self._codigo, campo, valor)
+
+    def __delitem__(self, campo):
+        raise TypeError("No se pueden eliminar campos de un producto.")
+
+    def __iter__(self):
+        return iter(CAMPOS)
+
+    def __len__(self):
+        return len(CAMPOS)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class InventarioColumnar(MutableMapping):
+    """
+    Inventario compatible con el diccionario {código: producto}
+    que guarda los datos en columnas. Las bajas marcan la
+    fila como borrada y se compacta cuando se acumulan.
+    """
+
+    def __init__(self, productos=None):
+        # Recorridos (iteradores) abiertos: mientras haya alguno no se compacta
+        self._recorridos = 0
+        self._vaciar()
+        if productos:
+            self.update(productos)
+
+    def _vaciar(self):
+        self._filas = {}
+        self._codigos = []
+        self._nombres = []
+        self.precios = array("d")
+        self.stocks = array("q")
+        self.ids_categoria = array("I")
+        self.ids_proveedor = array("I")
+        self.categorias = TablaTextos()
+        self.proveedores = TablaTextos()
+        self._borrados = 0
+
+    # --- Acceso por campo (usado por ProductoVista) ---
+
+    def _leer_campo(self, codigo, campo):
+        fila = self._filas[codigo]
+        if campo == "precio":
+            return self.precios[fila]
+        if campo == "stock":
+            return self.stocks[fila]
+        if campo == "nombre":
+            return self._nombres[fila]
+        if campo == "categoria":
+            return self.categorias.textos[self.ids_categoria[fila]]
+        if campo == "proveedor":
+            return self.proveedores.textos[self.ids_proveedor[fila]]
+        raise KeyError(campo)
+
+    def _escribir_campo(self, codigo, campo, valor):
+        fila = self._filas[codigo]
+        if campo == "precio":
+            self.precios[fila] = float(valor)
+        elif campo == "stock":
+            self.stocks[fila] = int(valor)
+        elif campo == "nombre":
+            self._nombres[fila] = valor
+        elif campo == "categoria":
+            self.ids_categoria[fila] = self.categorias.codificar(valor)
+        elif campo == "proveedor":
+            self.ids_proveedor[fila] = self.proveedores.codificar(valor)
+        else:
+            raise KeyError(campo)
+
+    # --- Interfaz de diccionario ---
+
+    def __getitem__(self, codigo):
+        if codigo not in self._filas:
+            raise KeyError(codigo)
+        return ProductoVista(self, codigo)
+
+    def __setitem__(self, codigo, producto):
+        fila = self._filas.get(codigo)
+        if fila is not None:
+            for campo in CAMPOS:
+                self._escribir_campo(codigo, campo, producto[campo])
+            return
+
+        self._filas[codigo] = len(self._codigos)
+        self._codigos.append(codigo)
+        self._nombres.append(producto["nombre"])
+        self.precios.append(float(producto["precio"]))
+        self.stocks.append(int(producto["stock"]))
+        self.ids_categoria.append(self.categorias.codificar(producto["categoria"]))
+        self.ids_proveedor.append(self.proveedores.codificar(producto["proveedor"]))
+
+    def __delitem__(self, codigo):
+        fila = self._filas.pop(codigo)
+        self._codigos[fila] = None
+        self._nombres[fila] = None
+        self._borrados += 1
+        # Durante un recorrido solo se marca la fila: compactar movería
+        # las posiciones de la lista que se está recorriendo
+        if (not self._recorridos and self._borrados > MIN_BORRADOS_COMPACTAR
+                and self._borrados * 2 > len(self._codigos)):
+            self.compactar()
+
+    def __iter__(self):
+        self._recorridos += 1
+        try:
+            for codigo in self._codigos:
+                if codigo is not None:
+                    yield codigo
+        finally:
+            self._recorridos -= 1
+
+    def __len__(self):
+        return len(self._filas)
+
+    def __contains__(self, codigo):
+        return codigo in self._filas
+
+    def __repr__(self):
+        return f"InventarioColumnar({len(self)} productos)"
+
+    def pop(self, codigo, *predeterminado):
+        """
+        Elimina un producto y devuelve una copia de sus datos
+        (la vista dejaría de ser válida tras la baja).
+        """
+        if codigo not in self._filas:
+            if predeterminado:
+                return predeterminado[0]
+            raise KeyError(codigo)
+        datos = dict(ProductoVista(self, codigo))
+        del self[codigo]
+        return datos
+
+    def clear(self):
+        """
+        Elimina todos los productos de una sola vez.
+        """
+        self._vaciar()
+
+    def filas_vivas(self):
+        """
+        Devuelve las posiciones de las filas no borradas, en
+        orden de inserción (las de list(inventario)).
+        """
+        if not self._borrados:
+            return range(len(self._codigos))
+        return [fila for fila, codigo in enumerate(self._codigos) if codigo is not None]
+
+    def compactar(self):
+        """
+        Elimina las filas borradas de todas las columnas,
+        conservando el orden de inserción.
+        """
+        if not self._borrados:
+            return
+        vivas = self.filas_vivas()
+        self._codigos = [self._codigos[fila] for fila in vivas]
+        self._nombres = [self._nombres[fila] for fila in vivas]
+        self.precios = array("d", (self.precios[fila] for fila in vivas))
+        self.stocks = array("q", (self.stocks[fila] for fila in vivas))
+        self.ids_categoria = array("I", (self.ids_categoria[fila] for fila in vivas))
+        self.ids_proveedor = array("I", (self.ids_proveedor[fila] for fila in vivas))
+        self._filas = {codigo: fila for fila, codigo in enumerate(self._codigos)}
+        self._borrados = 0
+
+
+def a_columnar(inventario):
+    """
+    Convierte un inventario (diccionario de productos) al
+    almacenamiento por columnas.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+    Retorna:
+        InventarioColumnar: Inventario equivalente
+    """
+    if isinstance(inventario, InventarioColumnar):
+        return inventario
+    return InventarioColumnar(inventario)
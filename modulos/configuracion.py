@@ -0,0 +1,177 @@
+"""
+============================================================
+Módulo: configuracion.py
+============================================================
+Descripción: Configuración del sistema. Los parámetros se
+cargan una sola vez en un mapeo inmutable con búsqueda
+O(1). Los valores por defecto vienen de datos.py y se
+pueden sobrescribir con un archivo JSON o con variables
+de entorno (SGP_STOCK_MINIMO=3, etc.). Al cambiar un
+valor se avisa a las funciones que dependen de él.
+============================================================
+"""
+
+import json
+import os
+from collections.abc import Mapping
+from types import MappingProxyType
+
+from modulos.datos import configuracion_sistema
+
+# Archivo de configuración opcional junto a main.py
+RUTA_CONFIG = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config.json")
+
+# Prefijo de las variables de entorno (SGP_<CLAVE>)
+PREFIJO_ENTORNO = "SGP_"
+
+# Mapeo inmutable con la configuración vigente (None = sin cargar)
+_config = None
+
+# Funciones que dependen de la configuración: funcion(clave, anterior, nuevo)
+_dependientes = []
+
+
+def _convertir(clave, valor, referencia):
+    """
+    Convierte un valor al tipo del valor por defecto.
+
+    Parámetros:
+        clave (str): Clave de configuración
+        valor: Valor leído (texto o JSON)
+        referencia: Valor por defecto de la clave
+    Retorna:
+        El valor convertido
+    """
+    try:
+        if isinstance(referencia, Mapping):
+            # Diccionario {clave: entero}; desde el entorno llega como JSON
+            if isinstance(valor, str):
+                valor = json.loads(valor)
+            return MappingProxyType({str(clave_interna): int(numero) for clave_interna, numero in valor.items()})
+        if isinstance(referencia, bool):
+            if isinstance(valor, str):
+                return valor.strip().lower() in ("1", "true", "si", "sí", "s")
+            return bool(valor)
+        if isinstance(referencia, int):
+            return int(valor)
+        if isinstance(referencia, float):
+            return float(valor)
+    except (TypeError, ValueError, AttributeError):
+        raise ValueError(f"Valor no válido para '{clave}': {valor!r}") from None
+    return valor
+
+
+def cargar_configuracion(ruta=None, entorno=None):
+    """
+    Carga la configuración: valores por defecto, luego el
+    archivo JSON (si existe) y por último las variables de
+    entorno.
+
+    Parámetros:
+        ruta (str): Archivo JSON (por defecto SGP_CONFIG o config.json)
+        entorno (dict): Variables de entorno (por defecto os.environ)
+    Retorna:
+        MappingProxyType: Configuración vigente (solo lectura)
+    """
+    global _config
+    entorno = os.environ if entorno is None else entorno
+    valores = dict(configuracion_sistema)
+    for clave, valor in valores.items():
+        if isinstance(valor, Mapping):
+            valores[clave] = MappingProxyType(dict(valor))
+
+    ruta = ruta or entorno.get(PREFIJO_ENTORNO + "CONFIG") or RUTA_CONFIG
+    if os.path.exists(ruta):
+        with open(ruta, encoding="utf-8") as archivo:
+            for clave, valor in json.load(archivo).items():
+                if clave not in valores:
+                    raise ValueError(f"Clave de configuración desconocida en {ruta}: '{clave}'")
+                valores[clave] = _convertir(clave, valor, valores[clave])
+
+    for clave in list(valores):
+        variable = PREFIJO_ENTORNO + clave.upper()
+        if variable in entorno:
+            valores[clave] = _convertir(clave, entorno[variable], valores[clave])
+
+    anterior = _config
+    _config = MappingProxyType(valores)
+    if anterior is not None:
+        for clave, valor in valores.items():
+            if anterior.get(clave) != valor:
+                _avisar(clave, anterior.get(clave), valor)
+    return _config
+
+
+def configuracion():
+    """
+    Devuelve la configuración vigente, cargándola la
+    primera vez.
+
+    Retorna:
+        MappingProxyType: Configuración (solo lectura)
+    """
+    if _config is None:
+        cargar_configuracion()
+    return _config
+
+
+def obtener_config(clave):
+    """
+    Obtiene un valor de configuración por su clave en O(1).
+
+    Parámetros:
+        clave (str): La clave a buscar
+    Retorna:
+        valor: El valor asociado a la clave o None
+    """
+    if _config is None:
+        cargar_configuracion()
+    return _config.get(clave)
+
+
+def establecer_config(clave, valor):
+    """
+    Cambia un valor de configuración en tiempo de ejecución
+    y avisa a las funciones dependientes.
+
+    Parámetros:
+        clave (str): Clave existente
+        valor: Nuevo valor (se convierte al tipo del actual)
+    """
+    global _config
+    actual = configuracion()
+    if clave not in actual:
+        raise ValueError(f"Clave de configuración desconocida: '{clave}'")
+    valor = _convertir(clave, valor, actual[clave])
+    anterior = actual[clave]
+    if valor == anterior:
+        return
+    _config = MappingProxyType(dict(actual, **{clave: valor}))
+    _avisar(clave, anterior, valor)
+
+
+def al_cambiar_config(funcion):
+    """
+    Registra una función que se llama cuando cambia un
+    valor, para invalidar lo que se calculó con él.
+
+    Parámetros:
+        funcion (function): Recibe (clave, anterior, nuevo)
+    Retorna:
+        function: La misma función (se puede usar como decorador)
+    """
+    _dependientes.append(funcion)
+    return funcion
+
+
+def _avisar(clave, anterior, nuevo):
+    """
+    Llama a las funciones dependientes ante un cambio.
+
+    Parámetros:
+        clave (str): Clave modificada
+        anterior: Valor anterior
+        nuevo: Valor nuevo
+    """
+    for funcion in list(_dependientes):
+        funcion(clave, anterior, nuevo)
@@ -8,12 +8,15 @@ y conjuntos según corresponda.
 ============================================================
 """
 
+from modulos.cambios import Inventario
+
 # -------------------------------------------------------------
 # DICCIONARIO PRINCIPAL: Inventario de productos
 # Estructura: {ID: {nombre, precio, stock, categoria, proveedor}}
 # Uso: Almacenamiento principal de datos (clave-valor)
+# Inventario es un dict que admite referencias débiles (ver cambios.py)
 # -------------------------------------------------------------
-inventario = {
+inventario = Inventario({
     "P001": {
         "nombre": "Laptop Dell XPS",
         "precio": 1250000.00,
@@ -63,7 +66,7 @@ inventario = {
         "categoria": "Almacenamiento",
         "proveedor": "TechDistributor"
     }
-}
+})
 
 # -------------------------------------------------------------
 # CONJUNTO (set): Categorías válidas del sistema
@@ -94,34 +97,34 @@ proveedores = (
 
 # -------------------------------------------------------------
 # TUPLA: Configuración del sistema (inmutable)
-# Uso: Parámetros fijos del sistema
+# Uso: Valores por defecto (ver configuracion.py)
 # -------------------------------------------------------------
 configuracion_sistema = (
     ("stock_minimo", 5),           # Umbral de stock bajo
     ("precio_minimo", 100.00),     # Precio mínimo permitido
     ("precio_maximo", 5000000.00), # Precio máximo permitido
-    ("max_productos", 500)         # Máximo de productos permitidos
+    ("max_productos", 500),        # Máximo de productos permitidos
+    ("inventario_columnar", False), # Guardar el inventario por columnas (menos memoria)
+    ("stock_minimo_categoria", {}), # Umbral de stock bajo propio de algunas categorías
+    ("archivo_eventos", ""),        # Archivo de eventos de cambio ("" = no se publican)
+    ("metricas", False),            # Registrar métricas de las operaciones
+    ("archivo_metricas", ""),       # Archivo de métricas al salir ("" = no se guardan)
+    ("perfilar_opcion", 0),         # Opción del menú a perfilar (0 = ninguna)
+    ("modo_perfil", "cprofile")     # "cprofile" (tiempo) o "memoria" (tracemalloc)
 )
 
 
 def obtener_config(clave):
     """
-    Función recursiva que busca un valor de configuración
-    por su clave dentro de la tupla de configuración.
+    Busca un valor de configuración por su clave. Se
+    mantiene por compatibilidad: la configuración vigente
+    (con los cambios del archivo y del entorno) está en
+    configuracion.py.
 
     Parámetros:
         clave (str): La clave a buscar
     Retorna:
         valor: El valor asociado a la clave o None
     """
-    def buscar_recursivo(configs, indice):
-        # Caso base: llegamos al final sin encontrar
-        if indice >= len(configs):
-            return None
-        # Caso base: encontramos la clave
-        if configs[indice][0] == clave:
-            return configs[indice][1]
-        # Caso recursivo: buscar en el siguiente elemento
-        return buscar_recursivo(configs, indice + 1)
-
-    return buscar_recursivo(configuracion_sistema, 0)
\ No newline at end of file
+    from modulos.configuracion import obtener_config as obtener
+    return obtener(clave)
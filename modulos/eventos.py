@@ -0,0 +1,428 @@
+"""
+============================================================
+Módulo: eventos.py
+============================================================
+Descripción: Eventos de cambio del inventario para otros
+sistemas (precios, sincronización con el ERP). Cada alta,
+modificación o baja se publica como un evento tipado:
+creado, actualizado (con los valores anteriores y nuevos
+de los campos que cambiaron) o eliminado.
+
+Los suscriptores pueden ser funciones del mismo proceso
+o un SumideroArchivo, que escribe los eventos por lotes
+en un archivo JSON Lines desde un hilo aparte. Su cola
+tiene un tamaño máximo: si el disco no da abasto, quien
+modifica el inventario espera (contrapresión) en lugar
+de acumular eventos sin límite en memoria. Si la
+escritura falla, el error se guarda y se lanza en la
+siguiente publicación o al cerrar, en lugar de dejar a
+quien publica esperando una cola que nadie vacía. Como
+el inventario ya cambió, el bus no corta la mutación:
+guarda el error y quien hizo el cambio lo consulta con
+tomar_error() para informarlo.
+
+Los consumidores leen el archivo con leer_eventos()
+desde la última secuencia que procesaron y aplican los
+cambios con aplicar_evento().
+============================================================
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass, field, asdict
+
+from modulos.cambios import obtener_auxiliar
+
+# Tipos de evento
+EVENTO_CREADO = "creado"
+EVENTO_ACTUALIZADO = "actualizado"
+EVENTO_ELIMINADO = "eliminado"
+TIPOS_EVENTO = (EVENTO_CREADO, EVENTO_ACTUALIZADO, EVENTO_ELIMINADO)
+
+# Valores por defecto del sumidero en archivo
+TAM_LOTE = 256
+MAX_PENDIENTES = 10000
+INTERVALO_ESCRITURA = 0.2
+
+
+@dataclass(frozen=True)
+class Evento:
+    """Un cambio del inventario."""
+    secuencia: int
+    tipo: str
+    codigo: str
+    momento: float
+    producto: dict = None          # Datos completos (creado y actualizado)
+    cambios: dict = field(default_factory=dict)   # {campo: [anterior, nuevo]}
+
+    def a_dict(self):
+        """Convierte el evento a un diccionario serializable."""
+        return asdict(self)
+
+
+# -------------------------------------------------------------
+# BUS DE EVENTOS
+# -------------------------------------------------------------
+def _nuevo_bus(inventario):
+    """
+    Crea el estado del bus de eventos de un inventario.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+    Retorna:
+        dict: secuencia, suscriptores y errores
+    """
+    return {
+        "secuencia": 0,
+        "suscriptores": {},      # {id: (funcion, tipos o None)}
+        "siguiente_id": 1,
+        "errores": 0,            # Fallos de suscriptores (no detienen la mutación)
+        "sin_informar": 0,       # Fallos desde el último tomar_error()
+        "ultimo_error": None
+    }
+
+
+def _crear_evento(secuencia, accion, codigo, anterior, actual):
+    """
+    Traduce una mutación de cambios.notificar a un evento.
+
+    Parámetros:
+        secuencia (int): Número del evento
+        accion (str): Tipo de mutación
+        codigo (str): Código del producto afectado
+        anterior (dict): Producto antes del cambio o None
+        actual (dict): Producto después del cambio o None
+    Retorna:
+        Evento: El evento o None si no cambió ningún campo
+    """
+    momento = time.time()
+    if actual is None:
+        return Evento(secuencia, EVENTO_ELIMINADO, codigo, momento)
+    producto = dict(actual)
+    if anterior is None:
+        return Evento(secuencia, EVENTO_CREADO, codigo, momento, producto)
+    cambios = {campo: [anterior.get(campo), valor]
+               for campo, valor in producto.items() if anterior.get(campo) != valor}
+    if not cambios:
+        return None
+    return Evento(secuencia, EVENTO_ACTUALIZADO, codigo, momento, producto, cambios)
+
+
+def _publicar(bus, accion, codigo, anterior, actual):
+    """
+    Publica una mutación a los suscriptores del bus.
+
+    Parámetros:
+        bus (dict): Estado del bus de eventos
+        accion (str): Tipo de mutación (ver cambios.notificar)
+        codigo (str): Código del producto afectado
+        anterior (dict): Producto antes del cambio
+        actual (dict): Producto después del cambio o None
+    """
+    if not bus["suscriptores"]:
+        return
+    evento = _crear_evento(bus["secuencia"] + 1, accion, codigo, anterior, actual)
+    if evento is None:
+        return
+    bus["secuencia"] = evento.secuencia
+    for funcion, tipos in list(bus["suscriptores"].values()):
+        if tipos is not None and evento.tipo not in tipos:
+            continue
+        try:
+            funcion(evento)
+        except Exception as error:  # el inventario ya cambió: un suscriptor no debe cortar la notificación
+            bus["errores"] += 1
+            bus["sin_informar"] += 1
+            bus["ultimo_error"] = error
+
+
+def tomar_error(inventario):
+    """
+    Obtiene los fallos de los suscriptores desde la última
+    consulta (por ejemplo, un sumidero que no puede escribir)
+    y los da por informados.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+    Retorna:
+        tuple: (cantidad de fallos, último error) o None si no hubo
+    """
+    bus = obtener_auxiliar(inventario, "eventos")
+    if bus is None or not bus["sin_informar"]:
+        return None
+    fallo = (bus["sin_informar"], bus["ultimo_error"])
+    bus["sin_informar"] = 0
+    return fallo
+
+
+def obtener_bus(inventario):
+    """
+    Obtiene el bus de eventos del inventario, creándolo la
+    primera vez.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+    Retorna:
+        dict: Estado del bus de eventos
+    """
+    return obtener_auxiliar(inventario, "eventos", _nuevo_bus, _publicar)
+
+
+def suscribir(inventario, funcion, tipos=None):
+    """
+    Registra una función que recibe cada evento del
+    inventario.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+        funcion (function): Recibe un Evento
+        tipos (iterable): Tipos de evento de interés (None = todos)
+    Retorna:
+        int: Identificador de la suscripción
+    """
+    bus = obtener_bus(inventario)
+    if tipos is not None:
+        tipos = frozenset(tipos)
+        desconocidos = tipos - set(TIPOS_EVENTO)
+        if desconocidos:
+            raise ValueError(f"Tipos de evento no válidos: {sorted(desconocidos)}")
+    identificador = bus["siguiente_id"]
+    bus["siguiente_id"] += 1
+    bus["suscriptores"][identificador] = (funcion, tipos)
+    return identificador
+
+
+def desuscribir(inventario, identificador):
+    """
+    Quita una suscripción.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+        identificador (int): Valor devuelto por suscribir()
+    Retorna:
+        bool: True si existía
+    """
+    return obtener_bus(inventario)["suscriptores"].pop(identificador, None) is not None
+
+
+# -------------------------------------------------------------
+# SUMIDERO EN ARCHIVO
+# -------------------------------------------------------------
+def _ultima_secuencia(ruta):
+    """
+    Obtiene la secuencia del último evento completo de un
+    archivo de eventos (0 si no existe o está vacío).
+
+    Parámetros:
+        ruta (str): Archivo de eventos
+    Retorna:
+        int: Última secuencia escrita
+    """
+    ultima = 0
+    for evento in leer_eventos(ruta):
+        ultima = evento["secuencia"]
+    return ultima
+
+
+class SumideroArchivo:
+    """
+    Escribe los eventos en un archivo JSON Lines, por lotes
+    y desde un hilo aparte. La cola acotada hace esperar a
+    quien publica cuando el escritor se atrasa. Un error de
+    escritura queda en 'error' y detiene la escritura.
+    """
+
+    def __init__(self, ruta, tam_lote=TAM_LOTE, max_pendientes=MAX_PENDIENTES,
+                 intervalo=INTERVALO_ESCRITURA, sincronizar=True):
+        self.ruta = ruta
+        self.tam_lote = tam_lote
+        self.intervalo = intervalo
+        self.sincronizar = sincronizar
+        self.ultima_secuencia = _ultima_secuencia(ruta)
+        self.escritos = 0
+        self.lotes = 0
+        self.error = None
+        self._fin_recibido = False     # El escritor ya sacó el None de cerrar()
+        self._cola = queue.Queue(maxsize=max_pendientes)
+        self._archivo = open(ruta, "a", encoding="utf-8")
+        self._hilo = threading.Thread(target=self._escribir, name="sumidero-eventos", daemon=True)
+        self._hilo.start()
+
+    def __call__(self, evento):
+        """
+        Encola un evento (espera si la cola está llena). Si
+        el escritor falló, lanza su error.
+        """
+        if self._cola is None:
+            raise RuntimeError("El sumidero de eventos está cerrado.")
+        if self.error is not None:
+            raise self.error
+        self._cola.put(evento)
+        # El escritor pudo fallar mientras se esperaba lugar en la cola
+        if self.error is not None:
+            raise self.error
+
+    def _escribir(self):
+        """
+        Hilo escritor. Si la escritura falla, guarda el error
+        y sigue sacando eventos de la cola sin escribirlos,
+        para que nadie quede esperando lugar en ella.
+        """
+        try:
+            self._escribir_lotes()
+        except Exception as error:
+            self.error = error
+            # Si el lote que falló traía el None de cerrar(), no
+            # hay que esperar otro: solo vaciar lo que quede
+            while not self._fin_recibido:
+                if self._cola.get() is None:
+                    self._fin_recibido = True
+                self._cola.task_done()
+            while True:
+                try:
+                    self._cola.get_nowait()
+                except queue.Empty:
+                    break
+                self._cola.task_done()
+
+    def _escribir_lotes(self):
+        """Bucle del hilo escritor: junta lotes y los escribe."""
+        terminar = False
+        while not terminar:
+            lote = [self._cola.get()]
+            # Juntar lo que llegue hasta completar el lote o el intervalo
+            limite = time.monotonic() + self.intervalo
+            while len(lote) < self.tam_lote and lote[-1] is not None:
+                restante = limite - time.monotonic()
+                try:
+                    lote.append(self._cola.get(timeout=restante) if restante > 0 else self._cola.get_nowait())
+                except queue.Empty:
+                    break
+            if lote[-1] is None:
+                terminar = self._fin_recibido = True
+                lote.pop()
+            try:
+                if lote:
+                    self._archivo.write("".join(
+                        json.dumps(evento.a_dict(), ensure_ascii=False) + "\n" for evento in lote
+                    ))
+                    self._archivo.flush()
+                    if self.sincronizar:
+                        os.fsync(self._archivo.fileno())
+                    self.escritos += len(lote)
+                    self.lotes += 1
+            finally:
+                # También si falló: vaciar() no debe esperar este lote
+                for _ in range(len(lote) + terminar):
+                    self._cola.task_done()
+
+    def vaciar(self):
+        """
+        Espera a que todos los eventos encolados estén en
+        disco. Si el escritor falló, lanza su error.
+        """
+        self._cola.join()
+        if self.error is not None:
+            raise self.error
+
+    def cerrar(self):
+        """
+        Escribe lo pendiente y termina el hilo escritor. Si
+        el escritor falló, cierra igual y lanza su error.
+        """
+        if self._cola is None:
+            return
+        self._cola.put(None)
+        self._hilo.join()
+        self._cola = None
+        try:
+            self._archivo.close()
+        except OSError:
+            # El error que importa es el de la escritura
+            if self.error is None:
+                raise
+        if self.error is not None:
+            raise self.error
+
+
+def conectar_archivo(inventario, ruta, **opciones):
+    """
+    Publica los eventos del inventario en un archivo. La
+    numeración continúa desde el último evento del archivo.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+        ruta (str): Archivo de eventos (JSON Lines)
+        **opciones: tam_lote, max_pendientes, intervalo, sincronizar
+    Retorna:
+        tuple: (identificador de suscripción, SumideroArchivo)
+    """
+    sumidero = SumideroArchivo(ruta, **opciones)
+    bus = obtener_bus(inventario)
+    bus["secuencia"] = max(bus["secuencia"], sumidero.ultima_secuencia)
+    return suscribir(inventario, sumidero), sumidero
+
+
+def desconectar_archivo(inventario, identificador, sumidero):
+    """
+    Quita el sumidero del bus y lo cierra.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+        identificador (int): Suscripción del sumidero
+        sumidero (SumideroArchivo): Sumidero a cerrar
+    """
+    desuscribir(inventario, identificador)
+    sumidero.cerrar()
+
+
+# -------------------------------------------------------------
+# CONSUMIDORES
+# -------------------------------------------------------------
+def leer_eventos(ruta, desde=0):
+    """
+    Generador que lee los eventos de un archivo con
+    secuencia mayor a 'desde'. Una última línea incompleta
+    (el escritor todavía no terminó) se ignora.
+
+    Parámetros:
+        ruta (str): Archivo de eventos
+        desde (int): Última secuencia ya procesada
+    Retorna:
+        generator: Eventos como diccionarios
+    """
+    if not os.path.exists(ruta):
+        return
+    with open(ruta, encoding="utf-8") as archivo:
+        for linea in archivo:
+            if not linea.endswith("\n"):
+                break
+            try:
+                evento = json.loads(linea)
+            except ValueError:
+                break
+            if evento["secuencia"] > desde:
+                yield evento
+
+
+def aplicar_evento(replica, evento):
+    """
+    Aplica un evento sobre una copia del inventario.
+
+    Parámetros:
+        replica (dict): Diccionario de productos del consumidor
+        evento (Evento o dict): Evento recibido o leído
+    """
+    if isinstance(evento, Evento):
+        evento = evento.a_dict()
+    if evento["tipo"] == EVENTO_ELIMINADO:
+        replica.pop(evento["codigo"], None)
+    elif evento["tipo"] == EVENTO_CREADO or evento["codigo"] not in replica:
+        replica[evento["codigo"]] = dict(evento["producto"])
+    else:
+        producto = replica[evento["codigo"]]
+        for campo, (_, nuevo) in evento["cambios"].items():
+            producto[campo] = nuevo
@@ -0,0 +1,223 @@
+"""
+============================================================
+Módulo: importacion.py
+============================================================
+Descripción: Carga masiva de productos desde archivos CSV.
+Lee el archivo fila por fila con generadores, valida
+los datos por lotes (columna por columna) y llena el inventario sin mantener
+el archivo completo en memoria.
+============================================================
+"""
+
+import csv
+
+from modulos.validaciones import COLUMNAS_LOTE, validar_columnas, mensaje_error
+from modulos.configuracion import obtener_config
+from modulos.cambios import insertar_producto
+from modulos.codigos import reservar_codigos
+
+# Columnas esperadas en el encabezado del CSV (en orden)
+COLUMNAS_CSV = ("Codigo", "Nombre", "Precio", "Stock", "Categoria", "Proveedor")
+
+# Cantidad máxima de mensajes de error que se conservan
+MAX_ERRORES_GUARDADOS = 100
+
+
+def leer_filas_csv(ruta):
+    """
+    Generador que lee un archivo CSV de productos fila
+    por fila. El bloque de datos termina en la primera
+    línea vacía (después pueden venir notas libres).
+
+    Parámetros:
+        ruta (str): Ruta del archivo CSV
+    Retorna:
+        generator: Tuplas (numero_linea, fila) donde fila
+        es una lista con los 6 campos en texto
+    """
+    with open(ruta, newline="", encoding="utf-8") as archivo:
+        lector = csv.reader(archivo)
+        encabezado = next(lector, None)
+        if encabezado is None:
+            return
+        # Si la primera fila no es encabezado, se trata como dato
+        if tuple(c.strip() for c in encabezado) != COLUMNAS_CSV:
+            yield (1, encabezado)
+
+        for fila in lector:
+            if not fila or not any(campo.strip() for campo in fila):
+                break
+            yield (lector.line_num, fila)
+
+
+def agrupar_en_lotes(filas, tam_lote):
+    """
+    Generador que agrupa las filas en listas de tamaño
+    fijo para validarlas por lotes.
+
+    Parámetros:
+        filas (iterable): Filas a agrupar
+        tam_lote (int): Cantidad de filas por lote
+    Retorna:
+        generator: Listas de hasta tam_lote filas
+    """
+    lote = []
+    for fila in filas:
+        lote.append(fila)
+        if len(lote) >= tam_lote:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
+
+
+def validar_lote(lote, categorias_validas, proveedores):
+    """
+    Valida un lote de filas con el validador por columnas
+    y separa las válidas de las rechazadas.
+
+    Parámetros:
+        lote (list): Tuplas (numero_linea, fila)
+        categorias_validas (set): Categorías permitidas
+        proveedores (tuple): Proveedores autorizados
+    Retorna:
+        tuple: (validos, errores) donde validos es una lista
+        de (linea, codigo, producto) y errores de (linea, mensaje)
+    """
+    validos = []
+    errores = []
+    lineas = []
+    filas = []
+    for linea, fila in lote:
+        if len(fila) != len(COLUMNAS_CSV):
+            errores.append((linea, f"Se esperaban {len(COLUMNAS_CSV)} columnas y hay {len(fila)}."))
+        else:
+            lineas.append(linea)
+            filas.append(fila)
+    if not filas:
+        return (validos, errores)
+
+    # Pasar de filas a columnas: {columna: [valores]}
+    columnas = dict(zip(COLUMNAS_LOTE, map(list, zip(*filas))))
+    mascara, codigos_error, valores = validar_columnas(columnas, categorias_validas, proveedores)
+
+    for i, linea in enumerate(lineas):
+        if mascara[i]:
+            producto = {
+                "nombre": valores["nombre"][i],
+                "precio": valores["precio"][i],
+                "stock": valores["stock"][i],
+                "categoria": valores["categoria"][i],
+                "proveedor": valores["proveedor"][i]
+            }
+            validos.append((linea, valores["codigo"][i], producto))
+        else:
+            error = codigos_error[i]
+            valor = valores[error][i] if error in valores else None
+            errores.append((linea, mensaje_error(error, valor)))
+    errores.sort()
+    return (validos, errores)
+
+
+def importar_csv(inventario, ruta, categorias_validas, proveedores, tam_lote=1000):
+    """
+    Importa productos desde un CSV al inventario. Las filas
+    con un código existente reemplazan al producto; las
+    filas sin código reciben uno automático.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+        ruta (str): Ruta del archivo CSV
+        categorias_validas (set): Categorías permitidas
+        proveedores (tuple): Proveedores autorizados
+        tam_lote (int): Cantidad de filas validadas por lote
+    Retorna:
+        dict: Resumen con leidos, agregados, actualizados,
+        rechazados y la lista de errores (los primeros 100)
+    """
+    max_productos = obtener_config("max_productos")
+    resumen = {
+        "leidos": 0,
+        "agregados": 0,
+        "actualizados": 0,
+        "rechazados": 0,
+        "errores": []
+    }
+
+    def registrar_error(linea, mensaje):
+        resumen["rechazados"] += 1
+        if len(resumen["errores"]) < MAX_ERRORES_GUARDADOS:
+            resumen["errores"].append((linea, mensaje))
+
+    for lote in agrupar_en_lotes(leer_filas_csv(ruta), tam_lote):
+        resumen["leidos"] += len(lote)
+        validos, errores = validar_lote(lote, categorias_validas, proveedores)
+        for linea, mensaje in errores:
+            registrar_error(linea, mensaje)
+
+        # Decidir primero qué filas entran según el máximo de productos:
+        # los códigos automáticos se reservan solo para esas filas (los
+        # reservados no se reutilizan aunque la fila no se inserte)
+        lugares = max_productos - len(inventario)
+        aceptados = []
+        nuevos = set()          # Códigos nuevos ya aceptados en este lote
+        for linea, codigo, producto in validos:
+            if codigo and (codigo in inventario or codigo in nuevos):
+                aceptados.append((codigo, producto))
+                continue
+            if lugares <= 0:
+                registrar_error(linea, f"Se alcanzó el máximo de {max_productos} productos.")
+                continue
+            lugares -= 1
+            if codigo:
+                nuevos.add(codigo)
+            aceptados.append((codigo, producto))
+
+        sin_codigo = sum(1 for codigo, _ in aceptados if not codigo)
+        codigos_nuevos = iter(reservar_codigos(inventario, sin_codigo))
+        for codigo, producto in aceptados:
+            if codigo in inventario:
+                resumen["actualizados"] += 1
+            else:
+                resumen["agregados"] += 1
+            insertar_producto(inventario, codigo or next(codigos_nuevos), producto)
+
+    return resumen
+
+
+def importar_productos(inventario, categorias_validas, proveedores):
+    """
+    Procedimiento interactivo que solicita la ruta de un
+    CSV, lo importa y muestra el resumen de la carga.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+        categorias_validas (set): Categorías permitidas
+        proveedores (tuple): Proveedores autorizados
+    """
+    print("\n  📥 IMPORTAR PRODUCTOS DESDE CSV")
+    ruta = input("  Ingrese ruta del archivo (Enter = datos_entrada.csv): ").strip()
+    ruta = ruta or "datos_entrada.csv"
+
+    try:
+        resumen = importar_csv(inventario, ruta, categorias_validas, proveedores)
+    except OSError as error:
+        print(f"\n  ❌ No se pudo leer el archivo: {error}")
+        return
+
+    print("\n  ✅ Importación finalizada.")
+    print(f"  📌 Filas leídas:        {resumen['leidos']}")
+    print(f"  📌 Productos agregados: {resumen['agregados']}")
+    print(f"  📌 Productos reemplazados: {resumen['actualizados']}")
+    print(f"  📌 Filas rechazadas:    {resumen['rechazados']}")
+
+    for linea, mensaje in resumen["errores"][:10]:
+        print(f"    ⚠️  Línea {linea}: {mensaje}")
+
+    if resumen["rechazados"] > 10:
+        print(f"    ... y {resumen['rechazados'] - 10} error(es) más.")
+
+    max_productos = obtener_config("max_productos")
+    if resumen["rechazados"] and len(inventario) >= max_productos:
+        print(f"\n  💡 Se alcanzó el máximo de {max_productos} productos. Para importar más,")
+        print("     súbalo en config.json o con SGP_MAX_PRODUCTOS (ver README).")
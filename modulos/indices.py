@@ -0,0 +1,652 @@
+"""
+============================================================
+Módulo: indices.py
+============================================================
+Descripción: Índices secundarios del inventario que se
+mantienen al día con cada alta, modificación o baja,
+para responder consultas sin recorrer todos los
+productos.
+
+Índice de stock bajo: por categoría, los productos sin
+stock y los que están por debajo del umbral. El umbral
+es stock_minimo o el propio de la categoría
+(stock_minimo_categoria en la configuración). Consultar
+cuesta O(k) en la cantidad de productos marcados.
+
+Índice de grupos: los códigos de cada categoría y de
+cada proveedor. consultar_productos() los combina con
+unión e intersección de conjuntos (por ejemplo,
+"Accesorios de OfficeSupply con stock menor a 5").
+
+Índice de precios: (precio, codigo) ordenados en una
+ListaOrdenada por bloques, para consultar rangos de
+precio, los k productos más caros o más baratos y
+percentiles en O(log n + k). Cada cambio de precio
+mueve solo el bloque afectado, no toda la lista.
+============================================================
+"""
+
+import itertools
+import math
+from bisect import bisect_left, bisect_right, insort
+
+from modulos.cambios import obtener_auxiliar, registrar_auxiliar
+from modulos.codigos import clave_codigo
+from modulos.configuracion import obtener_config
+
+
+# =============================================================
+# UMBRALES DE STOCK
+# =============================================================
+
+def umbrales_stock():
+    """
+    Obtiene los umbrales de stock bajo vigentes.
+
+    Retorna:
+        tuple: (stock_minimo, {categoria: umbral propio})
+    """
+    return (obtener_config("stock_minimo"), obtener_config("stock_minimo_categoria") or {})
+
+
+def umbral_stock(categoria, umbrales=None):
+    """
+    Obtiene el umbral de stock bajo de una categoría.
+
+    Parámetros:
+        categoria (str): Categoría del producto
+        umbrales (tuple): Resultado de umbrales_stock() (opcional)
+    Retorna:
+        int: Umbral (stock menor a este valor es stock bajo)
+    """
+    stock_minimo, por_categoria = umbrales or umbrales_stock()
+    return por_categoria.get(categoria, stock_minimo)
+
+
+# =============================================================
+# ÍNDICE DE STOCK BAJO
+# =============================================================
+
+def _marcar(indice, codigo, datos):
+    """
+    Agrega un producto al conjunto que le corresponde
+    según su stock (si tiene stock suficiente no se marca).
+    Se guarda su stock para filtrar sin volver al inventario.
+
+    Parámetros:
+        indice (dict): Índice de stock bajo
+        codigo (str): Código del producto
+        datos (dict): Datos del producto
+    """
+    stock = datos["stock"]
+    if stock == 0:
+        conjuntos = indice["sin_stock"]
+    elif stock < umbral_stock(datos["categoria"], indice["umbrales"]):
+        conjuntos = indice["bajo"]
+    else:
+        return
+    conjuntos.setdefault(datos["categoria"], {})[codigo] = stock
+
+
+def _desmarcar(indice, codigo, datos):
+    """
+    Quita un producto de los conjuntos de su categoría.
+
+    Parámetros:
+        indice (dict): Índice de stock bajo
+        codigo (str): Código del producto
+        datos (dict): Datos del producto antes del cambio
+    """
+    categoria = datos["categoria"]
+    for conjuntos in (indice["sin_stock"], indice["bajo"]):
+        codigos = conjuntos.get(categoria)
+        if codigos is not None and codigo in codigos:
+            del codigos[codigo]
+            if not codigos:
+                del conjuntos[categoria]
+
+
+def construir_indice_stock(inventario):
+    """
+    Construye el índice de stock bajo con una pasada.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+    Retorna:
+        dict: umbrales usados, sin_stock y bajo, donde los
+        dos últimos son {categoria: {codigo: stock}}
+    """
+    indice = {"umbrales": umbrales_stock(), "sin_stock": {}, "bajo": {}}
+    for codigo, datos in inventario.items():
+        _marcar(indice, codigo, datos)
+    return indice
+
+
+def _actualizar_indice_stock(indice, accion, codigo, anterior, actual):
+    """
+    Ajusta el índice de stock bajo ante una mutación.
+
+    Parámetros:
+        indice (dict): Índice de stock bajo
+        accion (str): Tipo de mutación (ver cambios.notificar)
+        codigo (str): Código del producto afectado
+        anterior (dict): Producto antes del cambio
+        actual (dict): Producto después del cambio o None
+    """
+    if anterior is not None:
+        _desmarcar(indice, codigo, anterior)
+    if actual is not None:
+        _marcar(indice, codigo, actual)
+
+
+def obtener_indice_stock(inventario):
+    """
+    Obtiene el índice de stock bajo. Si cambiaron los
+    umbrales de la configuración, se reconstruye.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+    Retorna:
+        dict: Índice de stock bajo
+    """
+    indice = obtener_auxiliar(inventario, "stock_bajo", construir_indice_stock, _actualizar_indice_stock)
+    if indice["umbrales"] != umbrales_stock():
+        indice = construir_indice_stock(inventario)
+        registrar_auxiliar(inventario, "stock_bajo", indice, _actualizar_indice_stock)
+    return indice
+
+
+def _codigos_marcados(conjuntos, categoria):
+    """
+    Reúne los códigos marcados de una categoría o de todas,
+    ordenados por código.
+
+    Parámetros:
+        conjuntos (dict): {categoria: {codigo: stock}}
+        categoria (str): Categoría o None para todas
+    Retorna:
+        list: Códigos ordenados
+    """
+    if categoria is not None:
+        codigos = list(conjuntos.get(categoria, ()))
+    else:
+        codigos = [codigo for codigos in conjuntos.values() for codigo in codigos]
+    codigos.sort(key=clave_codigo)
+    return codigos
+
+
+def productos_sin_stock(inventario, categoria=None):
+    """
+    Obtiene los productos sin stock.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+        categoria (str): Limitar a una categoría (opcional)
+    Retorna:
+        list: Códigos ordenados
+    """
+    return _codigos_marcados(obtener_indice_stock(inventario)["sin_stock"], categoria)
+
+
+def productos_stock_bajo(inventario, categoria=None):
+    """
+    Obtiene los productos con stock bajo (mayor a 0 y
+    menor al umbral de su categoría).
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+        categoria (str): Limitar a una categoría (opcional)
+    Retorna:
+        list: Códigos ordenados
+    """
+    return _codigos_marcados(obtener_indice_stock(inventario)["bajo"], categoria)
+
+
+# =============================================================
+# ÍNDICE DE GRUPOS (CATEGORÍA Y PROVEEDOR)
+# =============================================================
+
+# Campos agrupados por el índice
+CAMPOS_GRUPO = ("categoria", "proveedor")
+
+
+def construir_indice_grupos(inventario):
+    """
+    Construye el índice de grupos con una pasada.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+    Retorna:
+        dict: {campo: {valor: {codigo: None}}} para cada
+        campo de CAMPOS_GRUPO
+    """
+    indice = {campo: {} for campo in CAMPOS_GRUPO}
+    for codigo, datos in inventario.items():
+        for campo in CAMPOS_GRUPO:
+            indice[campo].setdefault(datos[campo], {})[codigo] = None
+    return indice
+
+
+def _actualizar_indice_grupos(indice, accion, codigo, anterior, actual):
+    """
+    Ajusta el índice de grupos ante una mutación.
+
+    Parámetros:
+        indice (dict): Índice de grupos
+        accion (str): Tipo de mutación (ver cambios.notificar)
+        codigo (str): Código del producto afectado
+        anterior (dict): Producto antes del cambio
+        actual (dict): Producto después del cambio o None
+    """
+    for campo in CAMPOS_GRUPO:
+        grupos = indice[campo]
+        if anterior is not None and (actual is None or anterior[campo] != actual[campo]):
+            codigos = grupos[anterior[campo]]
+            del codigos[codigo]
+            if not codigos:
+                del grupos[anterior[campo]]
+        if actual is not None and (anterior is None or anterior[campo] != actual[campo]):
+            grupos.setdefault(actual[campo], {})[codigo] = None
+
+
+def obtener_indice_grupos(inventario):
+    """
+    Obtiene el índice de grupos, construyéndolo la primera vez.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+    Retorna:
+        dict: Índice de grupos
+    """
+    return obtener_auxiliar(inventario, "grupos", construir_indice_grupos, _actualizar_indice_grupos)
+
+
+def valores_grupo(inventario, campo):
+    """
+    Obtiene los valores distintos de un campo agrupado.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+        campo (str): "categoria" o "proveedor"
+    Retorna:
+        set: Valores presentes en el inventario
+    """
+    return set(obtener_indice_grupos(inventario)[campo])
+
+
+def _union_grupos(grupos, valores):
+    """
+    Une los códigos de uno o varios valores de un campo.
+
+    Parámetros:
+        grupos (dict): {valor: {codigo: None}}
+        valores (str o iterable): Valor o valores buscados
+    Retorna:
+        set o dict: Códigos (un dict del índice si hay un solo valor)
+    """
+    if isinstance(valores, str):
+        valores = (valores,)
+    conjuntos = [grupos[valor] for valor in valores if valor in grupos]
+    if len(conjuntos) == 1:
+        return conjuntos[0]
+    return set().union(*conjuntos)
+
+
+def _candidatos_stock_menor(inventario, stock_menor):
+    """
+    Obtiene del índice de stock bajo los productos con
+    stock < stock_menor. El índice los tiene a todos solo
+    si stock_menor no supera ningún umbral de stock bajo.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+        stock_menor (int): Límite de stock (excluido)
+    Retorna:
+        dict: {codigo: None} o None si el índice no alcanza
+    """
+    indice = obtener_indice_stock(inventario)
+    stock_minimo, por_categoria = indice["umbrales"]
+    if stock_menor > min((stock_minimo, *por_categoria.values())):
+        return None
+    return {codigo: None
+            for conjuntos in (indice["sin_stock"], indice["bajo"])
+            for codigos in conjuntos.values()
+            for codigo, stock in codigos.items()
+            if stock < stock_menor}
+
+
+def consultar_productos(inventario, categorias=None, proveedores=None, stock_menor=None,
+                        precio_minimo=None, precio_maximo=None, stock_desde=None):
+    """
+    Obtiene los productos que cumplen todos los filtros
+    indicados. Dentro de un filtro, varios valores se unen
+    (categorías A o B); entre filtros se intersecan
+    (categoría y proveedor). Si hay rango de precio y es
+    el grupo más chico, se recorre su tramo del índice de
+    precios; si no, el precio se revisa como el stock,
+    solo en los candidatos que dejan los otros filtros.
+    Si stock_menor no supera ningún umbral de stock bajo,
+    el índice de stock bajo aporta su propio grupo.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+        categorias (str o iterable): Categoría o categorías (opcional)
+        proveedores (str o iterable): Proveedor o proveedores (opcional)
+        stock_menor (int): Solo productos con stock menor (opcional)
+        precio_minimo (float): Precio mínimo incluido (opcional)
+        precio_maximo (float): Precio máximo incluido (opcional)
+        stock_desde (int): Solo productos con stock mayor o igual (opcional)
+    Retorna:
+        list: Códigos ordenados
+    """
+    indice = obtener_indice_grupos(inventario)
+    conjuntos = []
+    if categorias is not None:
+        conjuntos.append(_union_grupos(indice["categoria"], categorias))
+    if proveedores is not None:
+        conjuntos.append(_union_grupos(indice["proveedor"], proveedores))
+    revisar_stock = stock_menor is not None
+    if revisar_stock:
+        marcados = _candidatos_stock_menor(inventario, stock_menor)
+        if marcados is not None:
+            # Ya filtrados por stock: no hace falta revisarlo después
+            conjuntos.append(marcados)
+            revisar_stock = False
+    conjuntos.sort(key=len)
+
+    revisar_precio = precio_minimo is not None or precio_maximo is not None
+    if revisar_precio:
+        precios = obtener_indice_precios(inventario)
+        inicio, fin = _tramo_precios(precios, precio_minimo, precio_maximo)
+        if not conjuntos or fin - inicio <= len(conjuntos[0]):
+            # El tramo de precios es el grupo más chico: recorrerlo
+            conjuntos.insert(0, [codigo for _, _, codigo in precios[inicio:fin]])
+            revisar_precio = False
+
+    if conjuntos:
+        # Intersecar recorriendo el conjunto más chico
+        menor, *resto = conjuntos
+        candidatos = menor if not resto else [codigo for codigo in menor
+                                              if all(codigo in otro for otro in resto)]
+    else:
+        candidatos = inventario
+
+    if revisar_precio:
+        minimo = -math.inf if precio_minimo is None else precio_minimo
+        maximo = math.inf if precio_maximo is None else precio_maximo
+        candidatos = [codigo for codigo in candidatos
+                      if minimo <= inventario[codigo]["precio"] <= maximo]
+    if revisar_stock:
+        candidatos = [codigo for codigo in candidatos if inventario[codigo]["stock"] < stock_menor]
+    if stock_desde is not None:
+        candidatos = [codigo for codigo in candidatos if inventario[codigo]["stock"] >= stock_desde]
+    candidatos = list(candidatos)
+    candidatos.sort(key=clave_codigo)
+    return candidatos
+
+
+# =============================================================
+# ÍNDICE DE PRECIOS
+# =============================================================
+
+class ListaOrdenada:
+    """
+    Lista ordenada guardada en bloques (como SortedList de
+    sortedcontainers). Cada bloque es una lista ordenada de
+    hasta 2 * CARGA elementos y _maximos guarda el último
+    de cada uno. Agregar o quitar ubica el bloque con
+    búsqueda binaria y mueve solo ese bloque: O(log n +
+    CARGA) en lugar del O(n) de insort/del sobre una sola
+    lista. Se indexa y se corta como una lista.
+    """
+
+    CARGA = 500
+
+    def __init__(self, elementos=()):
+        ordenados = sorted(elementos)
+        self._bloques = [ordenados[i:i + self.CARGA] for i in range(0, len(ordenados), self.CARGA)]
+        self._maximos = [bloque[-1] for bloque in self._bloques]
+        self._largo = len(ordenados)
+        # Posición final de cada bloque; se recalcula en la
+        # primera consulta por posición después de un cambio
+        self._finales = None
+
+    def __len__(self):
+        return self._largo
+
+    def __iter__(self):
+        return itertools.chain.from_iterable(self._bloques)
+
+    def agregar(self, elemento):
+        """Inserta un elemento en su lugar."""
+        if not self._bloques:
+            self._bloques.append([elemento])
+            self._maximos.append(elemento)
+        else:
+            i = min(bisect_left(self._maximos, elemento), len(self._maximos) - 1)
+            bloque = self._bloques[i]
+            insort(bloque, elemento)
+            self._maximos[i] = bloque[-1]
+            if len(bloque) > 2 * self.CARGA:
+                self._bloques[i:i + 1] = [bloque[:self.CARGA], bloque[self.CARGA:]]
+                self._maximos[i:i + 1] = [bloque[self.CARGA - 1], bloque[-1]]
+        self._largo += 1
+        self._finales = None
+
+    def quitar(self, elemento):
+        """Quita un elemento; ValueError si no está."""
+        i = bisect_left(self._maximos, elemento)
+        if i == len(self._maximos):
+            raise ValueError(f"{elemento!r} no está en la lista")
+        bloque = self._bloques[i]
+        j = bisect_left(bloque, elemento)
+        if bloque[j] != elemento:
+            raise ValueError(f"{elemento!r} no está en la lista")
+        del bloque[j]
+        self._largo -= 1
+        self._finales = None
+        if bloque:
+            self._maximos[i] = bloque[-1]
+            if len(bloque) < self.CARGA // 2 and len(self._bloques) > 1:
+                self._unir(i)
+        else:
+            del self._bloques[i]
+            del self._maximos[i]
+
+    def _unir(self, i):
+        """Une un bloque chico con el siguiente (o el anterior)."""
+        if i == len(self._bloques) - 1:
+            i -= 1
+        unido = self._bloques[i] + self._bloques[i + 1]
+        if len(unido) > 2 * self.CARGA:
+            mitad = len(unido) // 2
+            self._bloques[i:i + 2] = [unido[:mitad], unido[mitad:]]
+            self._maximos[i:i + 2] = [unido[mitad - 1], unido[-1]]
+        else:
+            self._bloques[i:i + 2] = [unido]
+            self._maximos[i:i + 2] = [unido[-1]]
+
+    def _inicio(self, i):
+        """Posición del primer elemento del bloque i."""
+        if self._finales is None:
+            self._finales = list(itertools.accumulate(map(len, self._bloques)))
+        return self._finales[i - 1] if i else 0
+
+    def bisect_left(self, valor):
+        """Como bisect.bisect_left sobre la lista completa."""
+        i = bisect_left(self._maximos, valor)
+        if i == len(self._maximos):
+            return self._largo
+        return self._inicio(i) + bisect_left(self._bloques[i], valor)
+
+    def bisect_right(self, valor):
+        """Como bisect.bisect_right sobre la lista completa."""
+        i = bisect_right(self._maximos, valor)
+        if i == len(self._maximos):
+            return self._largo
+        return self._inicio(i) + bisect_right(self._bloques[i], valor)
+
+    def __getitem__(self, posicion):
+        if isinstance(posicion, slice):
+            inicio, fin, paso = posicion.indices(self._largo)
+            if paso != 1:
+                return list(self)[posicion]
+            resultado = []
+            if inicio >= fin:
+                return resultado
+            self._inicio(0)
+            i = bisect_right(self._finales, inicio)
+            desplazamiento = inicio - self._inicio(i)
+            while len(resultado) < fin - inicio:
+                faltan = fin - inicio - len(resultado)
+                resultado.extend(self._bloques[i][desplazamiento:desplazamiento + faltan])
+                i, desplazamiento = i + 1, 0
+            return resultado
+        if posicion < 0:
+            posicion += self._largo
+        if not 0 <= posicion < self._largo:
+            raise IndexError("índice fuera de rango")
+        self._inicio(0)
+        i = bisect_right(self._finales, posicion)
+        return self._bloques[i][posicion - self._inicio(i)]
+
+
+def construir_indice_precios(inventario):
+    """
+    Construye el índice de precios ordenando una vez.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+    Retorna:
+        ListaOrdenada: Tuplas (precio, clave, codigo) en orden
+              ascendente, con los empates ordenados por clave_codigo
+    """
+    return ListaOrdenada((datos["precio"], clave_codigo(codigo), codigo) for codigo, datos in inventario.items())
+
+
+def _actualizar_indice_precios(indice, accion, codigo, anterior, actual):
+    """
+    Ajusta el índice de precios ante una mutación. Solo
+    las altas, bajas y cambios de precio lo modifican.
+
+    Parámetros:
+        indice (ListaOrdenada): Índice de precios
+        accion (str): Tipo de mutación (ver cambios.notificar)
+        codigo (str): Código del producto afectado
+        anterior (dict): Producto antes del cambio
+        actual (dict): Producto después del cambio o None
+    """
+    if anterior is not None and actual is not None and anterior["precio"] == actual["precio"]:
+        return
+    if anterior is not None:
+        indice.quitar((anterior["precio"], clave_codigo(codigo), codigo))
+    if actual is not None:
+        indice.agregar((actual["precio"], clave_codigo(codigo), codigo))
+
+
+def obtener_indice_precios(inventario):
+    """
+    Obtiene el índice de precios, construyéndolo la primera vez.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+    Retorna:
+        ListaOrdenada: Tuplas (precio, clave, codigo) en orden ascendente
+    """
+    return obtener_auxiliar(inventario, "precios", construir_indice_precios, _actualizar_indice_precios)
+
+
+def _tramo_precios(indice, minimo=None, maximo=None):
+    """
+    Ubica con búsqueda binaria el tramo del índice de
+    precios entre dos valores (ambos incluidos).
+
+    Parámetros:
+        indice (ListaOrdenada): Índice de precios
+        minimo (float): Precio mínimo (None = sin límite)
+        maximo (float): Precio máximo (None = sin límite)
+    Retorna:
+        tuple: (inicio, fin) del tramo en el índice
+    """
+    inicio = 0 if minimo is None else indice.bisect_left((minimo,))
+    # (maximo, (2,)) queda después de cualquier clave_codigo,
+    # que siempre empieza con 0 o 1
+    fin = len(indice) if maximo is None else indice.bisect_right((maximo, (2,)))
+    return (inicio, max(inicio, fin))
+
+
+def productos_en_rango(inventario, minimo=None, maximo=None):
+    """
+    Obtiene los productos con precio entre dos valores
+    (ambos incluidos).
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+        minimo (float): Precio mínimo (None = sin límite)
+        maximo (float): Precio máximo (None = sin límite)
+    Retorna:
+        list: Códigos ordenados por precio ascendente
+    """
+    indice = obtener_indice_precios(inventario)
+    inicio, fin = _tramo_precios(indice, minimo, maximo)
+    return [codigo for _, _, codigo in indice[inicio:fin]]
+
+
+def productos_mas_baratos(inventario, k=1):
+    """
+    Obtiene los k productos de menor precio (ante empates,
+    el código menor primero).
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+        k (int): Cantidad de productos
+    Retorna:
+        list: Códigos ordenados por precio ascendente
+    """
+    return [codigo for _, _, codigo in obtener_indice_precios(inventario)[:max(0, k)]]
+
+
+def productos_mas_caros(inventario, k=1):
+    """
+    Obtiene los k productos de mayor precio (ante empates,
+    el código menor primero).
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+        k (int): Cantidad de productos
+    Retorna:
+        list: Códigos ordenados por precio descendente
+    """
+    indice = obtener_indice_precios(inventario)
+    if k <= 0 or not indice:
+        return []
+    # Los de precio mayor al del k-ésimo entran todos (son menos
+    # de k); del grupo empatado con el k-ésimo solo los de menor
+    # clave_codigo, que dentro del grupo ya están en orden
+    corte = indice[-min(k, len(indice))][0]
+    inicio = indice.bisect_left((corte,))
+    fin = indice.bisect_right((corte, (2,)))
+    mayores = sorted(indice[fin:], key=lambda entrada: (-entrada[0], entrada[1]))
+    empatados = indice[inicio:inicio + k - len(mayores)]
+    return [codigo for _, _, codigo in mayores + empatados]
+
+
+def percentil_precio(inventario, percentil):
+    """
+    Obtiene el precio de un percentil (método del rango
+    más cercano: el menor precio que deja al menos ese
+    porcentaje de productos a su izquierda).
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+        percentil (float): Entre 0 y 100
+    Retorna:
+        float: Precio del percentil o None si no hay productos
+    """
+    if not 0 <= percentil <= 100:
+        raise ValueError("El percentil debe estar entre 0 y 100.")
+    indice = obtener_indice_precios(inventario)
+    if not indice:
+        return None
+    posicion = max(1, math.ceil(percentil / 100 * len(indice)))
+    return indice[posicion - 1][0]
@@ -0,0 +1,447 @@
+"""
+============================================================
+Módulo: lotes.py
+============================================================
+Descripción: Modo por lotes (sin menú) para scripts y
+tareas programadas. Ejecuta una secuencia de comandos
+leída de un archivo o de la entrada estándar, sin
+preguntas ni pausas, y escribe los resultados en JSON
+(una línea por comando) o los reportes en CSV.
+
+Cada línea es un comando con argumentos al estilo de la
+terminal (se admiten comillas); las líneas vacías y las
+que empiezan con # se ignoran:
+
+    agregar nombre="Tablet Samsung" precio=450000 stock=10 categoria=Electrónica proveedor=SamsungOfficial
+    actualizar P003 stock=20 precio=51000
+    eliminar P007
+    buscar logitech
+    buscar camra web aproximada=si
+    buscar codigo=P001
+    listar
+    reporte stock-bajo formato=csv salida=stock_bajo.csv
+    reporte valor procesos=4 por=categoria
+    masivo precio porcentaje 7 categoria=Electrónica proveedor=TechDistributor
+
+Los reportes son categorias, stock-bajo, valor y unicos.
+Con procesos=N los tres primeros se calculan repartiendo
+el inventario entre N procesos (paralelo.py), por código
+o, con por=categoria, por categoría.
+masivo cambia precio o stock (porcentaje, sumar o fijar)
+de los productos que cumplen los filtros categoria,
+proveedor, precio_minimo, precio_maximo, stock_desde y
+stock_menor; con simular=si solo muestra los cambios.
+Cada comando importa los servicios recién al ejecutarse,
+y los servicios importan los índices, la búsqueda y los
+totales solo en las funciones que los usan.
+
+Uso:
+    python main.py --lotes comandos.txt
+    python main.py --lotes - --formato csv < comandos.txt
+============================================================
+"""
+
+import argparse
+import csv
+import json
+import shlex
+import sys
+from dataclasses import asdict, is_dataclass
+
+FORMATOS = ("json", "csv")
+REPORTES = ("categorias", "stock-bajo", "valor", "unicos")
+
+# Reportes que admiten procesos=N y su clave en calcular_reportes_paralelo()
+REPORTES_PARALELOS = {"categorias": "categorias", "stock-bajo": "stock_bajo", "valor": "valor"}
+
+# Columnas de los productos en la salida CSV
+COLUMNAS_PRODUCTO = ("codigo", "nombre", "precio", "stock", "categoria", "proveedor")
+
+
+class ErrorComando(Exception):
+    """Error de un comando del lote (se informa y se sigue con el siguiente)."""
+
+
+# -------------------------------------------------------------
+# LECTURA DE COMANDOS
+# -------------------------------------------------------------
+def leer_comandos(lineas):
+    """
+    Generador que separa cada línea en comando, argumentos
+    posicionales y opciones clave=valor.
+
+    Parámetros:
+        lineas (iterable): Líneas de texto
+    Retorna:
+        generator: Tuplas (numero_linea, comando, posicionales, opciones)
+    """
+    for numero, linea in enumerate(lineas, 1):
+        linea = linea.strip()
+        if not linea or linea.startswith("#"):
+            continue
+        try:
+            partes = shlex.split(linea)
+        except ValueError as error:
+            yield (numero, None, [], {"error": str(error)})
+            continue
+        posicionales = []
+        opciones = {}
+        for parte in partes[1:]:
+            clave, igual, valor = parte.partition("=")
+            if igual:
+                opciones[clave.strip().lower()] = valor
+            else:
+                posicionales.append(parte)
+        yield (numero, partes[0].lower(), posicionales, opciones)
+
+
+# -------------------------------------------------------------
+# SALIDA
+# -------------------------------------------------------------
+def _a_json(valor):
+    """Convierte dataclasses y conjuntos para json.dumps()."""
+    if is_dataclass(valor):
+        return asdict(valor)
+    if isinstance(valor, (set, frozenset)):
+        return sorted(valor)
+    raise TypeError(f"No se puede convertir {type(valor).__name__} a JSON")
+
+
+def _filas_producto(productos, **extra):
+    """Filas CSV de una lista de Producto (con columnas adicionales al inicio)."""
+    return [dict(extra, **{campo: getattr(producto, campo) for campo in COLUMNAS_PRODUCTO})
+            for producto in productos]
+
+
+def filas_csv(nombre, resultado):
+    """
+    Convierte el resultado de un reporte o de una búsqueda
+    en filas para CSV.
+
+    Parámetros:
+        nombre (str): Reporte ("categorias", "stock-bajo",
+            "valor", "unicos"), "productos" o "masivo"
+        resultado: Dataclass del reporte o del cambio masivo,
+            o lista de Producto
+    Retorna:
+        list: Diccionarios con las mismas claves
+    """
+    if nombre == "productos":
+        return _filas_producto(resultado)
+    if nombre == "masivo":
+        return [{"codigo": codigo, "campo": resultado.campo, "anterior": anterior, "nuevo": nuevo}
+                for codigo, anterior, nuevo in resultado.cambios]
+    if nombre == "categorias":
+        return [{"categoria": resumen.categoria, "productos": resumen.cantidad,
+                 "stock": resumen.stock, "valor": resumen.valor}
+                for resumen in resultado.categorias]
+    if nombre == "stock-bajo":
+        return (_filas_producto(resultado.sin_stock, estado="sin_stock")
+                + _filas_producto(resultado.stock_bajo, estado="stock_bajo"))
+    if nombre == "valor":
+        if resultado is None:
+            return []
+        return [{"indicador": indicador, "valor": valor} for indicador, valor in (
+            ("total_productos", resultado.total_productos),
+            ("stock_total", resultado.stock_total),
+            ("valor_total", resultado.valor_total),
+            ("precio_promedio", resultado.precio_promedio),
+            ("mas_caro", resultado.mas_caro.codigo),
+            ("mas_barato", resultado.mas_barato.codigo),
+            ("mayor_valor", resultado.mayor_valor.codigo)
+        )]
+    # unicos
+    return ([{"tipo": "categoria", "valor": categoria} for categoria in resultado.categorias]
+            + [{"tipo": "proveedor", "valor": proveedor} for proveedor in resultado.proveedores])
+
+
+def escribir_resultado(nombre, resultado, formato, destino):
+    """
+    Escribe un reporte o lista de productos en JSON o CSV.
+
+    Parámetros:
+        nombre (str): Ver filas_csv()
+        resultado: Datos a escribir
+        formato (str): "json" o "csv"
+        destino (file): Archivo abierto para escritura
+    """
+    if formato == "csv":
+        filas = filas_csv(nombre, resultado)
+        if filas:
+            escritor = csv.DictWriter(destino, fieldnames=list(filas[0]), lineterminator="\n")
+            escritor.writeheader()
+            escritor.writerows(filas)
+    else:
+        destino.write(json.dumps(resultado, default=_a_json, ensure_ascii=False) + "\n")
+
+
+# -------------------------------------------------------------
+# COMANDOS
+# Cada uno recibe (inventario, posicionales, opciones) y
+# devuelve (nombre, resultado) para escribir, o lanza
+# ErrorComando. Los módulos se importan dentro de cada uno.
+# -------------------------------------------------------------
+def _agregar(inventario, posicionales, opciones):
+    from modulos.servicios import crear_producto
+
+    faltantes = [campo for campo in COLUMNAS_PRODUCTO[1:] if campo not in opciones]
+    if faltantes:
+        raise ErrorComando(f"Faltan campos: {', '.join(faltantes)}")
+    es_valido, resultado = crear_producto(inventario, *(opciones[c] for c in COLUMNAS_PRODUCTO[1:]))
+    if not es_valido:
+        raise ErrorComando(resultado)
+    return ("productos", [resultado])
+
+
+def _codigo(posicionales):
+    if len(posicionales) != 1:
+        raise ErrorComando("Indique un código de producto.")
+    return posicionales[0].strip().upper()
+
+
+def _actualizar(inventario, posicionales, opciones):
+    from modulos.servicios import validar_campo, actualizar_campo, obtener_producto
+
+    codigo = _codigo(posicionales)
+    if codigo not in inventario:
+        raise ErrorComando(f"No se encontró producto con código '{codigo}'.")
+    if not opciones:
+        raise ErrorComando("Indique al menos un campo=valor.")
+    # Validar todos los campos antes de modificar alguno
+    for campo, valor in opciones.items():
+        es_valido, mensaje = validar_campo(campo, valor)
+        if not es_valido:
+            raise ErrorComando(mensaje)
+    # El stock va primero: es el único que se puede rechazar ya
+    # validado (reservas), y así no queda la mitad del cambio hecha
+    for campo in sorted(opciones, key=lambda campo: campo != "stock"):
+        es_valido, mensaje = actualizar_campo(inventario, codigo, campo, opciones[campo])
+        if not es_valido:
+            raise ErrorComando(mensaje)
+    return ("productos", [obtener_producto(inventario, codigo)])
+
+
+def _eliminar(inventario, posicionales, opciones):
+    from modulos.servicios import eliminar
+
+    es_valido, resultado = eliminar(inventario, _codigo(posicionales))
+    if not es_valido:
+        raise ErrorComando(resultado)
+    return ("productos", [resultado])
+
+
+def _buscar(inventario, posicionales, opciones):
+    from modulos.servicios import buscar, obtener_producto
+
+    if "codigo" in opciones:
+        producto = obtener_producto(inventario, opciones["codigo"].strip().upper())
+        return ("productos", [producto] if producto else [])
+    texto = " ".join(posicionales).strip()
+    if not texto:
+        raise ErrorComando("Indique el texto a buscar.")
+    limite = opciones.get("limite")
+    aproximada = opciones.get("aproximada", "no").lower() in ("si", "sí", "1", "true")
+    return ("productos", buscar(inventario, texto, int(limite) if limite else None, aproximada))
+
+
+def _listar(inventario, posicionales, opciones):
+    from modulos.servicios import listar
+
+    return ("productos", list(listar(inventario)))
+
+
+def _reporte_paralelo(inventario, nombre, opciones):
+    from modulos.paralelo import calcular_reportes_paralelo, PARTICION_CODIGO, PARTICION_CATEGORIA
+
+    if nombre not in REPORTES_PARALELOS:
+        raise ErrorComando(f"El reporte '{nombre}' no se calcula en paralelo. "
+                           f"Opciones: {', '.join(REPORTES_PARALELOS)}")
+    texto = opciones["procesos"]
+    if not (texto.isdigit() and int(texto) > 0):
+        raise ErrorComando("procesos debe ser un número entero mayor a 0.")
+    por = opciones.get("por", PARTICION_CODIGO)
+    if por not in (PARTICION_CODIGO, PARTICION_CATEGORIA):
+        raise ErrorComando(f"por debe ser {PARTICION_CODIGO} o {PARTICION_CATEGORIA}.")
+    stock_minimo = opciones.get("stock_minimo")
+    reportes = calcular_reportes_paralelo(
+        inventario, int(texto), por, int(stock_minimo) if stock_minimo else None)
+    return (nombre, reportes[REPORTES_PARALELOS[nombre]])
+
+
+def _reporte(inventario, posicionales, opciones):
+    from modulos import servicios
+
+    nombre = posicionales[0].lower() if posicionales else ""
+    if "procesos" in opciones:
+        return _reporte_paralelo(inventario, nombre, opciones)
+    if nombre == "categorias":
+        return (nombre, servicios.calcular_reporte_por_categoria(inventario))
+    if nombre == "stock-bajo":
+        stock_minimo = opciones.get("stock_minimo")
+        return (nombre, servicios.calcular_reporte_stock_bajo(
+            inventario, int(stock_minimo) if stock_minimo else None))
+    if nombre == "valor":
+        return (nombre, servicios.calcular_reporte_valor(inventario))
+    if nombre == "unicos":
+        return (nombre, servicios.calcular_reporte_unicos(inventario))
+    raise ErrorComando(f"Reporte no válido. Opciones: {', '.join(REPORTES)}")
+
+
+def _masivo(inventario, posicionales, opciones):
+    from modulos.masivo import actualizar_en_masa, CAMPOS_MASIVOS, TRANSFORMACIONES
+
+    if len(posicionales) != 3:
+        raise ErrorComando("Uso: masivo <precio|stock> <porcentaje|sumar|fijar> <cantidad> [filtros]")
+    campo, operacion, cantidad = posicionales[0].lower(), posicionales[1].lower(), posicionales[2]
+    if campo not in CAMPOS_MASIVOS:
+        raise ErrorComando(f"Campo no válido. Opciones: {', '.join(CAMPOS_MASIVOS)}")
+    if operacion not in TRANSFORMACIONES:
+        raise ErrorComando(f"Operación no válida. Opciones: {', '.join(TRANSFORMACIONES)}")
+
+    filtros = {}
+    for clave in ("categoria", "proveedor"):
+        if opciones.get(clave):
+            filtros[clave] = [valor.strip() for valor in opciones[clave].split(",") if valor.strip()]
+    for clave, convertir in (("precio_minimo", float), ("precio_maximo", float),
+                             ("stock_desde", int), ("stock_menor", int)):
+        if opciones.get(clave):
+            filtros[clave] = convertir(opciones[clave])
+    resultado = actualizar_en_masa(
+        inventario, campo, operacion, float(cantidad),
+        categorias=filtros.pop("categoria", None), proveedores=filtros.pop("proveedor", None),
+        simular=opciones.get("simular", "no").lower() in ("si", "sí", "1", "true"), **filtros)
+    if resultado.errores:
+        codigo, mensaje = resultado.errores[0]
+        raise ErrorComando(f"{len(resultado.errores)} producto(s) quedarían con un valor no válido "
+                           f"([{codigo}] {mensaje}); no se aplicó ningún cambio.")
+    return ("masivo", resultado)
+
+
+# DICCIONARIO: comando -> función (estructura tipo switch)
+COMANDOS = {
+    "agregar": _agregar,
+    "actualizar": _actualizar,
+    "eliminar": _eliminar,
+    "buscar": _buscar,
+    "listar": _listar,
+    "reporte": _reporte,
+    "masivo": _masivo
+}
+
+
+def ejecutar_lote(inventario, lineas, formato="json", salida=None, detener=False):
+    """
+    Ejecuta los comandos de un lote sobre el inventario.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+        lineas (iterable): Líneas con comandos
+        formato (str): Formato por defecto ("json" o "csv")
+        salida (file): Destino de los resultados (por defecto stdout)
+        detener (bool): Detenerse en el primer comando con error
+    Retorna:
+        int: Cantidad de comandos con error
+    """
+    from modulos.eventos import tomar_error
+
+    salida = salida or sys.stdout
+    errores = 0
+    for numero, comando, posicionales, opciones in leer_comandos(lineas):
+        formato_comando = opciones.pop("formato", formato)
+        ruta = opciones.pop("salida", None)
+        try:
+            funcion = COMANDOS.get(comando)
+            if funcion is None:
+                raise ErrorComando(opciones.get("error") or f"Comando '{comando}' no válido.")
+            if formato_comando not in FORMATOS:
+                raise ErrorComando(f"Formato '{formato_comando}' no válido.")
+            nombre, resultado = funcion(inventario, posicionales, opciones)
+            if ruta:
+                with open(ruta, "w", newline="", encoding="utf-8") as archivo:
+                    escribir_resultado(nombre, resultado, formato_comando, archivo)
+            else:
+                escribir_resultado(nombre, resultado, formato_comando, salida)
+            fallo = tomar_error(inventario)
+            if fallo is not None:
+                raise ErrorComando(f"El cambio se aplicó, pero no se pudieron publicar "
+                                   f"{fallo[0]} evento(s) de cambio: {fallo[1]}")
+        except Exception as error:
+            # Cualquier falla de un comando (también errores inesperados
+            # o de escritura) se informa en su línea y se sigue con el
+            # siguiente: el almacén se cierra igual al terminar el lote
+            errores += 1
+            mensaje = str(error) if isinstance(error, (ErrorComando, ValueError)) \
+                else f"{type(error).__name__}: {error}"
+            print(json.dumps({"linea": numero, "comando": comando, "error": mensaje},
+                             ensure_ascii=False), file=sys.stderr)
+            if detener:
+                break
+    return errores
+
+
+def main(argumentos=None):
+    """
+    Punto de entrada del modo por lotes.
+
+    Parámetros:
+        argumentos (list): Argumentos de la línea de comandos
+    Retorna:
+        int: Código de salida (0 si todos los comandos funcionaron)
+    """
+    parser = argparse.ArgumentParser(description="Sistema de Gestión de Productos (modo por lotes)")
+    parser.add_argument("--lotes", required=True, metavar="ARCHIVO",
+                        help="Archivo de comandos ('-' = entrada estándar)")
+    parser.add_argument("--formato", choices=FORMATOS, default="json",
+                        help="Formato por defecto de los resultados")
+    parser.add_argument("--detener", action="store_true",
+                        help="Detenerse en el primer comando con error")
+    parser.add_argument("--sin-almacen", action="store_true",
+                        help="No leer ni guardar el almacén (trabaja con los datos iniciales)")
+    opciones = parser.parse_args(argumentos)
+
+    from modulos.configuracion import cargar_configuracion, obtener_config
+    from modulos.datos import inventario
+
+    try:
+        cargar_configuracion()
+    except (ValueError, OSError) as error:
+        print(f"Error en la configuración: {error}", file=sys.stderr)
+        return 2
+
+    if obtener_config("inventario_columnar"):
+        from modulos.columnar import a_columnar
+        inventario = a_columnar(inventario)
+    if not opciones.sin_almacen:
+        from modulos.almacenamiento import abrir_almacen, cerrar_almacen
+        abrir_almacen(inventario)
+    suscripcion = None
+    if obtener_config("archivo_eventos"):
+        from modulos.eventos import conectar_archivo, desconectar_archivo
+        suscripcion = conectar_archivo(inventario, obtener_config("archivo_eventos"))
+    if obtener_config("metricas") or obtener_config("archivo_metricas"):
+        from modulos.metricas import activar
+        activar()
+    errores = 0
+    try:
+        if opciones.lotes == "-":
+            errores = ejecutar_lote(inventario, sys.stdin, opciones.formato, detener=opciones.detener)
+        else:
+            with open(opciones.lotes, encoding="utf-8") as archivo:
+                errores = ejecutar_lote(inventario, archivo, opciones.formato, detener=opciones.detener)
+    finally:
+        if not opciones.sin_almacen:
+            cerrar_almacen(inventario)
+        if suscripcion is not None:
+            try:
+                desconectar_archivo(inventario, *suscripcion)
+            except (OSError, TypeError, ValueError) as error:
+                print(f"No se pudieron escribir los eventos de cambio: {error}", file=sys.stderr)
+                errores += 1
+        if obtener_config("archivo_metricas"):
+            from modulos.metricas import guardar_metricas
+            guardar_metricas(obtener_config("archivo_metricas"))
+    return 1 if errores else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+"""
+============================================================
+Módulo: masivo.py
+============================================================
+Descripción: Actualización masiva de precio o stock. Se
+eligen los productos con un filtro (categoría, proveedor,
+rango de precio o de stock) resuelto con los índices, y
+se les aplica una transformación: porcentaje ("+7% a
+Electrónica de TechDistributor"), suma o valor fijo.
+
+Todos los valores nuevos se calculan y validan contra
+precio_minimo/precio_maximo (o stock no negativo y no
+menor a lo reservado) antes de tocar el inventario: si
+alguno no es válido no se aplica ninguno. El stock se
+escribe con stock.fijar(), que vuelve a comprobar las
+reservas con la franja del producto tomada. Si una escritura falla a mitad de camino,
+los productos ya modificados vuelven a su valor anterior.
+============================================================
+"""
+
+import math
+from dataclasses import dataclass, field
+
+from modulos.cambios import modificar_campo
+from modulos.indices import consultar_productos
+from modulos.stock import fijar, unidades_reservadas
+from modulos.validaciones import (
+    limites_precio,
+    regla_precio,
+    regla_stock,
+    mensaje_error,
+    ERROR_STOCK_FORMATO
+)
+
+# Campos que admiten actualización masiva
+CAMPOS_MASIVOS = ("precio", "stock")
+
+# DICCIONARIO: Transformaciones (valor actual, cantidad) -> valor nuevo
+TRANSFORMACIONES = {
+    "porcentaje": lambda valor, cantidad: valor * (1 + cantidad / 100),
+    "sumar": lambda valor, cantidad: valor + cantidad,
+    "fijar": lambda valor, cantidad: cantidad
+}
+
+
+@dataclass
+class ResultadoMasivo:
+    """Resultado de una actualización masiva."""
+    campo: str
+    seleccionados: int                           # Productos que cumplen el filtro
+    cambios: list = field(default_factory=list)  # (codigo, anterior, nuevo)
+    errores: list = field(default_factory=list)  # (codigo, mensaje)
+    aplicado: bool = False
+
+    @property
+    def modificados(self):
+        """Cantidad de productos cuyo valor cambia."""
+        return len(self.cambios)
+
+
+def _valor_nuevo(campo, operacion, valor, cantidad):
+    """
+    Calcula y valida el valor nuevo de un producto.
+
+    Parámetros:
+        campo (str): "precio" o "stock"
+        operacion (str): Clave de TRANSFORMACIONES
+        valor (float o int): Valor actual
+        cantidad (float): Cantidad de la transformación
+    Retorna:
+        tuple: (codigo_error o None, valor nuevo)
+    """
+    nuevo = TRANSFORMACIONES[operacion](valor, cantidad)
+    if campo == "precio":
+        precio_min, precio_max = limites_precio()
+        return regla_precio(round(nuevo, 2), precio_min, precio_max)
+    if not math.isfinite(nuevo):
+        return (ERROR_STOCK_FORMATO, None)
+    return regla_stock(round(nuevo))
+
+
+def calcular_cambios(inventario, codigos, campo, operacion, cantidad):
+    """
+    Calcula los valores nuevos de los productos indicados
+    sin modificar el inventario.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+        codigos (iterable): Códigos seleccionados
+        campo (str): "precio" o "stock"
+        operacion (str): "porcentaje", "sumar" o "fijar"
+        cantidad (float): Cantidad de la transformación
+    Retorna:
+        tuple: (cambios [(codigo, anterior, nuevo)], errores [(codigo, mensaje)])
+    """
+    cambios = []
+    errores = []
+    for codigo in codigos:
+        anterior = inventario[codigo][campo]
+        error, nuevo = _valor_nuevo(campo, operacion, anterior, cantidad)
+        reservado = unidades_reservadas(inventario, codigo) if campo == "stock" and not error else 0
+        if error:
+            errores.append((codigo, mensaje_error(error)))
+        elif nuevo < reservado:
+            errores.append((codigo, f"Stock insuficiente: hay {reservado} unidades reservadas."))
+        elif nuevo != anterior:
+            cambios.append((codigo, anterior, nuevo))
+    return (cambios, errores)
+
+
+def aplicar_cambios(inventario, campo, cambios):
+    """
+    Aplica cambios ya validados. Si una modificación lanza
+    una excepción (por ejemplo, el disco del almacén), las
+    ya hechas se revierten y la excepción se propaga. Si una
+    reserva hecha después de validar impide fijar un stock,
+    se revierte todo y se lanza ValueError.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+        campo (str): Campo a modificar
+        cambios (list): Tuplas (codigo, anterior, nuevo)
+    """
+    # Cuenta también el producto en curso: modificar_campo cambia
+    # el valor antes de notificar a las estructuras auxiliares
+    hechos = 0
+    try:
+        for codigo, _, nuevo in cambios:
+            hechos += 1
+            if campo == "stock":
+                es_valido, mensaje = fijar(inventario, codigo, nuevo)
+                if not es_valido:
+                    hechos -= 1     # fijar() lo rechazó sin tocar el producto
+                    raise ValueError(f"[{codigo}] {mensaje} No se aplicó ningún cambio.")
+            else:
+                modificar_campo(inventario, codigo, campo, nuevo)
+    except BaseException:
+        for codigo, anterior, _ in reversed(cambios[:hechos]):
+            modificar_campo(inventario, codigo, campo, anterior)
+        raise
+
+
+def actualizar_en_masa(inventario, campo, operacion, cantidad, categorias=None,
+                       proveedores=None, precio_minimo=None, precio_maximo=None,
+                       stock_desde=None, stock_menor=None, simular=False):
+    """
+    Actualiza el precio o el stock de todos los productos
+    que cumplen el filtro, todo o nada.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+        campo (str): "precio" o "stock"
+        operacion (str): "porcentaje", "sumar" o "fijar"
+        cantidad (float): Porcentaje, cantidad a sumar o valor fijo
+        categorias (str o iterable): Categoría o categorías (opcional)
+        proveedores (str o iterable): Proveedor o proveedores (opcional)
+        precio_minimo (float): Precio mínimo incluido (opcional)
+        precio_maximo (float): Precio máximo incluido (opcional)
+        stock_desde (int): Stock mayor o igual (opcional)
+        stock_menor (int): Stock menor (opcional)
+        simular (bool): Solo calcular los cambios, sin aplicarlos
+    Retorna:
+        ResultadoMasivo: Cambios calculados, errores y si se aplicó
+    """
+    if campo not in CAMPOS_MASIVOS:
+        raise ValueError(f"Campo '{campo}' no admite actualización masiva.")
+    if operacion not in TRANSFORMACIONES:
+        raise ValueError(f"Operación '{operacion}' no válida.")
+    if not math.isfinite(cantidad):
+        raise ValueError("La cantidad debe ser un número finito.")
+
+    codigos = consultar_productos(inventario, categorias, proveedores, stock_menor,
+                                  precio_minimo, precio_maximo, stock_desde)
+    cambios, errores = calcular_cambios(inventario, codigos, campo, operacion, cantidad)
+    resultado = ResultadoMasivo(campo, len(codigos), cambios, errores)
+    if not errores and not simular:
+        aplicar_cambios(inventario, campo, cambios)
+        resultado.aplicado = True
+    return resultado
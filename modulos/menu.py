@@ -26,6 +26,12 @@ def mostrar_menu_principal():
     print("  6️⃣  Reporte por categoría")
     print("  7️⃣  Reporte de stock bajo")
     print("  8️⃣  Reporte de valor del inventario")
+    print("  🔟  Reporte de categorías y proveedores únicos")
+    print("  1️⃣1️⃣ Filtrar por categoría, proveedor y stock")
+    print("  ─" * 30)
+    print("  📥 DATOS")
+    print("  1️⃣2️⃣ Actualización masiva de precio o stock")
+    print("  1️⃣3️⃣ Importar productos desde CSV")
     print("  ─" * 30)
     print("  9️⃣  Salir del sistema")
     print("=" * 60)
\ No newline at end of file
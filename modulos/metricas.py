@@ -0,0 +1,270 @@
+"""
+============================================================
+Módulo: metricas.py
+============================================================
+Descripción: Instrumentación de las operaciones del
+sistema. Las funciones marcadas con @instrumentar
+(CRUD, reportes, validaciones) registran, mientras la
+instrumentación está activa, la cantidad de llamadas y
+de errores, un histograma de latencias y los elementos
+procesados. Desactivada, cada llamada solo consulta una
+variable antes de seguir.
+
+Las métricas se exportan en el formato de texto de
+Prometheus (archivo_metricas en la configuración o la
+ruta GET /metricas del servidor).
+
+perfilar() ejecuta una sola acción bajo cProfile (tiempo
+por función) o tracemalloc (memoria por línea); main.py
+lo usa con la opción indicada en perfilar_opcion.
+============================================================
+"""
+
+import io
+import os
+import threading
+import time
+from bisect import bisect_left
+from functools import wraps
+
+# Límites superiores (segundos) de los tramos del histograma de latencias
+LIMITES_LATENCIA = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+MODOS_PERFIL = ("cprofile", "memoria")
+
+# Estado de la instrumentación
+_activa = False
+_candado = threading.Lock()
+
+# -------------------------------------------------------------
+# DICCIONARIO: Métricas por función
+# Estructura: {nombre: {"llamadas", "errores", "segundos",
+#              "elementos", "histograma": [conteo por tramo]}}
+# -------------------------------------------------------------
+_metricas = {}
+
+
+# -------------------------------------------------------------
+# ACTIVACIÓN
+# -------------------------------------------------------------
+def activar():
+    """Empieza a registrar métricas."""
+    global _activa
+    _activa = True
+
+
+def desactivar():
+    """Deja de registrar métricas (las ya registradas se conservan)."""
+    global _activa
+    _activa = False
+
+
+def activa():
+    """
+    Indica si la instrumentación está activa.
+
+    Retorna:
+        bool: True si se registran métricas
+    """
+    return _activa
+
+
+def reiniciar():
+    """Descarta todas las métricas registradas."""
+    with _candado:
+        _metricas.clear()
+
+
+# -------------------------------------------------------------
+# REGISTRO
+# -------------------------------------------------------------
+def _registrar(nombre, segundos, elementos, error):
+    """
+    Suma una llamada a las métricas de una función.
+
+    Parámetros:
+        nombre (str): Nombre de la función instrumentada
+        segundos (float): Duración de la llamada
+        elementos (int): Elementos procesados
+        error (bool): Si la llamada terminó con una excepción
+    """
+    with _candado:
+        metrica = _metricas.get(nombre)
+        if metrica is None:
+            metrica = _metricas[nombre] = {
+                "llamadas": 0,
+                "errores": 0,
+                "segundos": 0.0,
+                "elementos": 0,
+                "histograma": [0] * (len(LIMITES_LATENCIA) + 1)
+            }
+        metrica["llamadas"] += 1
+        metrica["errores"] += error
+        metrica["segundos"] += segundos
+        metrica["elementos"] += elementos
+        metrica["histograma"][bisect_left(LIMITES_LATENCIA, segundos)] += 1
+
+
+def contar_inventario(resultado, inventario, *argumentos, **opciones):
+    """Elementos procesados por funciones que recorren el inventario."""
+    return len(inventario)
+
+
+def contar_resultado(resultado, *argumentos, **opciones):
+    """Elementos procesados según el largo del resultado."""
+    return len(resultado) if resultado is not None else 0
+
+
+def instrumentar(nombre=None, elementos=None):
+    """
+    Decorador que registra las métricas de una función
+    mientras la instrumentación está activa.
+
+    Parámetros:
+        nombre (str): Nombre en las métricas (por defecto
+            "modulo.funcion")
+        elementos (function): Recibe (resultado, *argumentos)
+            y devuelve la cantidad de elementos procesados
+            (por defecto 1 por llamada)
+    Retorna:
+        function: Decorador
+    """
+    def decorador(funcion):
+        etiqueta = nombre or f"{funcion.__module__.rsplit('.', 1)[-1]}.{funcion.__name__}"
+
+        @wraps(funcion)
+        def envoltura(*argumentos, **opciones):
+            if not _activa:
+                return funcion(*argumentos, **opciones)
+            inicio = time.perf_counter()
+            try:
+                resultado = funcion(*argumentos, **opciones)
+            except BaseException:
+                _registrar(etiqueta, time.perf_counter() - inicio, 0, True)
+                raise
+            segundos = time.perf_counter() - inicio
+            cantidad = elementos(resultado, *argumentos, **opciones) if elementos else 1
+            _registrar(etiqueta, segundos, cantidad, False)
+            return resultado
+        return envoltura
+    return decorador
+
+
+# -------------------------------------------------------------
+# EXPORTACIÓN
+# -------------------------------------------------------------
+def obtener_metricas():
+    """
+    Devuelve una copia de las métricas registradas.
+
+    Retorna:
+        dict: {nombre: {llamadas, errores, segundos, promedio,
+               elementos, histograma}}
+    """
+    with _candado:
+        copia = {nombre: dict(metrica, histograma=list(metrica["histograma"]))
+                 for nombre, metrica in _metricas.items()}
+    for metrica in copia.values():
+        metrica["promedio"] = metrica["segundos"] / metrica["llamadas"]
+    return copia
+
+
+def exportar_texto():
+    """
+    Exporta las métricas en el formato de texto de
+    Prometheus.
+
+    Retorna:
+        str: Métricas listas para escribir o servir
+    """
+    metricas = obtener_metricas()
+    lineas = []
+    for clave, tipo, ayuda in (("llamadas", "counter", "Llamadas por función"),
+                               ("errores", "counter", "Llamadas que terminaron con una excepción"),
+                               ("elementos", "counter", "Elementos procesados")):
+        lineas.append(f"# HELP sgp_{clave}_total {ayuda}")
+        lineas.append(f"# TYPE sgp_{clave}_total {tipo}")
+        for nombre in sorted(metricas):
+            lineas.append(f'sgp_{clave}_total{{funcion="{nombre}"}} {metricas[nombre][clave]}')
+
+    lineas.append("# HELP sgp_latencia_segundos Duración de las llamadas")
+    lineas.append("# TYPE sgp_latencia_segundos histogram")
+    for nombre in sorted(metricas):
+        metrica = metricas[nombre]
+        acumulado = 0
+        for limite, conteo in zip(LIMITES_LATENCIA + ("+Inf",), metrica["histograma"]):
+            acumulado += conteo
+            lineas.append(f'sgp_latencia_segundos_bucket{{funcion="{nombre}",le="{limite}"}} {acumulado}')
+        lineas.append(f'sgp_latencia_segundos_sum{{funcion="{nombre}"}} {metrica["segundos"]:.6f}')
+        lineas.append(f'sgp_latencia_segundos_count{{funcion="{nombre}"}} {metrica["llamadas"]}')
+    return "\n".join(lineas) + "\n"
+
+
+def guardar_metricas(ruta):
+    """
+    Escribe las métricas en un archivo de texto (se
+    reemplaza completo, sin dejar archivos a medias).
+
+    Parámetros:
+        ruta (str): Archivo de destino
+    """
+    temporal = ruta + ".tmp"
+    with open(temporal, "w", encoding="utf-8") as archivo:
+        archivo.write(exportar_texto())
+    os.replace(temporal, ruta)
+
+
+# -------------------------------------------------------------
+# PERFILES DE UNA ACCIÓN
+# -------------------------------------------------------------
+def perfilar(funcion, *argumentos, modo="cprofile", ruta=None, lineas=20, **opciones):
+    """
+    Ejecuta una función una vez bajo un perfilador.
+
+    Parámetros:
+        funcion (function): Acción a perfilar
+        *argumentos: Argumentos de la acción
+        modo (str): "cprofile" (tiempo por función) o
+            "memoria" (tracemalloc, memoria por línea)
+        ruta (str): Archivo donde guardar el perfil completo
+            (.prof de pstats o instantánea de tracemalloc)
+        lineas (int): Filas del resumen
+        **opciones: Argumentos con nombre de la acción
+    Retorna:
+        tuple: (resultado de la acción, resumen en texto)
+    """
+    if modo not in MODOS_PERFIL:
+        raise ValueError(f"Modo de perfil no válido: '{modo}'. Opciones: {', '.join(MODOS_PERFIL)}")
+
+    # Los perfiladores se importan solo al usarlos
+    if modo == "cprofile":
+        import cProfile
+        import pstats
+
+        perfil = cProfile.Profile()
+        resultado = perfil.runcall(funcion, *argumentos, **opciones)
+        if ruta:
+            perfil.dump_stats(ruta)
+        salida = io.StringIO()
+        pstats.Stats(perfil, stream=salida).sort_stats("cumulative").print_stats(lineas)
+        return (resultado, salida.getvalue())
+
+    import tracemalloc
+
+    ya_activo = tracemalloc.is_tracing()
+    if not ya_activo:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    antes = tracemalloc.take_snapshot()
+    try:
+        resultado = funcion(*argumentos, **opciones)
+        despues = tracemalloc.take_snapshot()
+        pico = tracemalloc.get_traced_memory()[1]
+    finally:
+        if not ya_activo:
+            tracemalloc.stop()
+    if ruta:
+        despues.dump(ruta)
+    diferencias = despues.compare_to(antes, "lineno")[:lineas]
+    resumen = f"Pico de memoria: {pico / 1024:,.1f} KiB\n" + "\n".join(str(fila) for fila in diferencias)
+    return (resultado, resumen)
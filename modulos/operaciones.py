@@ -8,71 +8,157 @@ de productos en el inventario.
 ============================================================
 """
 
+import math
+import sys
+
 from modulos.validaciones import (
+    validar_opcion_menu,
     validar_nombre_producto,
     validar_precio,
+    regla_precio,
+    mensaje_error,
     validar_stock,
+    regla_stock,
     validar_categoria,
-    validar_proveedor,
-    validar_codigo_producto
+    validar_proveedor
+)
+from modulos.datos import categorias_validas, proveedores
+from modulos.configuracion import obtener_config
+from modulos.codigos import siguiente_codigo
+from modulos.indices import umbrales_stock, umbral_stock
+from modulos.masivo import actualizar_en_masa, aplicar_cambios
+from modulos.metricas import instrumentar
+from modulos.servicios import (
+    COLUMNAS_ORDEN,
+    pagina_productos,
+    obtener_producto,
+    buscar,
+    filtrar,
+    por_precio,
+    crear_producto,
+    actualizar_campo,
+    eliminar
 )
-from modulos.datos import obtener_config
+
+# Cantidad de productos por página en el listado
+TAM_PAGINA = 50
 
 
 def generar_codigo(inventario):
     """
-    Genera automáticamente el siguiente código de producto
-    basándose en los códigos existentes en el inventario.
+    Genera automáticamente el siguiente código de producto.
+    Usa la marca del mayor código asignado, por lo que no
+    recorre el inventario y no reutiliza códigos eliminados.
 
     Parámetros:
         inventario (dict): Diccionario actual de productos
     Retorna:
         str: Nuevo código de producto (Ej: P008)
     """
-    if not inventario:
-        return "P001"
-    # Extraer números de los códigos existentes
-    numeros = [int(codigo[1:]) for codigo in inventario.keys()]
-    siguiente = max(numeros) + 1
-    return f"P{siguiente:03d}"
+    return siguiente_codigo(inventario)
 
 
-def listar_productos(inventario):
+def _formatear_pagina(pagina, umbrales):
     """
-    Muestra todos los productos del inventario con
-    formato legible usando f-strings.
+    Arma el texto completo de una página del listado para
+    escribirlo de una sola vez.
 
     Parámetros:
-        inventario (dict): Diccionario de productos
+        pagina (PaginaProductos): Página a mostrar
+        umbrales (tuple): Umbrales de stock bajo (ver indices.umbrales_stock)
+    Retorna:
+        str: Texto de la página
     """
-    if not inventario:
-        print("\n  ❌ No hay productos registrados en el sistema.")
-        return
+    lineas = [
+        "\n  📦 LISTA DE PRODUCTOS DEL INVENTARIO",
+        f"\n  {'Código':<8} {'Nombre':<30} {'Precio':>12} {'Stock':>6} {'Categoría':<15}",
+        f"  {'-'*8} {'-'*30} {'-'*12} {'-'*6} {'-'*15}"
+    ]
 
-    print("\n  📦 LISTA DE PRODUCTOS DEL INVENTARIO")
-    print(f"\n  {'Código':<8} {'Nombre':<30} {'Precio':>12} {'Stock':>6} {'Categoría':<15}")
-    print(f"  {'-'*8} {'-'*30} {'-'*12} {'-'*6} {'-'*15}")
-
-    # Recorrer diccionario con items() usando for
-    for codigo, datos in inventario.items():
-        nombre = datos["nombre"]
-        precio = datos["precio"]
-        stock = datos["stock"]
-        categoria = datos["categoria"]
+    # Recorrer los productos de la página usando for
+    for producto in pagina.productos:
+        stock = producto.stock
 
         # Indicador visual de stock bajo usando condicionales
         indicador = ""
-        stock_minimo = obtener_config("stock_minimo")
         if stock == 0:
             indicador = " 🚨"  # Sin stock
-        elif stock < stock_minimo:
+        elif stock < umbral_stock(producto.categoria, umbrales):
             indicador = " ⚠️"   # Stock bajo
 
-        print(f"  {codigo:<8} {nombre:<30} ${precio:>11,.2f} {stock:>5}{indicador} {categoria:<15}")
+        lineas.append(f"  {producto.codigo:<8} {producto.nombre:<30} ${producto.precio:>11,.2f} "
+                      f"{stock:>5}{indicador} {producto.categoria:<15}")
+
+    lineas.append(f"\n  Total de productos: {pagina.total}")
+    if pagina.total_paginas > 1:
+        orden = f" | Orden: {pagina.orden}{' (desc)' if pagina.descendente else ''}" if pagina.orden else ""
+        lineas.append(f"  Página {pagina.numero} de {pagina.total_paginas}{orden}")
+    return "\n".join(lineas) + "\n"
+
+
+@instrumentar()
+def listar_productos(inventario, tam_pagina=TAM_PAGINA):
+    """
+    Muestra los productos del inventario por páginas con
+    formato legible usando f-strings. Cada página se
+    escribe de una sola vez en la terminal.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+        tam_pagina (int): Productos por página
+    """
+    if not inventario:
+        print("\n  ❌ No hay productos registrados en el sistema.")
+        return
+
+    umbrales = umbrales_stock()
+    desplazamiento = 0
+    orden = None
+    descendente = False
 
-    print(f"\n  Total de productos: {len(inventario)}")
+    while True:
+        pagina = pagina_productos(inventario, tam_pagina, desplazamiento, orden, descendente)
+        sys.stdout.write(_formatear_pagina(pagina, umbrales))
+        sys.stdout.flush()
+
+        # Con una sola página el listado termina como siempre
+        if pagina.total_paginas == 1 and orden is None:
+            return
+
+        print("\n  Enter = siguiente | a = anterior | p = ir a página | o = ordenar | x = salir")
+        accion = input("  Opción: ").strip().lower()
+
+        if accion == "":
+            if pagina.numero < pagina.total_paginas:
+                desplazamiento += tam_pagina
+            else:
+                return
+        elif accion == "a":
+            desplazamiento = max(0, desplazamiento - tam_pagina)
+        elif accion == "p":
+            numero = input(f"  Número de página (1-{pagina.total_paginas}): ").strip()
+            if validar_opcion_menu(numero, 1, pagina.total_paginas):
+                desplazamiento = (int(numero) - 1) * tam_pagina
+            else:
+                print("  ⚠️  Página no válida.")
+        elif accion == "o":
+            print(f"  Columnas: {', '.join(COLUMNAS_ORDEN)} (agregue '-' para descendente, Ej: -precio)")
+            columna = input("  Ordenar por: ").strip().lower()
+            descendente = columna.startswith("-")
+            columna = columna.lstrip("-")
+            if columna in COLUMNAS_ORDEN:
+                orden = columna
+                desplazamiento = 0
+            else:
+                print("  ⚠️  Columna no válida.")
+                descendente = pagina.descendente
+        elif accion == "x":
+            return
+        else:
+            print("  ⚠️  Opción no válida.")
 
 
+@instrumentar()
 def agregar_producto(inventario, categorias_validas, proveedores):
     """
     Agrega un nuevo producto al inventario con
@@ -132,29 +218,22 @@ def agregar_producto(inventario, categorias_validas, proveedores):
             break
         print("  ⚠️  Proveedor no válido. Seleccione uno de la lista.")
 
-    # Generar código automático
-    nuevo_codigo = generar_codigo(inventario)
-
-    # Crear el nuevo producto como diccionario
-    nuevo_producto = {
-        "nombre": nombre,
-        "precio": precio,
-        "stock": stock,
-        "categoria": categoria,
-        "proveedor": proveedor
-    }
-
-    # Agregar al inventario
-    inventario[nuevo_codigo] = nuevo_producto
+    # Crear el producto (asigna el código automático)
+    es_valido, resultado = crear_producto(inventario, nombre, precio, stock, categoria, proveedor)
+    if not es_valido:
+        print(f"\n  ❌ {resultado}")
+        return
 
     print(f"\n  ✅ Producto agregado exitosamente!")
-    print(f"  📌 Código asignado: {nuevo_codigo}")
+    print(f"  📌 Código asignado: {resultado.codigo}")
     print(f"  📌 Producto: {nombre} | ${precio:,.2f} | Stock: {stock}")
 
 
+@instrumentar()
 def buscar_producto(inventario):
     """
-    Busca productos por código o por nombre parcial.
+    Busca productos por código, por nombre parcial o por
+    rango de precio.
 
     Parámetros:
         inventario (dict): Diccionario de productos
@@ -162,45 +241,123 @@ def buscar_producto(inventario):
     print("\n  🔍 BUSCAR PRODUCTO")
     print("  1. Buscar por código (Ej: P001)")
     print("  2. Buscar por nombre")
+    print("  3. Buscar por rango de precio")
 
-    opcion = input("\n  Seleccione opción (1/2): ").strip()
+    opcion = input("\n  Seleccione opción (1/2/3): ").strip()
 
     if opcion == "1":
         codigo = input("  Ingrese código del producto: ").strip().upper()
 
-        # Usar get() para evitar errores KeyError
-        producto = inventario.get(codigo)
+        producto = obtener_producto(inventario, codigo)
         if producto:
             print(f"\n  ✅ Producto encontrado:")
             print(f"  📌 Código:    {codigo}")
-            print(f"  📌 Nombre:    {producto['nombre']}")
-            print(f"  📌 Precio:    ${producto['precio']:,.2f}")
-            print(f"  📌 Stock:     {producto['stock']}")
-            print(f"  📌 Categoría: {producto['categoria']}")
-            print(f"  📌 Proveedor: {producto['proveedor']}")
+            print(f"  📌 Nombre:    {producto.nombre}")
+            print(f"  📌 Precio:    ${producto.precio:,.2f}")
+            print(f"  📌 Stock:     {producto.stock}")
+            print(f"  📌 Categoría: {producto.categoria}")
+            print(f"  📌 Proveedor: {producto.proveedor}")
         else:
             print(f"\n  ❌ No se encontró producto con código '{codigo}'.")
 
     elif opcion == "2":
         nombre_buscar = input("  Ingrese nombre a buscar: ").strip().lower()
 
-        # Filtrar productos que contienen el nombre buscado
-        resultados = {
-            codigo: datos for codigo, datos in inventario.items()
-            if nombre_buscar in datos["nombre"].lower()
-        }
+        # Consultar el índice de palabras (ordenado por relevancia);
+        # si no hay coincidencias, tolerar errores de tipeo
+        resultados = buscar(inventario, nombre_buscar)
+        aproximados = not resultados
+        if aproximados:
+            resultados = buscar(inventario, nombre_buscar, aproximada=True)
 
         if resultados:
+            if aproximados:
+                print(f"\n  🔎 Sin coincidencias exactas. Resultados parecidos a '{nombre_buscar}':")
             print(f"\n  ✅ Se encontraron {len(resultados)} resultado(s):")
-            for codigo, datos in resultados.items():
-                print(f"\n  📌 [{codigo}] {datos['nombre']}")
-                print(f"      Precio: ${datos['precio']:,.2f} | Stock: {datos['stock']}")
+            for producto in resultados:
+                print(f"\n  📌 [{producto.codigo}] {producto.nombre}")
+                print(f"      Precio: ${producto.precio:,.2f} | Stock: {producto.stock}")
         else:
             print(f"\n  ❌ No se encontraron productos con '{nombre_buscar}'.")
+
+    elif opcion == "3":
+        limites = []
+        for mensaje in ("  Precio mínimo (vacío = sin límite): ", "  Precio máximo (vacío = sin límite): "):
+            texto = input(mensaje).strip()
+            if not texto:
+                limites.append(None)
+                continue
+            # Los límites de búsqueda no tienen que respetar los de alta
+            error, precio = regla_precio(texto, 0, float("inf"))
+            if error:
+                print(f"\n  ❌ {mensaje_error(error)}")
+                return
+            limites.append(precio)
+
+        # Consultar el índice de precios (ordenado de menor a mayor)
+        resultados = por_precio(inventario, *limites)
+        if resultados:
+            print(f"\n  ✅ Se encontraron {len(resultados)} producto(s):")
+            for producto in resultados:
+                print(f"  📌 [{producto.codigo}] {producto.nombre:<30} ${producto.precio:>12,.2f}")
+        else:
+            print("\n  ❌ No hay productos en ese rango de precio.")
     else:
         print("\n  ⚠️  Opción no válida.")
 
 
+def _leer_valores(mensaje):
+    """
+    Lee una lista de valores separados por coma.
+
+    Parámetros:
+        mensaje (str): Texto a mostrar
+    Retorna:
+        list: Valores ingresados o None si se dejó vacío
+    """
+    valores = [valor.strip() for valor in input(mensaje).split(",") if valor.strip()]
+    return valores or None
+
+
+@instrumentar()
+def filtrar_productos(inventario):
+    """
+    Filtra productos por categorías, proveedores y stock
+    máximo. Los valores de un mismo filtro se unen y los
+    filtros se combinan entre sí.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+    """
+    print("\n  🔎 FILTRAR PRODUCTOS")
+    print("  Deje un filtro vacío para no aplicarlo.")
+    print(f"  Categorías: {', '.join(sorted(categorias_validas))}")
+    categorias = _leer_valores("  Categorías (separadas por coma): ")
+    print(f"  Proveedores: {', '.join(proveedores)}")
+    proveedores_elegidos = _leer_valores("  Proveedores (separados por coma): ")
+
+    stock_menor = None
+    texto_stock = input("  Stock menor a (vacío = sin límite): ").strip()
+    if texto_stock:
+        es_valido, stock_menor = validar_stock(texto_stock)
+        if not es_valido:
+            print(f"\n  ❌ {stock_menor}")
+            return
+
+    resultados = filtrar(inventario, categorias, proveedores_elegidos, stock_menor)
+    if not resultados:
+        print("\n  ❌ Ningún producto cumple los filtros.")
+        return
+
+    print(f"\n  ✅ {len(resultados)} producto(s):")
+    print(f"\n  {'Código':<8} {'Nombre':<25} {'Stock':>6} {'Categoría':<14} {'Proveedor':<15}")
+    print(f"  {'-'*8} {'-'*25} {'-'*6} {'-'*14} {'-'*15}")
+    for producto in resultados:
+        print(f"  {producto.codigo:<8} {producto.nombre:<25} {producto.stock:>6} "
+              f"{producto.categoria:<14} {producto.proveedor:<15}")
+
+
+@instrumentar()
 def actualizar_producto(inventario):
     """
     Actualiza información de un producto existente.
@@ -213,12 +370,12 @@ def actualizar_producto(inventario):
     print("\n  ✏️  ACTUALIZAR PRODUCTO")
     codigo = input("  Ingrese código del producto a actualizar: ").strip().upper()
 
-    producto = inventario.get(codigo)
+    producto = obtener_producto(inventario, codigo)
     if not producto:
         print(f"\n  ❌ No se encontró producto con código '{codigo}'.")
         return
 
-    print(f"\n  Producto actual: {producto['nombre']}")
+    print(f"\n  Producto actual: {producto.nombre}")
     print("  ¿Qué desea actualizar?")
     print("  1. Nombre")
     print("  2. Precio")
@@ -228,56 +385,125 @@ def actualizar_producto(inventario):
 
     opcion = input("\n  Seleccione opción (1-5): ").strip()
 
-    # Estructura condicional múltiple para cada campo
-    if opcion == "1":
-        nuevo_nombre = input("  Ingrese nuevo nombre: ").strip()
-        if validar_nombre_producto(nuevo_nombre):
-            producto["nombre"] = nuevo_nombre
-            print(f"  ✅ Nombre actualizado a: {nuevo_nombre}")
-        else:
-            print("  ⚠️  Nombre no válido.")
-
-    elif opcion == "2":
-        nuevo_precio_str = input("  Ingrese nuevo precio ($): ").strip()
-        es_valido, resultado = validar_precio(nuevo_precio_str)
-        if es_valido:
-            producto["precio"] = resultado
-            print(f"  ✅ Precio actualizado a: ${resultado:,.2f}")
-        else:
-            print(f"  ⚠️  {resultado}")
-
-    elif opcion == "3":
-        nuevo_stock_str = input("  Ingrese nuevo stock: ").strip()
-        es_valido, resultado = validar_stock(nuevo_stock_str)
-        if es_valido:
-            producto["stock"] = resultado
-            print(f"  ✅ Stock actualizado a: {resultado}")
-        else:
-            print(f"  ⚠️  {resultado}")
+    # Estructura tipo switch: opción -> (campo, texto de la pregunta)
+    campos = {
+        "1": ("nombre", "  Ingrese nuevo nombre: "),
+        "2": ("precio", "  Ingrese nuevo precio ($): "),
+        "3": ("stock", "  Ingrese nuevo stock: "),
+        "4": ("categoria", "  Ingrese nueva categoría: "),
+        "5": ("proveedor", "  Ingrese nuevo proveedor: ")
+    }
+    if opcion not in campos:
+        print("  ⚠️  Opción no válida.")
+        return
 
-    elif opcion == "4":
-        from modulos.datos import categorias_validas
+    campo, pregunta = campos[opcion]
+    if campo == "categoria":
         print(f"  Categorías: {', '.join(sorted(categorias_validas))}")
-        nueva_cat = input("  Ingrese nueva categoría: ").strip()
-        if validar_categoria(nueva_cat, categorias_validas):
-            producto["categoria"] = nueva_cat
-            print(f"  ✅ Categoría actualizada a: {nueva_cat}")
-        else:
-            print("  ⚠️  Categoría no válida.")
-
-    elif opcion == "5":
-        from modulos.datos import proveedores
+    elif campo == "proveedor":
         print(f"  Proveedores: {', '.join(proveedores)}")
-        nuevo_prov = input("  Ingrese nuevo proveedor: ").strip()
-        if validar_proveedor(nuevo_prov, proveedores):
-            producto["proveedor"] = nuevo_prov
-            print(f"  ✅ Proveedor actualizado a: {nuevo_prov}")
-        else:
-            print("  ⚠️  Proveedor no válido.")
+
+    nuevo_valor = input(pregunta).strip()
+    es_valido, resultado = actualizar_campo(inventario, codigo, campo, nuevo_valor)
+    if not es_valido:
+        print(f"  ⚠️  {resultado}")
+    elif campo == "nombre":
+        print(f"  ✅ Nombre actualizado a: {resultado}")
+    elif campo == "precio":
+        print(f"  ✅ Precio actualizado a: ${resultado:,.2f}")
+    elif campo == "stock":
+        print(f"  ✅ Stock actualizado a: {resultado}")
+    elif campo == "categoria":
+        print(f"  ✅ Categoría actualizada a: {resultado}")
     else:
+        print(f"  ✅ Proveedor actualizado a: {resultado}")
+
+
+@instrumentar()
+def actualizacion_masiva(inventario):
+    """
+    Cambia el precio o el stock de todos los productos que
+    cumplen un filtro. Muestra los cambios antes de
+    aplicarlos; si algún valor nuevo no es válido no se
+    aplica ninguno.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+    """
+    print("\n  🧮 ACTUALIZACIÓN MASIVA")
+    print("  Deje un filtro vacío para no aplicarlo.")
+    print(f"  Categorías: {', '.join(sorted(categorias_validas))}")
+    categorias = _leer_valores("  Categorías (separadas por coma): ")
+    print(f"  Proveedores: {', '.join(proveedores)}")
+    proveedores_elegidos = _leer_valores("  Proveedores (separados por coma): ")
+
+    # Estructura tipo switch: filtro -> (texto de la pregunta, conversión)
+    preguntas = {
+        "precio_minimo": ("  Precio desde (vacío = sin límite): ",
+                          lambda texto: regla_precio(texto, 0, float("inf"))),
+        "precio_maximo": ("  Precio hasta (vacío = sin límite): ",
+                          lambda texto: regla_precio(texto, 0, float("inf"))),
+        "stock_desde": ("  Stock desde (vacío = sin límite): ", regla_stock),
+        "stock_menor": ("  Stock menor a (vacío = sin límite): ", regla_stock)
+    }
+    filtros = {}
+    for filtro, (pregunta, convertir) in preguntas.items():
+        texto = input(pregunta).strip()
+        if texto:
+            error, filtros[filtro] = convertir(texto)
+            if error:
+                print(f"\n  ❌ {mensaje_error(error)}")
+                return
+
+    campos = {"1": "precio", "2": "stock"}
+    campo = campos.get(input("\n  Campo a cambiar (1 = precio, 2 = stock): ").strip())
+    operaciones = {"1": "porcentaje", "2": "sumar", "3": "fijar"}
+    operacion = operaciones.get(
+        input("  Operación (1 = porcentaje, 2 = sumar/restar, 3 = fijar valor): ").strip())
+    if campo is None or operacion is None:
         print("  ⚠️  Opción no válida.")
+        return
+    try:
+        cantidad = float(input("  Cantidad (Ej: 7 para +7%, -5 para restar 5): ").strip())
+    except ValueError:
+        cantidad = math.nan
+    if not math.isfinite(cantidad):
+        print("\n  ❌ La cantidad debe ser un número.")
+        return
+
+    resultado = actualizar_en_masa(inventario, campo, operacion, cantidad, categorias,
+                                   proveedores_elegidos, simular=True, **filtros)
+    print(f"\n  Productos seleccionados: {resultado.seleccionados}")
+    if resultado.errores:
+        print(f"  ❌ {len(resultado.errores)} producto(s) quedarían con un valor no válido; "
+              "no se aplicó ningún cambio:")
+        for codigo, mensaje in resultado.errores[:10]:
+            print(f"     [{codigo}] {mensaje}")
+        return
+    if not resultado.cambios:
+        print("  ℹ️  Ningún producto cambia de valor.")
+        return
+
+    formato = "${:,.2f}" if campo == "precio" else "{}"
+    for codigo, anterior, nuevo in resultado.cambios[:10]:
+        print(f"  📌 [{codigo}] {formato.format(anterior)} → {formato.format(nuevo)}")
+    if resultado.modificados > 10:
+        print(f"  ... y {resultado.modificados - 10} más")
+
+    confirmacion = input(f"\n  ¿Aplicar {resultado.modificados} cambio(s)? (s/n): ").strip().lower()
+    if confirmacion == "s":
+        try:
+            aplicar_cambios(inventario, campo, resultado.cambios)
+        except ValueError as error:
+            # Una reserva llegó mientras se confirmaba
+            print(f"\n  ❌ {error}")
+            return
+        print(f"\n  ✅ {resultado.modificados} producto(s) actualizados.")
+    else:
+        print("\n  ❌ Operación cancelada.")
 
 
+@instrumentar()
 def eliminar_producto(inventario):
     """
     Elimina un producto del inventario previa confirmación.
@@ -288,18 +514,17 @@ def eliminar_producto(inventario):
     print("\n  🗑️  ELIMINAR PRODUCTO")
     codigo = input("  Ingrese código del producto a eliminar: ").strip().upper()
 
-    producto = inventario.get(codigo)
+    producto = obtener_producto(inventario, codigo)
     if not producto:
         print(f"\n  ❌ No se encontró producto con código '{codigo}'.")
         return
 
     # Confirmación antes de eliminar
-    print(f"\n  ⚠️  Producto a eliminar: {producto['nombre']}")
+    print(f"\n  ⚠️  Producto a eliminar: {producto.nombre}")
     confirmacion = input("  ¿Está seguro? (s/n): ").strip().lower()
 
     if confirmacion == "s":
-        # Usar pop() para eliminar y obtener el valor
-        producto_eliminado = inventario.pop(codigo)
-        print(f"\n  ✅ Producto '{producto_eliminado['nombre']}' eliminado exitosamente.")
+        es_valido, producto_eliminado = eliminar(inventario, codigo)
+        print(f"\n  ✅ Producto '{producto_eliminado.nombre}' eliminado exitosamente.")
     else:
         print("\n  ❌ Operación cancelada.")
\ No newline at end of file
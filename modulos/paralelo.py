@@ -0,0 +1,297 @@
+"""
+============================================================
+Módulo: paralelo.py
+============================================================
+Descripción: Reportes en paralelo para inventarios muy
+grandes. El inventario se reparte en fragmentos (por
+rango de códigos o por categoría), cada proceso calcula
+los totales parciales de su fragmento y el proceso
+principal los combina en los mismos resultados que
+devuelve servicios.py (por categoría, stock bajo y
+valor del inventario).
+============================================================
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from modulos.codigos import clave_codigo
+from modulos.indices import umbrales_stock
+from modulos.columnar import InventarioColumnar
+from modulos.servicios import (
+    Producto,
+    ResumenCategoria,
+    ReporteCategorias,
+    ReporteStockBajo,
+    ReporteValor
+)
+
+# Formas de repartir el inventario entre los procesos
+PARTICION_CODIGO = "codigo"
+PARTICION_CATEGORIA = "categoria"
+
+
+def _columnas(inventario):
+    """
+    Obtiene las columnas que necesitan los reportes. Con un
+    InventarioColumnar se usan sus arreglos (las filas vivas,
+    sin compactar: un reporte no reescribe el almacenamiento).
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+    Retorna:
+        tuple: (codigos, precios, stocks, ids_categoria, categorias)
+        donde categorias es la lista con el texto de cada id
+    """
+    if isinstance(inventario, InventarioColumnar):
+        vivas = inventario.filas_vivas()
+        if isinstance(vivas, range):
+            return (list(inventario), inventario.precios, inventario.stocks,
+                    inventario.ids_categoria, inventario.categorias.textos)
+        return (list(inventario),
+                [inventario.precios[fila] for fila in vivas],
+                [inventario.stocks[fila] for fila in vivas],
+                [inventario.ids_categoria[fila] for fila in vivas],
+                inventario.categorias.textos)
+
+    ids = {}
+    productos = inventario.values()
+    return (
+        list(inventario),
+        [datos["precio"] for datos in productos],
+        [datos["stock"] for datos in productos],
+        [ids.setdefault(datos["categoria"], len(ids)) for datos in productos],
+        list(ids)
+    )
+
+
+def particionar(inventario, fragmentos, por=PARTICION_CODIGO):
+    """
+    Reparte el inventario en fragmentos. Por código, cada
+    fragmento es un tramo contiguo del inventario; por
+    categoría, cada categoría queda completa en un solo
+    fragmento (se equilibran por cantidad de productos).
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+        fragmentos (int): Cantidad de fragmentos deseada
+        por (str): PARTICION_CODIGO o PARTICION_CATEGORIA
+    Retorna:
+        tuple: (lista de fragmentos, categorias) donde cada
+        fragmento es (posiciones, codigos, precios, stocks,
+        ids_categoria)
+    """
+    codigos, precios, stocks, ids_categoria, categorias = _columnas(inventario)
+    cantidad = len(codigos)
+    if not cantidad:
+        return ([], categorias)
+    fragmentos = max(1, min(fragmentos, cantidad))
+
+    if por == PARTICION_CODIGO:
+        tamano = -(-cantidad // fragmentos)
+        return ([
+            (range(inicio, min(inicio + tamano, cantidad)),
+             codigos[inicio:inicio + tamano],
+             precios[inicio:inicio + tamano],
+             stocks[inicio:inicio + tamano],
+             ids_categoria[inicio:inicio + tamano])
+            for inicio in range(0, cantidad, tamano)
+        ], categorias)
+
+    if por != PARTICION_CATEGORIA:
+        raise ValueError(f"Partición no válida: '{por}'")
+
+    # Asignar cada categoría al fragmento con menos productos
+    conteo = [0] * len(categorias)
+    for identificador in ids_categoria:
+        conteo[identificador] += 1
+    cargas = [0] * fragmentos
+    destino = [0] * len(categorias)
+    for identificador in sorted(range(len(categorias)), key=lambda i: -conteo[i]):
+        elegido = cargas.index(min(cargas))
+        destino[identificador] = elegido
+        cargas[elegido] += conteo[identificador]
+
+    posiciones = [[] for _ in range(fragmentos)]
+    for posicion, identificador in enumerate(ids_categoria):
+        posiciones[destino[identificador]].append(posicion)
+    return ([
+        (filas,
+         [codigos[i] for i in filas],
+         [precios[i] for i in filas],
+         [stocks[i] for i in filas],
+         [ids_categoria[i] for i in filas])
+        for filas in posiciones if filas
+    ], categorias)
+
+
+def agregar_fragmento(fragmento, umbrales):
+    """
+    Calcula los totales parciales de un fragmento. Se
+    ejecuta en un proceso aparte.
+
+    Parámetros:
+        fragmento (tuple): Ver particionar()
+        umbrales (list): Umbral de stock bajo de cada id de
+            categoría (el global o el propio de la categoría)
+    Retorna:
+        dict: productos, stock, valor, suma_precios,
+        categorias {id: [productos, stock, valor, codigos]},
+        los candidatos mas_caro, mas_barato y mayor_valor
+        y las listas sin_stock y stock_bajo de (posicion, codigo)
+    """
+    posiciones, codigos, precios, stocks, ids_categoria = fragmento
+    valores = [precio * stock for precio, stock in zip(precios, stocks)]
+
+    categorias = {}
+    sin_stock = []
+    stock_bajo = []
+    for posicion, codigo, stock, valor, identificador in zip(posiciones, codigos, stocks, valores, ids_categoria):
+        totales = categorias.get(identificador)
+        if totales is None:
+            totales = categorias[identificador] = [0, 0, 0.0, []]
+        totales[0] += 1
+        totales[1] += stock
+        totales[2] += valor
+        totales[3].append(codigo)
+        if stock == 0:
+            sin_stock.append((posicion, codigo))
+        elif stock < umbrales[identificador]:
+            stock_bajo.append((posicion, codigo))
+
+    # Extremos: ante empates gana el código de menor número
+    # (clave_codigo), igual que en indices.py y agregados.py
+    precio_max = max(precios)
+    precio_min = min(precios)
+    valor_max = max(valores)
+    mas_caro = min((c for c, p in zip(codigos, precios) if p == precio_max), key=clave_codigo)
+    mas_barato = min((c for c, p in zip(codigos, precios) if p == precio_min), key=clave_codigo)
+    mayor_valor = min((c for c, v in zip(codigos, valores) if v == valor_max), key=clave_codigo)
+    return {
+        "productos": len(codigos),
+        "stock": sum(stocks),
+        "valor": sum(valores),
+        "suma_precios": sum(precios),
+        "categorias": categorias,
+        "mas_caro": (-precio_max, clave_codigo(mas_caro), mas_caro),
+        "mas_barato": (precio_min, clave_codigo(mas_barato), mas_barato),
+        "mayor_valor": (-valor_max, clave_codigo(mayor_valor), mayor_valor),
+        "sin_stock": sin_stock,
+        "stock_bajo": stock_bajo
+    }
+
+
+def _agregar_fragmento(argumentos):
+    """Adaptador de agregar_fragmento() para ProcessPoolExecutor.map()."""
+    return agregar_fragmento(*argumentos)
+
+
+def combinar_parciales(parciales):
+    """
+    Combina los totales parciales de los fragmentos.
+
+    Parámetros:
+        parciales (list): Resultados de agregar_fragmento()
+    Retorna:
+        dict: Totales generales con la misma estructura
+    """
+    total = {
+        "productos": 0,
+        "stock": 0,
+        "valor": 0.0,
+        "suma_precios": 0.0,
+        "categorias": {},
+        "mas_caro": None,
+        "mas_barato": None,
+        "mayor_valor": None,
+        "sin_stock": [],
+        "stock_bajo": []
+    }
+    for parcial in parciales:
+        for clave in ("productos", "stock", "valor", "suma_precios"):
+            total[clave] += parcial[clave]
+        for identificador, (productos, stock, valor, codigos) in parcial["categorias"].items():
+            totales = total["categorias"].get(identificador)
+            if totales is None:
+                totales = total["categorias"][identificador] = [0, 0, 0.0, []]
+            totales[0] += productos
+            totales[1] += stock
+            totales[2] += valor
+            totales[3].extend(codigos)
+        for clave in ("mas_caro", "mas_barato", "mayor_valor"):
+            if total[clave] is None or parcial[clave] < total[clave]:
+                total[clave] = parcial[clave]
+        total["sin_stock"].extend(parcial["sin_stock"])
+        total["stock_bajo"].extend(parcial["stock_bajo"])
+
+    # Volver al orden del inventario (importa al repartir por categoría)
+    total["sin_stock"].sort()
+    total["stock_bajo"].sort()
+    return total
+
+
+def calcular_reportes_paralelo(inventario, procesos=None, por=PARTICION_CODIGO, stock_minimo=None):
+    """
+    Calcula los reportes por categoría, de stock bajo y de
+    valor repartiendo el inventario entre varios procesos.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+        procesos (int): Procesos a usar (por defecto todos
+            los núcleos; 1 = en el proceso actual)
+        por (str): PARTICION_CODIGO o PARTICION_CATEGORIA
+        stock_minimo (int): Umbral único (por defecto los
+            configurados, globales y por categoría)
+    Retorna:
+        dict: {"categorias": ReporteCategorias,
+               "stock_bajo": ReporteStockBajo,
+               "valor": ReporteValor o None si no hay productos}
+    """
+    # Mismos umbrales que servicios.calcular_reporte_stock_bajo()
+    if stock_minimo is None:
+        stock_minimo, por_categoria = umbrales_stock()
+    else:
+        por_categoria = {}
+    procesos = procesos or os.cpu_count() or 1
+    reportes = {
+        "categorias": ReporteCategorias(),
+        "stock_bajo": ReporteStockBajo(stock_minimo, umbrales_categoria=dict(por_categoria)),
+        "valor": None
+    }
+    if not inventario:
+        return reportes
+
+    fragmentos, categorias = particionar(inventario, procesos, por)
+    umbrales = [por_categoria.get(categoria, stock_minimo) for categoria in categorias]
+    argumentos = [(fragmento, umbrales) for fragmento in fragmentos]
+    if procesos == 1:
+        parciales = list(map(_agregar_fragmento, argumentos))
+    else:
+        with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+            parciales = list(ejecutor.map(_agregar_fragmento, argumentos))
+    total = combinar_parciales(parciales)
+
+    def producto(codigo):
+        return Producto.desde_inventario(codigo, inventario[codigo])
+
+    # Las categorías se muestran en el orden en que aparecen en el inventario
+    for identificador in sorted(total["categorias"]):
+        productos, stock, valor, codigos = total["categorias"][identificador]
+        reportes["categorias"].categorias.append(ResumenCategoria(
+            categorias[identificador], productos, stock, valor,
+            [producto(codigo) for codigo in codigos]
+        ))
+
+    reportes["stock_bajo"].sin_stock = [producto(codigo) for _, codigo in total["sin_stock"]]
+    reportes["stock_bajo"].stock_bajo = [producto(codigo) for _, codigo in total["stock_bajo"]]
+
+    reportes["valor"] = ReporteValor(
+        total_productos=total["productos"],
+        stock_total=total["stock"],
+        valor_total=total["valor"],
+        precio_promedio=total["suma_precios"] / total["productos"],
+        mas_caro=producto(total["mas_caro"][2]),
+        mas_barato=producto(total["mas_barato"][2]),
+        mayor_valor=producto(total["mayor_valor"][2])
+    )
+    return reportes
@@ -8,9 +8,17 @@ conjuntos, tuplas y comprensiones.
 ============================================================
 """
 
-from modulos.datos import obtener_config
+from modulos.servicios import (
+    calcular_reporte_por_categoria,
+    calcular_reporte_stock_bajo,
+    calcular_reporte_valor,
+    calcular_reporte_unicos,
+    listar
+)
+from modulos.metricas import instrumentar, contar_inventario
 
 
+@instrumentar(elementos=contar_inventario)
 def reporte_por_categoria(inventario):
     """
     Genera un reporte agrupando productos por categoría.
@@ -24,32 +32,22 @@ def reporte_por_categoria(inventario):
         return
 
     print("\n  📊 REPORTE POR CATEGORÍA")
-
-    # Crear diccionario agrupado por categoría
-    categorias = {}
-    for codigo, datos in inventario.items():
-        cat = datos["categoria"]
-        if cat not in categorias:
-            categorias[cat] = []
-        categorias[cat].append((codigo, datos))
+    reporte = calcular_reporte_por_categoria(inventario)
 
     # Mostrar reporte usando for y condicionales
-    for categoria, productos in categorias.items():
-        total_productos = len(productos)
-        total_stock = sum(p[1]["stock"] for p in productos)
-        valor_total = sum(p[1]["precio"] * p[1]["stock"] for p in productos)
-
-        print(f"\n  📁 {categoria}")
+    for resumen in reporte.categorias:
+        print(f"\n  📁 {resumen.categoria}")
         print(f"  {'─' * 50}")
-        print(f"  Cantidad de productos: {total_productos}")
-        print(f"  Stock total:           {total_stock} unidades")
-        print(f"  Valor total:           ${valor_total:,.2f}")
+        print(f"  Cantidad de productos: {resumen.cantidad}")
+        print(f"  Stock total:           {resumen.stock} unidades")
+        print(f"  Valor total:           ${resumen.valor:,.2f}")
         print(f"  Productos:")
 
-        for codigo, datos in productos:
-            print(f"    • [{codigo}] {datos['nombre']} - Stock: {datos['stock']}")
+        for producto in resumen.productos:
+            print(f"    • [{producto.codigo}] {producto.nombre} - Stock: {producto.stock}")
 
 
+@instrumentar(elementos=contar_inventario)
 def reporte_stock_bajo(inventario):
     """
     Muestra productos con stock por debajo del mínimo
@@ -59,45 +57,40 @@ def reporte_stock_bajo(inventario):
         inventario (dict): Diccionario de productos
     """
     print("\n  ⚠️  REPORTE DE STOCK BAJO")
-    stock_minimo = obtener_config("stock_minimo")
-
-    # Lista de productos sin stock
-    sin_stock = []
-    # Lista de productos con stock bajo
-    stock_bajo = []
-
-    # Clasificar productos usando for y condicionales
-    for codigo, datos in inventario.items():
-        if datos["stock"] == 0:
-            sin_stock.append((codigo, datos))
-        elif datos["stock"] < stock_minimo:
-            stock_bajo.append((codigo, datos))
+    reporte = calcular_reporte_stock_bajo(inventario)
+    stock_minimo = reporte.stock_minimo
 
     # Mostrar productos sin stock
-    if sin_stock:
-        print(f"\n  🚨 PRODUCTOS SIN STOCK ({len(sin_stock)}):")
+    if reporte.sin_stock:
+        print(f"\n  🚨 PRODUCTOS SIN STOCK ({len(reporte.sin_stock)}):")
         print(f"  {'─' * 50}")
-        for codigo, datos in sin_stock:
-            print(f"  ❌ [{codigo}] {datos['nombre']}")
-            print(f"      Categoría: {datos['categoria']} | Proveedor: {datos['proveedor']}")
+        for producto in reporte.sin_stock:
+            print(f"  ❌ [{producto.codigo}] {producto.nombre}")
+            print(f"      Categoría: {producto.categoria} | Proveedor: {producto.proveedor}")
     else:
         print("\n  ✅ Todos los productos tienen stock disponible.")
 
     # Mostrar productos con stock bajo
-    if stock_bajo:
-        print(f"\n  ⚠️  PRODUCTOS CON STOCK BAJO (< {stock_minimo} unidades) ({len(stock_bajo)}):")
+    if reporte.stock_bajo:
+        print(f"\n  ⚠️  PRODUCTOS CON STOCK BAJO (< {stock_minimo} unidades) ({len(reporte.stock_bajo)}):")
         print(f"  {'─' * 50}")
-        for codigo, datos in stock_bajo:
-            print(f"  📦 [{codigo}] {datos['nombre']}")
-            print(f"      Stock actual: {datos['stock']} | Precio: ${datos['precio']:,.2f}")
+        for producto in reporte.stock_bajo:
+            print(f"  📦 [{producto.codigo}] {producto.nombre}")
+            print(f"      Stock actual: {producto.stock} | Precio: ${producto.precio:,.2f}")
     else:
         print(f"\n  ✅ Todos los productos tienen stock >= {stock_minimo} unidades.")
 
+    # Categorías con umbral propio
+    if reporte.umbrales_categoria:
+        umbrales = ", ".join(f"{cat} < {umbral}" for cat, umbral in sorted(reporte.umbrales_categoria.items()))
+        print(f"  ℹ️  Umbrales por categoría: {umbrales}")
+
     # Si no hay problemas de stock
-    if not sin_stock and not stock_bajo:
+    if not reporte.sin_stock and not reporte.stock_bajo:
         print("\n  🎉 El inventario está en excelente estado.")
 
 
+@instrumentar(elementos=contar_inventario)
 def reporte_valor_inventario(inventario):
     """
     Calcula y muestra estadísticas del valor total
@@ -109,41 +102,25 @@ def reporte_valor_inventario(inventario):
     """
     print("\n  💰 REPORTE DE VALOR DEL INVENTARIO")
 
-    if not inventario:
+    reporte = calcular_reporte_valor(inventario)
+    if reporte is None:
         print("\n  ❌ No hay productos en el inventario.")
         return
 
-    # Crear lista de tuplas con (nombre, precio, stock, valor_total)
-    datos_productos = [
-        (datos["nombre"], datos["precio"], datos["stock"],
-         datos["precio"] * datos["stock"])
-        for datos in inventario.values()
-    ]
-
-    # Calcular estadísticas
-    valor_total = sum(producto[3] for producto in datos_productos)
-    precio_promedio = sum(producto[1] for producto in datos_productos) / len(datos_productos)
-    stock_total = sum(producto[2] for producto in datos_productos)
-
-    # Encontrar producto más expensive y más barato
-    producto_mas_caro = max(datos_productos, key=lambda x: x[1])
-    producto_mas_barato = min(datos_productos, key=lambda x: x[1])
-    producto_mayor_valor = max(datos_productos, key=lambda x: x[3])
-
     # Mostrar reporte
     print(f"\n  {'─' * 50}")
     print(f"  📊 Estadísticas Generales:")
     print(f"  {'─' * 50}")
-    print(f"  Total de productos:      {len(inventario)}")
-    print(f"  Stock total:             {stock_total} unidades")
-    print(f"  Valor total inventario:  ${valor_total:,.2f}")
-    print(f"  Precio promedio:         ${precio_promedio:,.2f}")
+    print(f"  Total de productos:      {reporte.total_productos}")
+    print(f"  Stock total:             {reporte.stock_total} unidades")
+    print(f"  Valor total inventario:  ${reporte.valor_total:,.2f}")
+    print(f"  Precio promedio:         ${reporte.precio_promedio:,.2f}")
 
     print(f"\n  📈 Productos Destacados:")
     print(f"  {'─' * 50}")
-    print(f"  💎 Más expensive:   {producto_mas_caro[0]} (${producto_mas_caro[1]:,.2f})")
-    print(f"  💚 Más barato:      {producto_mas_barato[0]} (${producto_mas_barato[1]:,.2f})")
-    print(f"  🏆 Mayor valor:     {producto_mayor_valor[0]} (${producto_mayor_valor[3]:,.2f})")
+    print(f"  💎 Más expensive:   {reporte.mas_caro.nombre} (${reporte.mas_caro.precio:,.2f})")
+    print(f"  💚 Más barato:      {reporte.mas_barato.nombre} (${reporte.mas_barato.precio:,.2f})")
+    print(f"  🏆 Mayor valor:     {reporte.mayor_valor.nombre} (${reporte.mayor_valor.valor:,.2f})")
 
     # Tabla detallada
     print(f"\n  📋 Detalle por producto:")
@@ -151,13 +128,14 @@ def reporte_valor_inventario(inventario):
     print(f"  {'Producto':<30} {'Precio':>10} {'Stock':>6} {'Valor':>12}")
     print(f"  {'-'*30} {'-'*10} {'-'*6} {'-'*12}")
 
-    for nombre, precio, stock, valor in datos_productos:
-        print(f"  {nombre:<30} ${precio:>9,.2f} {stock:>6} ${valor:>11,.2f}")
+    for producto in listar(inventario):
+        print(f"  {producto.nombre:<30} ${producto.precio:>9,.2f} {producto.stock:>6} ${producto.valor:>11,.2f}")
 
     print(f"  {'-'*30} {'-'*10} {'-'*6} {'-'*12}")
-    print(f"  {'TOTAL':<30} {'':>10} {stock_total:>6} ${valor_total:>11,.2f}")
+    print(f"  {'TOTAL':<30} {'':>10} {reporte.stock_total:>6} ${reporte.valor_total:>11,.2f}")
 
 
+@instrumentar(elementos=contar_inventario)
 def reporte_productos_unicos(inventario):
     """
     Muestra categorías y proveedores únicos usando sets.
@@ -167,24 +145,17 @@ def reporte_productos_unicos(inventario):
         inventario (dict): Diccionario de productos
     """
     print("\n  🔍 REPORTE DE DATOS ÚNICOS")
+    reporte = calcular_reporte_unicos(inventario)
 
-    # Crear sets de categorías y proveedores únicos
-    categorias_unicas = set()
-    proveedores_unicos = set()
-
-    for datos in inventario.values():
-        categorias_unicas.add(datos["categoria"])
-        proveedores_unicos.add(datos["proveedor"])
-
-    print(f"\n  📁 Categorías únicas ({len(categorias_unicas)}):")
-    for cat in sorted(categorias_unicas):
+    print(f"\n  📁 Categorías únicas ({len(reporte.categorias)}):")
+    for cat in reporte.categorias:
         print(f"    • {cat}")
 
-    print(f"\n  🏢 Proveedores únicos ({len(proveedores_unicos)}):")
-    for prov in sorted(proveedores_unicos):
+    print(f"\n  🏢 Proveedores únicos ({len(reporte.proveedores)}):")
+    for prov in reporte.proveedores:
         print(f"    • {prov}")
 
     # Demostrar operaciones de conjuntos
     print(f"\n  🔄 Operaciones de conjuntos:")
-    print(f"    • Unión categorías + proveedores: {len(categorias_unicas | proveedores_unicos)} elementos")
-    print(f"    • Intersección: {categorias_unicas & proveedores_unicos or 'Ningún elemento en común'}")
\ No newline at end of file
+    print(f"    • Unión categorías + proveedores: {reporte.union} elementos")
+    print(f"    • Intersección: {reporte.interseccion or 'Ningún elemento en común'}")
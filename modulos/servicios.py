@@ -0,0 +1,618 @@
+"""
+============================================================
+Módulo: servicios.py
+============================================================
+Descripción: Capa de datos sin entrada/salida. Las
+operaciones CRUD, la búsqueda y los reportes devuelven
+resultados estructurados (dataclasses y listas) en vez
+de imprimir o pedir datos con input(). El menú solo
+muestra estos resultados, y la misma lógica se puede
+usar en procesos por lotes o como servicio.
+============================================================
+"""
+
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from itertools import islice
+
+from modulos.validaciones import (
+    validar_nombre_producto,
+    validar_precio,
+    validar_stock,
+    validar_categoria,
+    validar_proveedor
+)
+from modulos.datos import categorias_validas, proveedores
+from modulos.configuracion import obtener_config
+from modulos.cambios import insertar_producto, modificar_campo, quitar_producto, obtener_auxiliar
+from modulos.codigos import siguiente_codigo, clave_codigo
+from modulos.cache_reportes import en_cache
+from modulos.metricas import instrumentar, contar_inventario, contar_resultado
+
+# Los índices, la búsqueda, los totales y el cálculo vectorizado se
+# importan dentro de cada función: el modo por lotes solo carga lo
+# que usa el comando que ejecuta.
+
+
+# -------------------------------------------------------------
+# RESULTADOS ESTRUCTURADOS
+# -------------------------------------------------------------
+@dataclass
+class Producto:
+    """Copia de los datos de un producto junto a su código."""
+    codigo: str
+    nombre: str
+    precio: float
+    stock: int
+    categoria: str
+    proveedor: str
+
+    @property
+    def valor(self):
+        """Valor del producto en inventario (precio * stock)."""
+        return self.precio * self.stock
+
+    @classmethod
+    def desde_inventario(cls, codigo, datos):
+        """
+        Crea el resultado a partir de una entrada del inventario.
+
+        Parámetros:
+            codigo (str): Código del producto
+            datos (dict): Datos del producto
+        Retorna:
+            Producto: Copia de los datos
+        """
+        return cls(codigo, datos["nombre"], datos["precio"], datos["stock"],
+                   datos["categoria"], datos["proveedor"])
+
+
+@dataclass
+class PaginaProductos:
+    """Una página del listado de productos."""
+    productos: list
+    total: int
+    desplazamiento: int
+    tam_pagina: int
+    orden: str = None
+    descendente: bool = False
+    siguiente_cursor: tuple = None
+
+    @property
+    def numero(self):
+        """Número de página (empezando en 1)."""
+        return self.desplazamiento // self.tam_pagina + 1
+
+    @property
+    def total_paginas(self):
+        """Cantidad de páginas del listado."""
+        return max(1, -(-self.total // self.tam_pagina))
+
+
+@dataclass
+class ResumenCategoria:
+    """Totales y productos de una categoría."""
+    categoria: str
+    cantidad: int
+    stock: int
+    valor: float
+    productos: list = field(default_factory=list)
+
+
+@dataclass
+class ReporteCategorias:
+    """Reporte agrupado por categoría."""
+    categorias: list = field(default_factory=list)
+
+
+@dataclass
+class ReporteStockBajo:
+    """Productos agotados y con stock bajo."""
+    stock_minimo: int
+    sin_stock: list = field(default_factory=list)
+    stock_bajo: list = field(default_factory=list)
+    umbrales_categoria: dict = field(default_factory=dict)
+
+
+@dataclass
+class ReporteValor:
+    """Estadísticas del valor del inventario."""
+    total_productos: int
+    stock_total: int
+    valor_total: float
+    precio_promedio: float
+    mas_caro: Producto
+    mas_barato: Producto
+    mayor_valor: Producto
+
+
+@dataclass
+class ReporteUnicos:
+    """Categorías y proveedores distintos presentes en el inventario."""
+    categorias: list
+    proveedores: list
+    union: int
+    interseccion: set
+
+
+# -------------------------------------------------------------
+# LECTURA Y BÚSQUEDA
+# -------------------------------------------------------------
+def obtener_producto(inventario, codigo):
+    """
+    Busca un producto por código.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+        codigo (str): Código del producto
+    Retorna:
+        Producto: El producto o None si no existe
+    """
+    datos = inventario.get(codigo)
+    if datos is None:
+        return None
+    return Producto.desde_inventario(codigo, datos)
+
+
+def listar(inventario):
+    """
+    Generador con todos los productos del inventario.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+    Retorna:
+        generator: Productos en orden de inserción
+    """
+    for codigo, datos in inventario.items():
+        yield Producto.desde_inventario(codigo, datos)
+
+
+# Columnas por las que se puede ordenar el listado
+COLUMNAS_ORDEN = ("codigo", "nombre", "precio", "stock", "categoria", "proveedor")
+
+
+def _clave_orden(columna, codigo, datos):
+    """
+    Calcula la clave de orden de un producto. Los códigos
+    se ordenan por su número (P999 antes que P1000).
+
+    Parámetros:
+        columna (str): Columna de orden
+        codigo (str): Código del producto
+        datos (dict): Datos del producto
+    Retorna:
+        La clave comparable
+    """
+    if columna == "codigo":
+        return clave_codigo(codigo)
+    if columna == "nombre":
+        return datos["nombre"].lower()
+    return datos[columna]
+
+
+def _invalidar_ordenes(ordenes, accion, codigo, anterior, actual):
+    """
+    Descarta los índices de orden afectados por una
+    mutación: altas y bajas invalidan todos; una
+    modificación solo los de las columnas que cambiaron.
+
+    Parámetros:
+        ordenes (dict): {columna: lista ordenada de (clave, codigo)}
+        accion (str): Tipo de mutación (ver cambios.notificar)
+        codigo (str): Código del producto afectado
+        anterior (dict): Producto antes del cambio
+        actual (dict): Producto después del cambio o None
+    """
+    if anterior is None or actual is None or accion != "modificacion":
+        ordenes.clear()
+        return
+    for columna in list(ordenes):
+        if columna != "codigo" and anterior[columna] != actual[columna]:
+            del ordenes[columna]
+
+
+def indice_orden(inventario, columna):
+    """
+    Obtiene la lista de (clave, codigo) ordenada por una
+    columna. Se calcula una vez y se reutiliza hasta que
+    una mutación la invalida.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+        columna (str): Una de COLUMNAS_ORDEN
+    Retorna:
+        list: Tuplas (clave, codigo) en orden ascendente
+    """
+    ordenes = obtener_auxiliar(inventario, "ordenes", lambda _: {}, _invalidar_ordenes)
+    lista = ordenes.get(columna)
+    if lista is None:
+        lista = sorted((_clave_orden(columna, codigo, datos), codigo)
+                       for codigo, datos in inventario.items())
+        ordenes[columna] = lista
+    return lista
+
+
+def pagina_productos(inventario, tam_pagina=50, desplazamiento=0, orden=None,
+                     descendente=False, cursor=None):
+    """
+    Obtiene una página del listado de productos.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+        tam_pagina (int): Productos por página
+        desplazamiento (int): Posición del primer producto
+        orden (str): Columna de orden (None = orden de alta)
+        descendente (bool): Invertir el orden
+        cursor (tuple): siguiente_cursor de la página anterior;
+            continúa después de ese producto aunque el
+            inventario haya cambiado (solo con orden ascendente)
+    Retorna:
+        PaginaProductos: Productos de la página y datos de navegación
+    """
+    total = len(inventario)
+    if orden is None:
+        codigos = list(islice(inventario, desplazamiento, desplazamiento + tam_pagina))
+        siguiente = None
+    else:
+        if orden not in COLUMNAS_ORDEN:
+            raise ValueError(f"No se puede ordenar por '{orden}'.")
+        lista = indice_orden(inventario, orden)
+        if cursor is not None and not descendente:
+            desplazamiento = bisect_right(lista, tuple(cursor))
+        if descendente:
+            fin = total - desplazamiento
+            tramo = lista[max(0, fin - tam_pagina):max(0, fin)][::-1]
+        else:
+            tramo = lista[desplazamiento:desplazamiento + tam_pagina]
+        codigos = [codigo for _, codigo in tramo]
+        siguiente = tramo[-1] if tramo and not descendente else None
+
+    return PaginaProductos(
+        productos=[Producto.desde_inventario(codigo, inventario[codigo]) for codigo in codigos],
+        total=total,
+        desplazamiento=desplazamiento,
+        tam_pagina=tam_pagina,
+        orden=orden,
+        descendente=descendente,
+        siguiente_cursor=siguiente
+    )
+
+
+@instrumentar(elementos=contar_resultado)
+def buscar(inventario, texto, limite=None, aproximada=False):
+    """
+    Busca productos por nombre usando el índice de palabras
+    (sin importar tildes ni mayúsculas).
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+        texto (str): Texto a buscar
+        limite (int): Máximo de resultados
+        aproximada (bool): Tolerar errores de tipeo
+    Retorna:
+        list: Productos ordenados por relevancia
+    """
+    from modulos.busqueda import buscar_por_nombre
+    return [Producto.desde_inventario(codigo, inventario[codigo])
+            for codigo in buscar_por_nombre(inventario, texto, limite, aproximada)]
+
+
+@instrumentar(elementos=contar_resultado)
+def filtrar(inventario, categorias=None, proveedores=None, stock_menor=None):
+    """
+    Obtiene los productos que cumplen los filtros, usando
+    el índice de grupos (ver indices.consultar_productos).
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+        categorias (str o iterable): Categoría o categorías (opcional)
+        proveedores (str o iterable): Proveedor o proveedores (opcional)
+        stock_menor (int): Solo productos con stock menor (opcional)
+    Retorna:
+        list: Productos ordenados por código
+    """
+    from modulos.indices import consultar_productos
+    codigos = consultar_productos(inventario, categorias, proveedores, stock_menor)
+    return [Producto.desde_inventario(codigo, inventario[codigo]) for codigo in codigos]
+
+
+def por_precio(inventario, minimo=None, maximo=None):
+    """
+    Obtiene los productos con precio en un rango usando el
+    índice de precios.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+        minimo (float): Precio mínimo incluido (opcional)
+        maximo (float): Precio máximo incluido (opcional)
+    Retorna:
+        list: Productos ordenados por precio ascendente
+    """
+    from modulos.indices import productos_en_rango
+    return [Producto.desde_inventario(codigo, inventario[codigo])
+            for codigo in productos_en_rango(inventario, minimo, maximo)]
+
+
+def extremos_precio(inventario, k=10, mas_caros=True):
+    """
+    Obtiene los k productos más caros o más baratos.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+        k (int): Cantidad de productos
+        mas_caros (bool): True = más caros, False = más baratos
+    Retorna:
+        list: Productos desde el extremo pedido
+    """
+    from modulos.indices import productos_mas_caros, productos_mas_baratos
+    extremos = productos_mas_caros if mas_caros else productos_mas_baratos
+    return [Producto.desde_inventario(codigo, inventario[codigo])
+            for codigo in extremos(inventario, k)]
+
+
+def percentiles_precio(inventario, percentiles=(25, 50, 75, 90)):
+    """
+    Obtiene el precio de varios percentiles.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+        percentiles (iterable): Percentiles entre 0 y 100
+    Retorna:
+        dict: {percentil: precio} (vacío si no hay productos)
+    """
+    if not inventario:
+        return {}
+    from modulos.indices import percentil_precio
+    return {percentil: percentil_precio(inventario, percentil) for percentil in percentiles}
+
+
+# -------------------------------------------------------------
+# OPERACIONES CRUD
+# -------------------------------------------------------------
+@instrumentar()
+def crear_producto(inventario, nombre, precio, stock, categoria, proveedor):
+    """
+    Valida los datos y agrega un producto con código
+    automático.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+        nombre (str): Nombre del producto
+        precio (str o float): Precio
+        stock (str o int): Cantidad en stock
+        categoria (str): Categoría
+        proveedor (str): Proveedor
+    Retorna:
+        tuple: (es_valido, Producto creado o mensaje_error)
+    """
+    max_productos = obtener_config("max_productos")
+    if len(inventario) >= max_productos:
+        return (False, f"Se ha alcanzado el máximo de {max_productos} productos.")
+
+    nombre = str(nombre).strip()
+    if not validar_nombre_producto(nombre):
+        return (False, "Nombre no válido. Debe tener al menos 3 caracteres.")
+    es_valido, precio = validar_precio(precio)
+    if not es_valido:
+        return (False, precio)
+    es_valido, stock = validar_stock(stock)
+    if not es_valido:
+        return (False, stock)
+    categoria = str(categoria).strip()
+    if not validar_categoria(categoria, categorias_validas):
+        return (False, "Categoría no válida.")
+    proveedor = str(proveedor).strip()
+    if not validar_proveedor(proveedor, proveedores):
+        return (False, "Proveedor no válido.")
+
+    codigo = siguiente_codigo(inventario)
+    producto = {
+        "nombre": nombre,
+        "precio": precio,
+        "stock": stock,
+        "categoria": categoria,
+        "proveedor": proveedor
+    }
+    insertar_producto(inventario, codigo, producto)
+    return (True, Producto.desde_inventario(codigo, producto))
+
+
+def validar_campo(campo, valor):
+    """
+    Valida y convierte el valor de un campo de producto.
+
+    Parámetros:
+        campo (str): nombre, precio, stock, categoria o proveedor
+        valor (str): Valor a validar
+    Retorna:
+        tuple: (es_valido, valor_convertido o mensaje_error)
+    """
+    if campo == "nombre":
+        valor = str(valor).strip()
+        if validar_nombre_producto(valor):
+            return (True, valor)
+        return (False, "Nombre no válido.")
+    if campo == "precio":
+        return validar_precio(valor)
+    if campo == "stock":
+        return validar_stock(valor)
+    if campo == "categoria":
+        valor = str(valor).strip()
+        if validar_categoria(valor, categorias_validas):
+            return (True, valor)
+        return (False, "Categoría no válida.")
+    if campo == "proveedor":
+        valor = str(valor).strip()
+        if validar_proveedor(valor, proveedores):
+            return (True, valor)
+        return (False, "Proveedor no válido.")
+    return (False, f"Campo '{campo}' no válido.")
+
+
+@instrumentar()
+def actualizar_campo(inventario, codigo, campo, valor):
+    """
+    Valida y actualiza un campo de un producto existente.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+        codigo (str): Código del producto
+        campo (str): Campo a modificar
+        valor (str): Nuevo valor
+    Retorna:
+        tuple: (es_valido, valor_convertido o mensaje_error)
+    """
+    if codigo not in inventario:
+        return (False, f"No se encontró producto con código '{codigo}'.")
+    es_valido, resultado = validar_campo(campo, valor)
+    if not es_valido:
+        return (False, resultado)
+    if campo == "stock":
+        # Con stock.py: no puede quedar menos stock que lo reservado
+        from modulos.stock import fijar
+        return fijar(inventario, codigo, resultado)
+    modificar_campo(inventario, codigo, campo, resultado)
+    return (True, resultado)
+
+
+@instrumentar()
+def eliminar(inventario, codigo):
+    """
+    Elimina un producto del inventario.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+        codigo (str): Código del producto
+    Retorna:
+        tuple: (es_valido, Producto eliminado o mensaje_error)
+    """
+    if codigo not in inventario:
+        return (False, f"No se encontró producto con código '{codigo}'.")
+    return (True, Producto.desde_inventario(codigo, quitar_producto(inventario, codigo)))
+
+
+# -------------------------------------------------------------
+# REPORTES
+# -------------------------------------------------------------
+@instrumentar(elementos=contar_inventario)
+@en_cache("categorias")
+def calcular_reporte_por_categoria(inventario):
+    """
+    Calcula el reporte agrupado por categoría a partir de
+    los totales incrementales (guardado en caché hasta la
+    próxima mutación).
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+    Retorna:
+        ReporteCategorias: Un resumen por categoría
+    """
+    from modulos.agregados import obtener_agregados
+    reporte = ReporteCategorias()
+    for categoria, totales in obtener_agregados(inventario)["categorias"].items():
+        reporte.categorias.append(ResumenCategoria(
+            categoria,
+            totales["productos"],
+            totales["stock"],
+            totales["valor"],
+            [Producto.desde_inventario(codigo, inventario[codigo]) for codigo in totales["codigos"]]
+        ))
+    return reporte
+
+
+@instrumentar(elementos=contar_inventario)
+@en_cache("stock-bajo")
+def calcular_reporte_stock_bajo(inventario, stock_minimo=None):
+    """
+    Clasifica los productos sin stock y con stock bajo. Con
+    los umbrales configurados (globales y por categoría) el
+    resultado sale del índice de stock bajo sin recorrer el
+    inventario; con un stock_minimo explícito se recorre.
+    Cada stock_minimo se guarda aparte en la caché.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+        stock_minimo (int): Umbral único (por defecto los configurados)
+    Retorna:
+        ReporteStockBajo: Productos agotados y con stock bajo
+    """
+    if stock_minimo is None:
+        from modulos.indices import umbrales_stock, productos_sin_stock, productos_stock_bajo
+        stock_minimo, por_categoria = umbrales_stock()
+        return ReporteStockBajo(
+            stock_minimo,
+            [Producto.desde_inventario(c, inventario[c]) for c in productos_sin_stock(inventario)],
+            [Producto.desde_inventario(c, inventario[c]) for c in productos_stock_bajo(inventario)],
+            dict(por_categoria)
+        )
+    reporte = ReporteStockBajo(stock_minimo)
+
+    from modulos.vectorizado import conviene_vectorizar, extraer_columnas, clasificar_stock
+    if conviene_vectorizar(inventario):
+        # Clasificar con máscaras de NumPy sobre la columna de stock
+        codigos_sin_stock, codigos_stock_bajo = clasificar_stock(
+            extraer_columnas(inventario), stock_minimo
+        )
+        reporte.sin_stock = [Producto.desde_inventario(c, inventario[c]) for c in codigos_sin_stock]
+        reporte.stock_bajo = [Producto.desde_inventario(c, inventario[c]) for c in codigos_stock_bajo]
+        return reporte
+
+    # Clasificar productos usando for y condicionales
+    for codigo, datos in inventario.items():
+        if datos["stock"] == 0:
+            reporte.sin_stock.append(Producto.desde_inventario(codigo, datos))
+        elif datos["stock"] < stock_minimo:
+            reporte.stock_bajo.append(Producto.desde_inventario(codigo, datos))
+    return reporte
+
+
+@instrumentar(elementos=contar_inventario)
+@en_cache("valor")
+def calcular_reporte_valor(inventario):
+    """
+    Calcula las estadísticas de valor del inventario a
+    partir de los totales incrementales y del índice de
+    precios (guardado en caché hasta la próxima mutación).
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+    Retorna:
+        ReporteValor: Estadísticas o None si no hay productos
+    """
+    if not inventario:
+        return None
+    from modulos.agregados import obtener_agregados, producto_mayor_valor
+    from modulos.indices import productos_mas_caros, productos_mas_baratos
+    agregados = obtener_agregados(inventario)
+    return ReporteValor(
+        total_productos=agregados["productos"],
+        stock_total=agregados["stock"],
+        valor_total=agregados["valor"],
+        precio_promedio=agregados["suma_precios"] / agregados["productos"],
+        mas_caro=obtener_producto(inventario, productos_mas_caros(inventario)[0]),
+        mas_barato=obtener_producto(inventario, productos_mas_baratos(inventario)[0]),
+        mayor_valor=obtener_producto(inventario, producto_mayor_valor(agregados))
+    )
+
+
+@instrumentar(elementos=contar_inventario)
+@en_cache("unicos")
+def calcular_reporte_unicos(inventario):
+    """
+    Obtiene las categorías y proveedores distintos a partir
+    del índice de grupos.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+    Retorna:
+        ReporteUnicos: Conjuntos ordenados y sus operaciones
+    """
+    from modulos.indices import valores_grupo
+    categorias_unicas = valores_grupo(inventario, "categoria")
+    proveedores_unicos = valores_grupo(inventario, "proveedor")
+    return ReporteUnicos(
+        categorias=sorted(categorias_unicas),
+        proveedores=sorted(proveedores_unicos),
+        union=len(categorias_unicas | proveedores_unicos),
+        interseccion=categorias_unicas & proveedores_unicos
+    )
@@ -0,0 +1,685 @@
+"""
+============================================================
+Módulo: servidor.py
+============================================================
+Descripción: Servicio HTTP/JSON con asyncio para que
+muchos clientes (terminales de venta, lectores del
+depósito) consulten y modifiquen el inventario al mismo
+tiempo. Usa las funciones de servicios.py.
+
+Las conexiones se atienden en el bucle de eventos sin
+bloquear. Todo acceso al inventario se hace en un único
+hilo de trabajo (los índices y el diario no admiten
+hilos concurrentes), así el bucle nunca se detiene por
+un reporte o por una escritura en disco. Las secuencias
+leer-modificar-escribir de un mismo producto (ajustes de
+stock, cambios con valor esperado) se protegen con un
+candado por producto. Las reservas y ajustes de stock
+usan stock.py (versiones y comparar-e-intercambiar).
+
+Uso:
+    python -m modulos.servidor --puerto 8080
+============================================================
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, is_dataclass
+from urllib.parse import urlsplit, parse_qsl
+
+from modulos import servicios, stock, metricas
+from modulos.cambios import modificar_campo
+from modulos.eventos import tomar_error
+
+# Tamaño máximo del cuerpo de una solicitud (bytes)
+MAX_CUERPO = 1024 * 1024
+
+# Textos de los códigos de estado usados
+ESTADOS_HTTP = {
+    200: "OK",
+    201: "Created",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    409: "Conflict",
+    413: "Payload Too Large",
+    500: "Internal Server Error"
+}
+
+
+class ErrorHttp(Exception):
+    """Error que se responde al cliente con un código de estado."""
+
+    def __init__(self, estado, mensaje):
+        super().__init__(mensaje)
+        self.estado = estado
+        self.mensaje = mensaje
+
+
+def _a_json(valor):
+    """
+    Convierte a JSON los valores que json no conoce
+    (dataclasses y conjuntos).
+
+    Parámetros:
+        valor: Valor a convertir
+    Retorna:
+        Un valor serializable
+    """
+    if is_dataclass(valor):
+        return asdict(valor)
+    if isinstance(valor, (set, frozenset)):
+        return sorted(valor)
+    raise TypeError(f"No se puede convertir {type(valor).__name__} a JSON")
+
+
+def _entero(parametros, clave, defecto):
+    """
+    Lee un parámetro entero de la URL.
+
+    Parámetros:
+        parametros (dict): Parámetros de la consulta
+        clave (str): Nombre del parámetro
+        defecto (int): Valor si no viene
+    Retorna:
+        int: El valor
+    """
+    try:
+        return int(parametros.get(clave, defecto))
+    except (TypeError, ValueError):
+        raise ErrorHttp(400, f"El parámetro '{clave}' debe ser un número entero.") from None
+
+
+def _largo_cuerpo(valor):
+    """
+    Interpreta el encabezado Content-Length.
+
+    Parámetros:
+        valor (str): Valor del encabezado (None si no vino)
+    Retorna:
+        int: Largo del cuerpo, o None si el valor no es un
+            entero no negativo
+    """
+    if not valor:
+        return 0
+    if not (valor.isascii() and valor.isdigit()):
+        return None
+    return int(valor)
+
+
+def _cantidad(datos):
+    """
+    Lee la cantidad entera del cuerpo de una solicitud.
+
+    Parámetros:
+        datos (dict): Cuerpo JSON
+    Retorna:
+        int: La cantidad
+    """
+    cantidad = datos.get("cantidad")
+    if not isinstance(cantidad, int) or isinstance(cantidad, bool):
+        raise ErrorHttp(400, "La cantidad debe ser un número entero.")
+    return cantidad
+
+
+def _estado_error_stock(mensaje):
+    """
+    Elige el código de estado para un rechazo de stock.py:
+    404 si el producto o la reserva no existen y 409 si la
+    operación choca con el estado actual (stock insuficiente,
+    versión distinta).
+    """
+    if mensaje.startswith(("No se encontró", "No existe")):
+        return 404
+    if mensaje.startswith("La cantidad"):
+        return 400
+    return 409
+
+
+def _aplicar_campos(inventario, codigo, campos, esperado):
+    """
+    Aplica varios campos a un producto (en el hilo de
+    trabajo). Primero valida todos y comprueba los valores
+    esperados; si algo falla no modifica nada.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+        codigo (str): Código del producto
+        campos (dict): {campo: nuevo valor}
+        esperado (dict): {campo: valor actual esperado} o None
+    Retorna:
+        Producto: El producto actualizado
+    """
+    if codigo not in inventario:
+        raise ErrorHttp(404, f"No se encontró producto con código '{codigo}'.")
+    datos = inventario[codigo]
+    for campo, valor in (esperado or {}).items():
+        if datos.get(campo) != valor:
+            raise ErrorHttp(409, f"El campo '{campo}' cambió: valor actual {datos.get(campo)!r}.")
+
+    convertidos = {}
+    for campo, valor in campos.items():
+        es_valido, resultado = servicios.validar_campo(campo, str(valor))
+        if not es_valido:
+            raise ErrorHttp(400, resultado)
+        convertidos[campo] = resultado
+    # El stock va primero y por stock.py: si choca con lo
+    # reservado se rechaza antes de tocar los demás campos
+    if "stock" in convertidos:
+        es_valido, resultado = stock.fijar(inventario, codigo, convertidos.pop("stock"))
+        if not es_valido:
+            raise ErrorHttp(_estado_error_stock(resultado), resultado)
+    for campo, valor in convertidos.items():
+        modificar_campo(inventario, codigo, campo, valor)
+    return servicios.obtener_producto(inventario, codigo)
+
+
+class ServidorInventario:
+    """Servicio HTTP/JSON sobre un inventario."""
+
+    def __init__(self, inventario):
+        self.inventario = inventario
+        # Un solo hilo: las operaciones sobre el inventario nunca se solapan
+        self._ejecutor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="inventario")
+        # {codigo: [candado, cantidad de solicitudes que lo usan]}
+        self._candados = {}
+        # {tarea: escritor} de las conexiones abiertas
+        self._conexiones = {}
+        self._servidor = None
+        self.rutas = {
+            ("GET", "productos"): self._listar,
+            ("POST", "productos"): self._crear,
+            ("GET", "producto"): self._obtener,
+            ("PATCH", "producto"): self._actualizar,
+            ("DELETE", "producto"): self._eliminar,
+            ("GET", "stock"): self._consultar_stock,
+            ("POST", "stock"): self._ajustar_stock,
+            ("POST", "reservas"): self._reservar,
+            ("POST", "confirmar"): self._confirmar_reserva,
+            ("DELETE", "reserva"): self._liberar_reserva,
+            ("GET", "buscar"): self._buscar,
+            ("GET", "filtrar"): self._filtrar,
+            ("GET", "precios"): self._precios,
+            ("GET", "reporte"): self._reporte,
+            ("GET", "metricas"): self._metricas,
+            ("POST", "metricas"): self._activar_metricas
+        }
+
+    # ---------------------------------------------------------
+    # Ciclo de vida
+    # ---------------------------------------------------------
+    async def iniciar(self, host="127.0.0.1", puerto=8080):
+        """
+        Empieza a aceptar conexiones.
+
+        Parámetros:
+            host (str): Dirección de escucha
+            puerto (int): Puerto (0 = uno libre)
+        Retorna:
+            int: El puerto en uso
+        """
+        self._servidor = await asyncio.start_server(self._atender, host, puerto)
+        return self._servidor.sockets[0].getsockname()[1]
+
+    async def detener(self):
+        """Deja de aceptar conexiones, cierra las abiertas y libera el hilo de trabajo."""
+        if self._servidor is not None:
+            self._servidor.close()
+            for escritor in self._conexiones.values():
+                escritor.close()
+            await asyncio.gather(*self._conexiones, return_exceptions=True)
+            await self._servidor.wait_closed()
+            self._servidor = None
+        self._ejecutor.shutdown(wait=True)
+
+    async def _ejecutar(self, funcion, *argumentos):
+        """Ejecuta una función sobre el inventario en el hilo de trabajo."""
+        bucle = asyncio.get_running_loop()
+        return await bucle.run_in_executor(self._ejecutor, funcion, *argumentos)
+
+    @contextlib.asynccontextmanager
+    async def _bloquear(self, codigo):
+        """
+        Candado por producto. Se crea al primer uso y se
+        descarta cuando ninguna solicitud lo necesita.
+
+        Parámetros:
+            codigo (str): Código del producto
+        """
+        entrada = self._candados.get(codigo)
+        if entrada is None:
+            entrada = self._candados[codigo] = [asyncio.Lock(), 0]
+        entrada[1] += 1
+        try:
+            async with entrada[0]:
+                yield
+        finally:
+            entrada[1] -= 1
+            if entrada[1] == 0:
+                del self._candados[codigo]
+
+    # ---------------------------------------------------------
+    # HTTP
+    # ---------------------------------------------------------
+    async def _atender(self, lector, escritor):
+        """
+        Atiende una conexión: lee solicitudes HTTP/1.1 y
+        responde JSON hasta que el cliente cierra.
+
+        Parámetros:
+            lector (asyncio.StreamReader): Entrada de la conexión
+            escritor (asyncio.StreamWriter): Salida de la conexión
+        """
+        tarea = asyncio.current_task()
+        self._conexiones[tarea] = escritor
+        try:
+            while True:
+                linea = await lector.readline()
+                if not linea.strip():
+                    break
+                try:
+                    metodo, destino, version = linea.decode("latin-1").split()
+                except ValueError:
+                    await self._responder(escritor, 400, {"error": "Solicitud mal formada."}, False)
+                    break
+
+                encabezados = {}
+                while True:
+                    encabezado = await lector.readline()
+                    if not encabezado.strip():
+                        break
+                    nombre, _, valor = encabezado.decode("latin-1").partition(":")
+                    encabezados[nombre.strip().lower()] = valor.strip()
+
+                mantener = (version == "HTTP/1.1"
+                            and encabezados.get("connection", "").lower() != "close")
+                largo = _largo_cuerpo(encabezados.get("content-length"))
+                if largo is None:
+                    await self._responder(escritor, 400, {"error": "Content-Length no válido."}, False)
+                    break
+                if largo > MAX_CUERPO:
+                    await self._responder(escritor, 413, {"error": "Cuerpo demasiado grande."}, False)
+                    break
+                cuerpo = await lector.readexactly(largo) if largo else b""
+
+                estado, datos = await self._despachar(metodo, destino, cuerpo)
+                await self._responder(escritor, estado, datos, mantener)
+                if not mantener:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            del self._conexiones[tarea]
+            escritor.close()
+            with contextlib.suppress(ConnectionError):
+                await escritor.wait_closed()
+
+    async def _responder(self, escritor, estado, datos, mantener):
+        """Escribe una respuesta JSON (o texto plano si datos es str)."""
+        if isinstance(datos, str):
+            cuerpo, tipo = datos.encode("utf-8"), "text/plain; version=0.0.4"
+        else:
+            try:
+                cuerpo = json.dumps(datos, default=_a_json, ensure_ascii=False, allow_nan=False)
+            except ValueError as error:
+                # NaN e infinito no son JSON válido: mejor un 500 que una respuesta ilegible
+                estado = 500
+                cuerpo = json.dumps({"error": f"Error interno: {error}"}, ensure_ascii=False)
+            cuerpo = cuerpo.encode("utf-8")
+            tipo = "application/json"
+        encabezado = (
+            f"HTTP/1.1 {estado} {ESTADOS_HTTP[estado]}\r\n"
+            f"Content-Type: {tipo}; charset=utf-8\r\n"
+            f"Content-Length: {len(cuerpo)}\r\n"
+            f"Connection: {'keep-alive' if mantener else 'close'}\r\n\r\n"
+        )
+        escritor.write(encabezado.encode("latin-1") + cuerpo)
+        await escritor.drain()
+
+    async def _despachar(self, metodo, destino, cuerpo):
+        """
+        Elige el manejador de la ruta y convierte los
+        errores en respuestas.
+
+        Parámetros:
+            metodo (str): Método HTTP
+            destino (str): Ruta con parámetros
+            cuerpo (bytes): Cuerpo de la solicitud
+        Retorna:
+            tuple: (estado, datos)
+        """
+        url = urlsplit(destino)
+        partes = [parte for parte in url.path.split("/") if parte]
+        parametros = dict(parse_qsl(url.query))
+
+        # /productos, /productos/<codigo>, /productos/<codigo>/stock,
+        # /productos/<codigo>/reservas, /reservas/<id>,
+        # /reservas/<id>/confirmar, /buscar, /filtrar, /precios,
+        # /precios/<consulta>, /reportes/<nombre>, /metricas
+        if partes == ["productos"]:
+            ruta, argumentos = "productos", ()
+        elif len(partes) == 2 and partes[0] == "productos":
+            ruta, argumentos = "producto", (partes[1].upper(),)
+        elif len(partes) == 3 and partes[0] == "productos" and partes[2] in ("stock", "reservas"):
+            ruta, argumentos = partes[2], (partes[1].upper(),)
+        elif len(partes) == 2 and partes[0] == "reservas" and partes[1].isdigit():
+            ruta, argumentos = "reserva", (int(partes[1]),)
+        elif len(partes) == 3 and partes[0] == "reservas" and partes[1].isdigit() and partes[2] == "confirmar":
+            ruta, argumentos = "confirmar", (int(partes[1]),)
+        elif partes in (["buscar"], ["filtrar"], ["metricas"]):
+            ruta, argumentos = partes[0], ()
+        elif partes[:1] == ["precios"] and len(partes) <= 2:
+            ruta, argumentos = "precios", tuple(partes[1:])
+        elif len(partes) == 2 and partes[0] == "reportes":
+            ruta, argumentos = "reporte", (partes[1],)
+        else:
+            return (404, {"error": "Ruta no encontrada."})
+
+        manejador = self.rutas.get((metodo, ruta))
+        if manejador is None:
+            return (405, {"error": f"Método {metodo} no permitido."})
+
+        try:
+            datos = json.loads(cuerpo) if cuerpo else {}
+            if not isinstance(datos, dict):
+                raise ErrorHttp(400, "El cuerpo debe ser un objeto JSON.")
+            estado, respuesta = await manejador(parametros, datos, *argumentos)
+        except ErrorHttp as error:
+            return (error.estado, {"error": error.mensaje})
+        except json.JSONDecodeError:
+            return (400, {"error": "El cuerpo no es JSON válido."})
+        except Exception as error:  # el servicio sigue atendiendo a los demás clientes
+            return (500, {"error": f"Error interno: {error}"})
+
+        # El cambio ya se aplicó: si un suscriptor falló (p. ej. el
+        # archivo de eventos), se avisa sin ocultar el resultado
+        if metodo != "GET" and isinstance(respuesta, dict):
+            fallo = await self._ejecutar(tomar_error, self.inventario)
+            if fallo is not None:
+                respuesta["advertencia"] = (f"No se pudieron publicar {fallo[0]} "
+                                            f"evento(s) de cambio: {fallo[1]}")
+        return (estado, respuesta)
+
+    # ---------------------------------------------------------
+    # Manejadores
+    # ---------------------------------------------------------
+    async def _listar(self, parametros, datos):
+        """GET /productos?tam_pagina=&desplazamiento=&orden=&descendente="""
+        orden = parametros.get("orden") or None
+        if orden is not None and orden not in servicios.COLUMNAS_ORDEN:
+            raise ErrorHttp(400, f"No se puede ordenar por '{orden}'.")
+        pagina = await self._ejecutar(
+            servicios.pagina_productos, self.inventario,
+            max(1, _entero(parametros, "tam_pagina", 50)),
+            max(0, _entero(parametros, "desplazamiento", 0)),
+            orden,
+            parametros.get("descendente", "").lower() in ("1", "true", "si")
+        )
+        return (200, pagina)
+
+    async def _crear(self, parametros, datos):
+        """POST /productos con nombre, precio, stock, categoria y proveedor"""
+        faltantes = [campo for campo in ("nombre", "precio", "stock", "categoria", "proveedor")
+                     if campo not in datos]
+        if faltantes:
+            raise ErrorHttp(400, f"Faltan campos: {', '.join(faltantes)}.")
+        es_valido, resultado = await self._ejecutar(
+            servicios.crear_producto, self.inventario,
+            datos["nombre"], str(datos["precio"]), str(datos["stock"]),
+            datos["categoria"], datos["proveedor"]
+        )
+        if not es_valido:
+            raise ErrorHttp(400, resultado)
+        return (201, resultado)
+
+    async def _obtener(self, parametros, datos, codigo):
+        """GET /productos/<codigo>"""
+        producto = await self._ejecutar(servicios.obtener_producto, self.inventario, codigo)
+        if producto is None:
+            raise ErrorHttp(404, f"No se encontró producto con código '{codigo}'.")
+        return (200, producto)
+
+    async def _actualizar(self, parametros, datos, codigo):
+        """
+        PATCH /productos/<codigo> con los campos a cambiar.
+        Con "esperado": {campo: valor} el cambio se aplica solo
+        si el producto todavía tiene esos valores (409 si no).
+        """
+        esperado = datos.pop("esperado", None)
+        if not datos:
+            raise ErrorHttp(400, "No se indicaron campos para actualizar.")
+        async with self._bloquear(codigo):
+            producto = await self._ejecutar(_aplicar_campos, self.inventario, codigo, datos, esperado)
+        return (200, producto)
+
+    async def _eliminar(self, parametros, datos, codigo):
+        """DELETE /productos/<codigo>"""
+        async with self._bloquear(codigo):
+            es_valido, resultado = await self._ejecutar(servicios.eliminar, self.inventario, codigo)
+        if not es_valido:
+            raise ErrorHttp(404, resultado)
+        return (200, resultado)
+
+    async def _consultar_stock(self, parametros, datos, codigo):
+        """GET /productos/<codigo>/stock: stock, reservado, disponible y versión"""
+        estado = await self._ejecutar(stock.consultar_stock, self.inventario, codigo)
+        if estado is None:
+            raise ErrorHttp(404, f"No se encontró producto con código '{codigo}'.")
+        return (200, estado)
+
+    async def _ajustar_stock(self, parametros, datos, codigo):
+        """
+        POST /productos/<codigo>/stock con {"cantidad": n}.
+        Suma n al stock (negativo para descontar). Con
+        "version" se aplica solo si el stock no cambió.
+        """
+        cantidad = _cantidad(datos)
+        async with self._bloquear(codigo):
+            es_valido, resultado = await self._ejecutar(
+                stock.ajustar, self.inventario, codigo, cantidad, datos.get("version")
+            )
+        if not es_valido:
+            raise ErrorHttp(_estado_error_stock(resultado), resultado)
+        return (200, await self._ejecutar(stock.consultar_stock, self.inventario, codigo))
+
+    async def _reservar(self, parametros, datos, codigo):
+        """POST /productos/<codigo>/reservas con {"cantidad": n}"""
+        cantidad = _cantidad(datos)
+        async with self._bloquear(codigo):
+            es_valido, resultado = await self._ejecutar(
+                stock.reservar, self.inventario, codigo, cantidad, datos.get("version")
+            )
+        if not es_valido:
+            raise ErrorHttp(_estado_error_stock(resultado), resultado)
+        return (201, {"reserva": resultado, "codigo": codigo, "cantidad": cantidad})
+
+    async def _confirmar_reserva(self, parametros, datos, id_reserva):
+        """POST /reservas/<id>/confirmar: descuenta las unidades reservadas"""
+        es_valido, resultado = await self._ejecutar(stock.confirmar, self.inventario, id_reserva)
+        if not es_valido:
+            raise ErrorHttp(_estado_error_stock(resultado), resultado)
+        return (200, {"reserva": id_reserva, "stock": resultado})
+
+    async def _liberar_reserva(self, parametros, datos, id_reserva):
+        """DELETE /reservas/<id>: cancela la reserva"""
+        es_valido, resultado = await self._ejecutar(stock.liberar, self.inventario, id_reserva)
+        if not es_valido:
+            raise ErrorHttp(_estado_error_stock(resultado), resultado)
+        return (200, {"reserva": id_reserva, "liberadas": resultado})
+
+    async def _buscar(self, parametros, datos):
+        """GET /buscar?q=texto&limite=n&aproximada=1"""
+        texto = parametros.get("q", "").strip()
+        if not texto:
+            raise ErrorHttp(400, "Indique el texto a buscar en 'q'.")
+        limite = _entero(parametros, "limite", 50)
+        aproximada = parametros.get("aproximada", "").lower() in ("1", "si", "sí", "true")
+        return (200, await self._ejecutar(servicios.buscar, self.inventario, texto, limite, aproximada))
+
+    async def _filtrar(self, parametros, datos):
+        """GET /filtrar?categoria=A,B&proveedor=X&stock_menor=n"""
+        filtros = {}
+        for clave in ("categoria", "proveedor"):
+            if clave in parametros:
+                filtros[clave] = [valor.strip() for valor in parametros[clave].split(",") if valor.strip()]
+        stock_menor = _entero(parametros, "stock_menor", 0) if "stock_menor" in parametros else None
+        return (200, await self._ejecutar(
+            servicios.filtrar, self.inventario, filtros.get("categoria"), filtros.get("proveedor"), stock_menor
+        ))
+
+    async def _precios(self, parametros, datos, consulta="rango"):
+        """GET /precios?minimo=&maximo=, /precios/<mas-caros|mas-baratos>?k=, /precios/percentiles?p=50,90"""
+        if consulta == "rango":
+            limites = []
+            for clave in ("minimo", "maximo"):
+                try:
+                    limites.append(float(parametros[clave]) if clave in parametros else None)
+                except ValueError:
+                    raise ErrorHttp(400, f"El parámetro '{clave}' debe ser un número.") from None
+            return (200, await self._ejecutar(servicios.por_precio, self.inventario, *limites))
+        if consulta in ("mas-caros", "mas-baratos"):
+            k = max(0, _entero(parametros, "k", 10))
+            return (200, await self._ejecutar(
+                servicios.extremos_precio, self.inventario, k, consulta == "mas-caros"
+            ))
+        if consulta == "percentiles":
+            try:
+                percentiles = [float(valor) for valor in parametros.get("p", "25,50,75,90").split(",")]
+                if not all(0 <= percentil <= 100 for percentil in percentiles):
+                    raise ValueError
+            except ValueError:
+                raise ErrorHttp(400, "Los percentiles deben ser números entre 0 y 100.") from None
+            return (200, await self._ejecutar(servicios.percentiles_precio, self.inventario, percentiles))
+        raise ErrorHttp(404, f"Consulta de precios '{consulta}' no encontrada.")
+
+    async def _reporte(self, parametros, datos, nombre):
+        """GET /reportes/<categorias|stock-bajo|valor|unicos>"""
+        if nombre == "categorias":
+            reporte = await self._ejecutar(servicios.calcular_reporte_por_categoria, self.inventario)
+        elif nombre == "stock-bajo":
+            # Sin stock_minimo se usan los umbrales configurados; un 0 explícito se respeta
+            stock_minimo = _entero(parametros, "stock_minimo", 0) if "stock_minimo" in parametros else None
+            reporte = await self._ejecutar(servicios.calcular_reporte_stock_bajo, self.inventario, stock_minimo)
+        elif nombre == "valor":
+            reporte = await self._ejecutar(servicios.calcular_reporte_valor, self.inventario)
+            if reporte is None:
+                raise ErrorHttp(404, "No hay productos en el inventario.")
+        elif nombre == "unicos":
+            reporte = await self._ejecutar(servicios.calcular_reporte_unicos, self.inventario)
+        else:
+            raise ErrorHttp(404, f"Reporte '{nombre}' no encontrado.")
+        return (200, reporte)
+
+    async def _metricas(self, parametros, datos):
+        """GET /metricas (formato de texto de Prometheus)"""
+        return (200, metricas.exportar_texto())
+
+    async def _activar_metricas(self, parametros, datos):
+        """POST /metricas {"activas": true|false, "reiniciar": false}"""
+        if not isinstance(datos.get("activas"), bool):
+            raise ErrorHttp(400, "Indique 'activas' (true o false).")
+        if datos.get("reiniciar"):
+            metricas.reiniciar()
+        if datos["activas"]:
+            metricas.activar()
+        else:
+            metricas.desactivar()
+        return (200, {"activas": metricas.activa()})
+
+
+# -------------------------------------------------------------
+# CLIENTE LOCAL (para pruebas y scripts)
+# -------------------------------------------------------------
+async def solicitar(metodo, ruta, datos=None, host="127.0.0.1", puerto=8080):
+    """
+    Envía una solicitud al servicio y devuelve la respuesta.
+
+    Parámetros:
+        metodo (str): GET, POST, PATCH o DELETE
+        ruta (str): Ruta con parámetros (ej. "/productos/P001")
+        datos (dict): Cuerpo JSON (opcional)
+        host (str): Dirección del servicio
+        puerto (int): Puerto del servicio
+    Retorna:
+        tuple: (estado, datos_respuesta) (texto en /metricas)
+    """
+    lector, escritor = await asyncio.open_connection(host, puerto)
+    try:
+        cuerpo = json.dumps(datos).encode("utf-8") if datos is not None else b""
+        escritor.write(
+            f"{metodo} {ruta} HTTP/1.1\r\nHost: {host}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(cuerpo)}\r\n"
+            f"Connection: close\r\n\r\n".encode("latin-1") + cuerpo
+        )
+        await escritor.drain()
+        estado = int((await lector.readline()).split()[1])
+        largo = 0
+        texto = False
+        while True:
+            linea = await lector.readline()
+            if not linea.strip():
+                break
+            nombre, _, valor = linea.decode("latin-1").partition(":")
+            if nombre.strip().lower() == "content-length":
+                largo = int(valor)
+            elif nombre.strip().lower() == "content-type":
+                texto = valor.strip().startswith("text/")
+        cuerpo = await lector.readexactly(largo)
+        return (estado, cuerpo.decode("utf-8") if texto else json.loads(cuerpo))
+    finally:
+        escritor.close()
+        await escritor.wait_closed()
+
+
+async def _servir(host, puerto):
+    """
+    Abre el almacén (y el archivo de eventos, si está
+    configurado), sirve hasta que se interrumpe y lo cierra.
+    """
+    from modulos.configuracion import cargar_configuracion, obtener_config
+    from modulos.almacenamiento import abrir_almacen, cerrar_almacen
+    from modulos.datos import inventario
+
+    cargar_configuracion()
+    if obtener_config("inventario_columnar"):
+        from modulos.columnar import a_columnar
+        inventario = a_columnar(inventario)
+    abrir_almacen(inventario)
+    suscripcion = None
+    if obtener_config("archivo_eventos"):
+        from modulos.eventos import conectar_archivo
+        suscripcion = conectar_archivo(inventario, obtener_config("archivo_eventos"))
+    if obtener_config("metricas") or obtener_config("archivo_metricas"):
+        metricas.activar()
+    servidor = ServidorInventario(inventario)
+    puerto = await servidor.iniciar(host, puerto)
+    print(f"  🌐 Servicio de inventario en http://{host}:{puerto}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await servidor.detener()
+        cerrar_almacen(inventario)
+        if suscripcion is not None:
+            from modulos.eventos import desconectar_archivo
+            try:
+                desconectar_archivo(inventario, *suscripcion)
+            except (OSError, TypeError, ValueError) as error:
+                print(f"  ❌ No se pudieron escribir los eventos de cambio: {error}")
+        if obtener_config("archivo_metricas"):
+            metricas.guardar_metricas(obtener_config("archivo_metricas"))
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Servicio HTTP/JSON del inventario")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=8080)
+    opciones = parser.parse_args(argumentos)
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(_servir(opciones.host, opciones.puerto))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,333 @@
+"""
+============================================================
+Módulo: stock.py
+============================================================
+Descripción: Operaciones de stock seguras entre hilos:
+reservar, confirmar, liberar, ajustar en forma relativa
+y fijar un valor absoluto.
+Cada producto tiene un contador de versión que aumenta
+con cada cambio de su stock o de sus reservas; quien
+indique la versión que leyó obtiene semántica de
+comparar-e-intercambiar (si otro cambió el producto,
+la operación se rechaza y se puede reintentar).
+
+Los productos se reparten en franjas, cada una con su
+candado, para que las ventas de productos distintos no
+se esperen entre sí. Las reservas viven en memoria: no
+se guardan en el almacén y se pierden al reiniciar.
+============================================================
+"""
+
+import itertools
+import threading
+
+from modulos.cambios import obtener_auxiliar, registrar_auxiliar, modificar_campo
+from modulos.validaciones import ERROR_STOCK_MAXIMO, STOCK_MAXIMO, mensaje_error
+
+# Cantidad de franjas (candados) por inventario
+FRANJAS = 64
+
+MENSAJE_VERSION = "El stock del producto cambió. Vuelva a consultarlo."
+
+# Identificadores de reserva (next() es atómico en CPython)
+_ids_reserva = itertools.count(1)
+
+# Evita que dos hilos construyan a la vez el estado de un inventario
+_creacion = threading.Lock()
+
+
+def _actualizar_versiones(estado, accion, codigo, anterior, actual):
+    """
+    Mantiene las versiones ante cualquier mutación del
+    inventario (también las hechas desde el menú).
+
+    Parámetros:
+        estado (dict): Estado de stock del inventario
+        accion (str): Tipo de mutación (ver cambios.notificar)
+        codigo (str): Código del producto afectado
+        anterior (dict): Producto antes del cambio
+        actual (dict): Producto después del cambio o None
+    """
+    if actual is None:
+        estado["versiones"].pop(codigo, None)
+        estado["reservado"].pop(codigo, None)
+    elif anterior is None or anterior["stock"] != actual["stock"]:
+        estado["versiones"][codigo] = estado["versiones"].get(codigo, 0) + 1
+
+
+def preparar_stock(inventario, franjas=FRANJAS):
+    """
+    Crea (o reemplaza) el estado de stock de un inventario.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+        franjas (int): Cantidad de candados; con 1 todas las
+            operaciones se serializan con un candado único
+    Retorna:
+        dict: versiones, reservado, reservas, franjas y aplicar
+    """
+    estado = {
+        "versiones": {},            # {codigo: version}
+        "reservado": {},            # {codigo: unidades reservadas}
+        "reservas": {},             # {id_reserva: (codigo, cantidad)}
+        "franjas": [threading.Lock() for _ in range(max(1, franjas))],
+        # Serializa la escritura en el inventario: los índices
+        # y el diario que reciben la notificación no admiten hilos
+        "aplicar": threading.Lock()
+    }
+    registrar_auxiliar(inventario, "stock", estado, _actualizar_versiones)
+    return estado
+
+
+def _estado(inventario):
+    """
+    Obtiene el estado de stock, creándolo la primera vez.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+    Retorna:
+        dict: Estado de stock
+    """
+    estado = obtener_auxiliar(inventario, "stock")
+    if estado is None:
+        with _creacion:
+            estado = obtener_auxiliar(inventario, "stock")
+            if estado is None:
+                estado = preparar_stock(inventario)
+    return estado
+
+
+def _franja(estado, codigo):
+    """Devuelve el candado de la franja de un producto."""
+    franjas = estado["franjas"]
+    return franjas[hash(codigo) % len(franjas)]
+
+
+def _nueva_version(estado, codigo):
+    """Aumenta la versión de un producto (con su franja tomada)."""
+    estado["versiones"][codigo] = estado["versiones"].get(codigo, 0) + 1
+
+
+def _descontar_reservado(estado, codigo, cantidad):
+    """Resta unidades reservadas de un producto (con su franja tomada)."""
+    reservado = estado["reservado"].get(codigo, 0) - cantidad
+    if reservado > 0:
+        estado["reservado"][codigo] = reservado
+    else:
+        estado["reservado"].pop(codigo, None)
+
+
+def _cambiar_stock(estado, inventario, codigo, stock):
+    """Escribe el stock de un producto (con su franja tomada)."""
+    with estado["aplicar"]:
+        modificar_campo(inventario, codigo, "stock", stock)
+
+
+def unidades_reservadas(inventario, codigo):
+    """
+    Obtiene las unidades reservadas de un producto sin
+    tomar su franja (para validar cambios antes de
+    aplicarlos; fijar() vuelve a comprobarlo con la franja).
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+        codigo (str): Código del producto
+    Retorna:
+        int: Unidades reservadas (0 si no hay reservas)
+    """
+    estado = obtener_auxiliar(inventario, "stock")
+    return 0 if estado is None else estado["reservado"].get(codigo, 0)
+
+
+def consultar_stock(inventario, codigo):
+    """
+    Obtiene el stock, lo reservado, lo disponible y la
+    versión de un producto.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+        codigo (str): Código del producto
+    Retorna:
+        dict: stock, reservado, disponible y version, o None
+        si el producto no existe
+    """
+    estado = _estado(inventario)
+    with _franja(estado, codigo):
+        datos = inventario.get(codigo)
+        if datos is None:
+            return None
+        reservado = estado["reservado"].get(codigo, 0)
+        return {
+            "stock": datos["stock"],
+            "reservado": reservado,
+            "disponible": datos["stock"] - reservado,
+            "version": estado["versiones"].get(codigo, 0)
+        }
+
+
+def reservar(inventario, codigo, cantidad, version=None):
+    """
+    Aparta unidades de un producto sin descontarlas todavía
+    del stock.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+        codigo (str): Código del producto
+        cantidad (int): Unidades a reservar (> 0)
+        version (int): Versión leída; si no coincide se rechaza
+    Retorna:
+        tuple: (es_valido, id_reserva o mensaje_error)
+    """
+    if cantidad <= 0:
+        return (False, "La cantidad debe ser mayor a 0.")
+    estado = _estado(inventario)
+    with _franja(estado, codigo):
+        datos = inventario.get(codigo)
+        if datos is None:
+            return (False, f"No se encontró producto con código '{codigo}'.")
+        if version is not None and version != estado["versiones"].get(codigo, 0):
+            return (False, MENSAJE_VERSION)
+        reservado = estado["reservado"].get(codigo, 0)
+        disponible = datos["stock"] - reservado
+        if disponible < cantidad:
+            return (False, f"Stock insuficiente: hay {disponible} unidades disponibles.")
+        estado["reservado"][codigo] = reservado + cantidad
+        _nueva_version(estado, codigo)
+        id_reserva = next(_ids_reserva)
+        estado["reservas"][id_reserva] = (codigo, cantidad)
+    return (True, id_reserva)
+
+
+def _tomar_reserva(estado, id_reserva):
+    """
+    Quita una reserva con la franja de su producto tomada.
+    Devuelve (codigo, cantidad, candado) o None; el candado
+    queda tomado y debe liberarse.
+    """
+    reserva = estado["reservas"].get(id_reserva)
+    if reserva is None:
+        return None
+    candado = _franja(estado, reserva[0])
+    candado.acquire()
+    # Otro hilo pudo confirmarla o liberarla mientras se esperaba
+    if estado["reservas"].pop(id_reserva, None) is None:
+        candado.release()
+        return None
+    return reserva + (candado,)
+
+
+def confirmar(inventario, id_reserva):
+    """
+    Confirma una reserva: descuenta las unidades del stock.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+        id_reserva (int): Identificador devuelto por reservar()
+    Retorna:
+        tuple: (es_valido, nuevo_stock o mensaje_error)
+    """
+    estado = _estado(inventario)
+    reserva = _tomar_reserva(estado, id_reserva)
+    if reserva is None:
+        return (False, f"No existe la reserva {id_reserva}.")
+    codigo, cantidad, candado = reserva
+    try:
+        datos = inventario.get(codigo)
+        if datos is None:
+            _descontar_reservado(estado, codigo, cantidad)
+            return (False, f"El producto '{codigo}' fue eliminado.")
+        if datos["stock"] < cantidad:
+            # La reserva se conserva: puede confirmarse tras reponer stock
+            estado["reservas"][id_reserva] = (codigo, cantidad)
+            return (False, f"Stock insuficiente: hay {datos['stock']} unidades en stock.")
+        _descontar_reservado(estado, codigo, cantidad)
+        stock = datos["stock"] - cantidad
+        _cambiar_stock(estado, inventario, codigo, stock)
+        return (True, stock)
+    finally:
+        candado.release()
+
+
+def liberar(inventario, id_reserva):
+    """
+    Cancela una reserva y devuelve las unidades a lo
+    disponible.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+        id_reserva (int): Identificador devuelto por reservar()
+    Retorna:
+        tuple: (es_valido, unidades liberadas o mensaje_error)
+    """
+    estado = _estado(inventario)
+    reserva = _tomar_reserva(estado, id_reserva)
+    if reserva is None:
+        return (False, f"No existe la reserva {id_reserva}.")
+    codigo, cantidad, candado = reserva
+    try:
+        _descontar_reservado(estado, codigo, cantidad)
+        if codigo in inventario:
+            _nueva_version(estado, codigo)
+        return (True, cantidad)
+    finally:
+        candado.release()
+
+
+def ajustar(inventario, codigo, cantidad, version=None):
+    """
+    Suma (o resta, si es negativa) una cantidad al stock.
+    Un descuento no puede dejar menos stock que lo reservado.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+        codigo (str): Código del producto
+        cantidad (int): Unidades a sumar o restar
+        version (int): Versión leída; si no coincide se rechaza
+    Retorna:
+        tuple: (es_valido, nuevo_stock o mensaje_error)
+    """
+    estado = _estado(inventario)
+    with _franja(estado, codigo):
+        datos = inventario.get(codigo)
+        if datos is None:
+            return (False, f"No se encontró producto con código '{codigo}'.")
+        if version is not None and version != estado["versiones"].get(codigo, 0):
+            return (False, MENSAJE_VERSION)
+        reservado = estado["reservado"].get(codigo, 0)
+        if cantidad < 0 and datos["stock"] + cantidad < reservado:
+            return (False, f"Stock insuficiente: hay {datos['stock'] - reservado} unidades disponibles.")
+        stock = datos["stock"] + cantidad
+        if stock > STOCK_MAXIMO:
+            return (False, mensaje_error(ERROR_STOCK_MAXIMO))
+        if cantidad:
+            _cambiar_stock(estado, inventario, codigo, stock)
+        return (True, stock)
+
+
+def fijar(inventario, codigo, stock, version=None):
+    """
+    Reemplaza el stock de un producto por un valor absoluto
+    (actualización desde el menú, PATCH o masiva). No puede quedar
+    menos stock que lo reservado.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+        codigo (str): Código del producto
+        stock (int): Nuevo stock
+        version (int): Versión leída; si no coincide se rechaza
+    Retorna:
+        tuple: (es_valido, nuevo_stock o mensaje_error)
+    """
+    estado = _estado(inventario)
+    with _franja(estado, codigo):
+        datos = inventario.get(codigo)
+        if datos is None:
+            return (False, f"No se encontró producto con código '{codigo}'.")
+        if version is not None and version != estado["versiones"].get(codigo, 0):
+            return (False, MENSAJE_VERSION)
+        reservado = estado["reservado"].get(codigo, 0)
+        if stock < reservado:
+            return (False, f"Stock insuficiente: hay {reservado} unidades reservadas.")
+        if stock != datos["stock"]:
+            _cambiar_stock(estado, inventario, codigo, stock)
+        return (True, stock)
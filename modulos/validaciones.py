@@ -5,12 +5,86 @@ Módulo: validaciones.py
 Descripción: Funciones de validación para entradas del
 usuario. Garantiza la integridad de datos antes
 de procesarlos en el sistema.
+Incluye un validador por lotes (columnas de valores) que
+aplica las mismas reglas para las cargas masivas.
 ============================================================
 """
 
-from modulos.datos import obtener_config
+import math
 
+from modulos.configuracion import obtener_config, al_cambiar_config
+from modulos.metricas import instrumentar
 
+# -------------------------------------------------------------
+# Códigos de error de las reglas
+# -------------------------------------------------------------
+ERROR_CODIGO = "codigo"
+ERROR_NOMBRE = "nombre"
+ERROR_PRECIO_FORMATO = "precio_formato"
+ERROR_PRECIO_NO_POSITIVO = "precio_no_positivo"
+ERROR_PRECIO_MINIMO = "precio_minimo"
+ERROR_PRECIO_MAXIMO = "precio_maximo"
+ERROR_STOCK_FORMATO = "stock_formato"
+ERROR_STOCK_NEGATIVO = "stock_negativo"
+ERROR_STOCK_MAXIMO = "stock_maximo"
+ERROR_CATEGORIA = "categoria"
+ERROR_PROVEEDOR = "proveedor"
+
+# DICCIONARIO: Mensaje para cada código de error
+MENSAJES_ERROR = {
+    ERROR_CODIGO: "Código '{valor}' no válido.",
+    ERROR_NOMBRE: "Nombre '{valor}' no válido.",
+    ERROR_PRECIO_FORMATO: "El precio debe ser un número válido.",
+    ERROR_PRECIO_NO_POSITIVO: "El precio debe ser mayor a 0.",
+    ERROR_PRECIO_MINIMO: "El precio mínimo permitido es ${precio_minimo:.2f}",
+    ERROR_PRECIO_MAXIMO: "El precio máximo permitido es ${precio_maximo:.2f}",
+    ERROR_STOCK_FORMATO: "El stock debe ser un número entero.",
+    ERROR_STOCK_NEGATIVO: "El stock no puede ser negativo.",
+    ERROR_STOCK_MAXIMO: "El stock máximo permitido es {stock_maximo}.",
+    ERROR_CATEGORIA: "Categoría '{valor}' no válida.",
+    ERROR_PROVEEDOR: "Proveedor '{valor}' no válido."
+}
+
+# Mayor stock posible: las instantáneas (binario.py, columnar.py)
+# lo guardan como entero de 64 bits con signo
+STOCK_MAXIMO = 2 ** 63 - 1
+
+# Columnas que recibe validar_columnas()
+COLUMNAS_LOTE = ("codigo", "nombre", "precio", "stock", "categoria", "proveedor")
+
+# Filas por tramo cuando la validación se reparte en procesos
+TAM_TRAMO = 50000
+
+# Límites de precio (mínimo, máximo) leídos de la configuración.
+# Se recalculan solo cuando cambia alguno de los dos valores.
+_limites_precio = None
+
+
+@al_cambiar_config
+def _invalidar_limites(clave, anterior, nuevo):
+    """
+    Descarta los límites de precio guardados cuando cambia
+    precio_minimo o precio_maximo.
+    """
+    global _limites_precio
+    if clave in ("precio_minimo", "precio_maximo"):
+        _limites_precio = None
+
+
+def limites_precio():
+    """
+    Devuelve los límites de precio de la configuración.
+
+    Retorna:
+        tuple: (precio_minimo, precio_maximo)
+    """
+    global _limites_precio
+    if _limites_precio is None:
+        _limites_precio = (obtener_config("precio_minimo"), obtener_config("precio_maximo"))
+    return _limites_precio
+
+
+@instrumentar()
 def validar_opcion_menu(opcion, min_val, max_val):
     """
     Valida que la opción del menú sea un número entero
@@ -30,6 +104,7 @@ def validar_opcion_menu(opcion, min_val, max_val):
         return False
 
 
+@instrumentar()
 def validar_nombre_producto(nombre):
     """
     Valida que el nombre del producto sea una cadena
@@ -48,6 +123,7 @@ def validar_nombre_producto(nombre):
     return True
 
 
+@instrumentar()
 def validar_precio(precio_str):
     """
     Valida que el precio sea un número positivo dentro
@@ -58,22 +134,42 @@ def validar_precio(precio_str):
     Retorna:
         tuple: (es_valido, precio_float o mensaje_error)
     """
-    precio_min = obtener_config("precio_minimo")
-    precio_max = obtener_config("precio_maximo")
+    precio_min, precio_max = limites_precio()
+    error, precio = regla_precio(precio_str, precio_min, precio_max)
+    if error:
+        return (False, mensaje_error(error))
+    return (True, precio)
+
+
+def regla_precio(precio_str, precio_min, precio_max):
+    """
+    Regla de precio compartida por validar_precio() y el
+    validador por lotes.
 
+    Parámetros:
+        precio_str (str): Precio en texto
+        precio_min (float): Precio mínimo permitido
+        precio_max (float): Precio máximo permitido
+    Retorna:
+        tuple: (codigo_error o None, precio_float o None)
+    """
     try:
         precio = float(precio_str)
-        if precio <= 0:
-            return (False, "El precio debe ser mayor a 0.")
-        if precio < precio_min:
-            return (False, f"El precio mínimo permitido es ${precio_min:.2f}")
-        if precio > precio_max:
-            return (False, f"El precio máximo permitido es ${precio_max:.2f}")
-        return (True, precio)
-    except ValueError:
-        return (False, "El precio debe ser un número válido.")
+    except (TypeError, ValueError, OverflowError):
+        return (ERROR_PRECIO_FORMATO, None)
+    # NaN no cumple ninguna comparación: se rechaza aparte
+    if not math.isfinite(precio):
+        return (ERROR_PRECIO_FORMATO, None)
+    if precio <= 0:
+        return (ERROR_PRECIO_NO_POSITIVO, None)
+    if precio < precio_min:
+        return (ERROR_PRECIO_MINIMO, None)
+    if precio > precio_max:
+        return (ERROR_PRECIO_MAXIMO, None)
+    return (None, precio)
 
 
+@instrumentar()
 def validar_stock(stock_str):
     """
     Valida que el stock sea un número entero no negativo.
@@ -83,15 +179,37 @@ def validar_stock(stock_str):
     Retorna:
         tuple: (es_valido, stock_int o mensaje_error)
     """
+    error, stock = regla_stock(stock_str)
+    if error:
+        return (False, mensaje_error(error))
+    return (True, stock)
+
+
+def regla_stock(stock_str):
+    """
+    Regla de stock compartida por validar_stock() y el
+    validador por lotes. Acepta texto o números; un número
+    con decimales (5.7) se rechaza en lugar de truncarse.
+
+    Parámetros:
+        stock_str (str): Stock en texto
+    Retorna:
+        tuple: (codigo_error o None, stock_int o None)
+    """
     try:
         stock = int(stock_str)
-        if stock < 0:
-            return (False, "El stock no puede ser negativo.")
-        return (True, stock)
-    except ValueError:
-        return (False, "El stock debe ser un número entero.")
+    except (TypeError, ValueError, OverflowError):
+        return (ERROR_STOCK_FORMATO, None)
+    if not isinstance(stock_str, str) and stock != stock_str:
+        return (ERROR_STOCK_FORMATO, None)
+    if stock < 0:
+        return (ERROR_STOCK_NEGATIVO, None)
+    if stock > STOCK_MAXIMO:
+        return (ERROR_STOCK_MAXIMO, None)
+    return (None, stock)
 
 
+@instrumentar()
 def validar_categoria(categoria, categorias_validas):
     """
     Valida que la categoría ingresada pertenezca al
@@ -106,6 +224,7 @@ def validar_categoria(categoria, categorias_validas):
     return categoria.strip() in categorias_validas
 
 
+@instrumentar()
 def validar_proveedor(proveedor, proveedores):
     """
     Valida que el proveedor ingresado esté en la tupla
@@ -120,20 +239,190 @@ def validar_proveedor(proveedor, proveedores):
     return proveedor.strip() in proveedores
 
 
+@instrumentar()
 def validar_codigo_producto(codigo):
     """
     Valida el formato del código de producto.
-    Debe ser formato 'P' seguido de 3 dígitos (Ej: P001).
+    Debe ser formato 'P' seguido de al menos 3 dígitos
+    (Ej: P001, P1250).
 
     Parámetros:
         codigo (str): Código a validar
     Retorna:
         bool: True si el formato es correcto
     """
-    if len(codigo) != 4:
+    if len(codigo) < 4:
         return False
     if codigo[0] != 'P':
         return False
     if not codigo[1:].isdigit():
         return False
-    return True
\ No newline at end of file
+    return True
+
+
+def mensaje_error(error, valor=None):
+    """
+    Arma el mensaje de un código de error.
+
+    Parámetros:
+        error (str): Código de error (ERROR_*)
+        valor (str): Valor rechazado (para código, nombre,
+            categoría y proveedor)
+    Retorna:
+        str: Mensaje para el usuario
+    """
+    precio_min, precio_max = limites_precio()
+    return MENSAJES_ERROR[error].format(valor=valor, precio_minimo=precio_min, precio_maximo=precio_max,
+                                        stock_maximo=STOCK_MAXIMO)
+
+
+# =============================================================
+# VALIDACIÓN POR LOTES
+# =============================================================
+
+def _convertir_columna(textos, convertir, regla, fuera_de_rango):
+    """
+    Convierte una columna numérica completa. Primero intenta
+    convertir todos los textos de una vez y solo los valores
+    sospechosos (los que fallan o quedan fuera de rango) se
+    pasan por la regla completa, que decide el error.
+
+    Parámetros:
+        textos (list): Valores en texto
+        convertir (type): float o int
+        regla (function): Recibe un texto y devuelve
+            (codigo_error o None, valor o None)
+        fuera_de_rango (function): Recibe la lista de números
+            y devuelve las posiciones a revisar
+    Retorna:
+        tuple: (errores, valores) de la columna
+    """
+    try:
+        valores = list(map(convertir, textos))
+        sospechosos = fuera_de_rango(valores)
+    except (TypeError, ValueError, OverflowError):
+        valores = [None] * len(textos)
+        sospechosos = range(len(textos))
+
+    errores = [None] * len(textos)
+    for i in sospechosos:
+        errores[i], valores[i] = regla(textos[i])
+    return (errores, valores)
+
+
+def _validar_tramo(tramo):
+    """
+    Valida un tramo de columnas. Cada regla recorre una
+    columna completa; las reglas se aplican de la última a
+    la primera para que quede el primer error de cada fila,
+    igual que al validar campo por campo. Las pasadas
+    rápidas solo marcan candidatos: el error lo decide
+    siempre la misma función que usa el menú.
+
+    Parámetros:
+        tramo (tuple): (columnas, precio_min, precio_max,
+            categorias_validas, proveedores)
+    Retorna:
+        tuple: (mascara, errores, valores) del tramo
+    """
+    columnas, precio_min, precio_max, categorias_validas, proveedores = tramo
+    codigos = [c.strip().upper() for c in columnas["codigo"]]
+    nombres = [n.strip() for n in columnas["nombre"]]
+    categorias = [c.strip() for c in columnas["categoria"]]
+    proveedores_fila = [p.strip() for p in columnas["proveedor"]]
+    errores_precio, precios = _convertir_columna(
+        columnas["precio"], float,
+        lambda texto: regla_precio(texto, precio_min, precio_max),
+        lambda valores: [i for i, p in enumerate(valores) if not (0 < p and precio_min <= p <= precio_max)]
+    )
+    errores_stock, stocks = _convertir_columna(
+        columnas["stock"], int, regla_stock,
+        lambda valores: [i for i, s in enumerate(valores) if not 0 <= s <= STOCK_MAXIMO]
+    )
+
+    errores = [None] * len(codigos)
+    for i, proveedor in enumerate(proveedores_fila):
+        if proveedor not in proveedores:
+            errores[i] = ERROR_PROVEEDOR
+    for i, categoria in enumerate(categorias):
+        if categoria not in categorias_validas:
+            errores[i] = ERROR_CATEGORIA
+    for errores_columna in (errores_stock, errores_precio):
+        for i, error in enumerate(errores_columna):
+            if error:
+                errores[i] = error
+    for i, nombre in enumerate(nombres):
+        if (len(nombre) < 3 or nombre.isdigit()) and not validar_nombre_producto(nombre):
+            errores[i] = ERROR_NOMBRE
+    for i, codigo in enumerate(codigos):
+        if codigo and not (codigo[:1] == "P" and codigo[1:].isdigit() and len(codigo) >= 4) \
+                and not validar_codigo_producto(codigo):
+            errores[i] = ERROR_CODIGO
+
+    mascara = [error is None for error in errores]
+    valores = {
+        "codigo": codigos,
+        "nombre": nombres,
+        "precio": precios,
+        "stock": stocks,
+        "categoria": categorias,
+        "proveedor": proveedores_fila
+    }
+    return (mascara, errores, valores)
+
+
+def _filas_validadas(resultado, *argumentos, **opciones):
+    """Elementos procesados por validar_columnas(): largo de la máscara."""
+    return len(resultado[0])
+
+
+@instrumentar(elementos=_filas_validadas)
+def validar_columnas(columnas, categorias_validas, proveedores, procesos=1, tam_tramo=TAM_TRAMO):
+    """
+    Valida muchas filas a la vez. Recibe los valores en
+    texto agrupados por columna y aplica las mismas reglas
+    que las funciones de un solo valor. Los campos se
+    limpian con strip() y el código se pasa a mayúsculas
+    (un código vacío es válido: se asigna uno automático).
+
+    Parámetros:
+        columnas (dict): {columna: lista de textos} con las
+            claves de COLUMNAS_LOTE, todas del mismo largo
+        categorias_validas (set): Categorías permitidas
+        proveedores (tuple): Proveedores autorizados
+        procesos (int): Procesos para validar en paralelo
+            (1 = en el proceso actual)
+        tam_tramo (int): Filas por tramo en paralelo
+    Retorna:
+        tuple: (mascara, errores, valores) donde mascara es una
+        lista de bool, errores el código de error de cada fila
+        (None si es válida) y valores las columnas limpias y
+        convertidas (precio float, stock int; None si no son válidos)
+    """
+    precio_min, precio_max = limites_precio()
+    # Conjuntos congelados: búsqueda O(1) también para los proveedores
+    categorias_validas = frozenset(categorias_validas)
+    proveedores = frozenset(proveedores)
+    cantidad = len(columnas["codigo"])
+
+    if procesos <= 1 or cantidad <= tam_tramo:
+        return _validar_tramo((columnas, precio_min, precio_max, categorias_validas, proveedores))
+
+    tramos = [
+        ({clave: columnas[clave][inicio:inicio + tam_tramo] for clave in COLUMNAS_LOTE},
+         precio_min, precio_max, categorias_validas, proveedores)
+        for inicio in range(0, cantidad, tam_tramo)
+    ]
+    # Importar el pool solo aquí: es costoso y casi nunca se usa
+    from concurrent.futures import ProcessPoolExecutor
+
+    mascara = []
+    errores = []
+    valores = {clave: [] for clave in COLUMNAS_LOTE}
+    with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+        for mascara_tramo, errores_tramo, valores_tramo in ejecutor.map(_validar_tramo, tramos):
+            mascara.extend(mascara_tramo)
+            errores.extend(errores_tramo)
+            for clave in COLUMNAS_LOTE:
+                valores[clave].extend(valores_tramo[clave])
+    return (mascara, errores, valores)
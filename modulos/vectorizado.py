@@ -0,0 +1,165 @@
+"""
+============================================================
+Módulo: vectorizado.py
+============================================================
+Descripción: Cálculos de reportes vectorizados con NumPy.
+Trabaja sobre columnas (arreglos) en lugar de recorrer
+los productos uno por uno: máscaras para los umbrales
+de stock y bincount para agrupar por categoría.
+NumPy es opcional; si no está instalado, los reportes
+usan el cálculo en Python puro. Se importa recién la
+primera vez que se vectoriza: importarlo tarda más que
+muchos comandos completos.
+============================================================
+"""
+
+import importlib.util
+
+# NumPy es una dependencia opcional
+_INSTALADO = importlib.util.find_spec("numpy") is not None
+_np = None
+
+# Cantidad mínima de productos para que convenga vectorizar
+UMBRAL_VECTORIZADO = 10000
+
+
+def disponible():
+    """
+    Indica si NumPy está instalado.
+
+    Retorna:
+        bool: True si se puede usar el cálculo vectorizado
+    """
+    return _INSTALADO
+
+
+def _numpy():
+    """
+    Importa NumPy la primera vez que se necesita.
+
+    Retorna:
+        module: El módulo numpy
+    """
+    global _np
+    if _np is None:
+        import numpy
+        _np = numpy
+    return _np
+
+
+def conviene_vectorizar(inventario):
+    """
+    Decide si un inventario se procesa con NumPy: debe
+    estar instalado y el inventario debe ser grande.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+    Retorna:
+        bool: True si se debe usar el cálculo vectorizado
+    """
+    return _INSTALADO and len(inventario) >= UMBRAL_VECTORIZADO
+
+
+def extraer_columnas(inventario):
+    """
+    Obtiene las columnas del inventario como arreglos de
+    NumPy. Con un InventarioColumnar se copian sus columnas
+    (solo las filas vivas): una consulta no compacta el
+    almacenamiento, y una vista sobre los array impediría
+    agregar productos mientras existiera.
+
+    Parámetros:
+        inventario (dict): Diccionario de productos
+    Retorna:
+        dict: codigos (list), precios, stocks e ids_categoria
+        (arreglos) y categorias (list con el texto de cada id)
+    """
+    from modulos.columnar import InventarioColumnar
+    np = _numpy()
+    if isinstance(inventario, InventarioColumnar):
+        columnas = {
+            "codigos": list(inventario),
+            "precios": np.array(inventario.precios, dtype=np.float64),
+            "stocks": np.array(inventario.stocks, dtype=np.int64),
+            "ids_categoria": np.array(inventario.ids_categoria, dtype=np.uint32),
+            "categorias": list(inventario.categorias.textos)
+        }
+        if len(columnas["codigos"]) != len(columnas["precios"]):
+            vivas = np.array(inventario.filas_vivas(), dtype=np.intp)
+            for clave in ("precios", "stocks", "ids_categoria"):
+                columnas[clave] = columnas[clave][vivas]
+        return columnas
+
+    cantidad = len(inventario)
+    ids = {}
+    productos = inventario.values()
+    return {
+        "codigos": list(inventario),
+        "precios": np.fromiter((d["precio"] for d in productos), dtype=np.float64, count=cantidad),
+        "stocks": np.fromiter((d["stock"] for d in productos), dtype=np.int64, count=cantidad),
+        "ids_categoria": np.fromiter(
+            (ids.setdefault(d["categoria"], len(ids)) for d in productos),
+            dtype=np.uint32, count=cantidad
+        ),
+        "categorias": list(ids)
+    }
+
+
+def totales_por_categoria(columnas):
+    """
+    Calcula cantidad de productos, stock y valor por
+    categoría con np.bincount.
+
+    Parámetros:
+        columnas (dict): Resultado de extraer_columnas()
+    Retorna:
+        dict: {categoria: {productos, stock, valor, filas}}
+        donde filas son las posiciones de sus productos
+    """
+    np = _numpy()
+    ids = columnas["ids_categoria"]
+    tamano = len(columnas["categorias"])
+    stocks = columnas["stocks"]
+
+    productos = np.bincount(ids, minlength=tamano)
+    stock = np.bincount(ids, weights=stocks, minlength=tamano)
+    valor = np.bincount(ids, weights=columnas["precios"] * stocks, minlength=tamano)
+
+    # Posiciones agrupadas por categoría (orden estable)
+    orden = np.argsort(ids, kind="stable")
+    limites = np.cumsum(productos)
+
+    totales = {}
+    inicio = 0
+    for identificador, categoria in enumerate(columnas["categorias"]):
+        fin = int(limites[identificador])
+        if fin > inicio:
+            totales[categoria] = {
+                "productos": int(productos[identificador]),
+                "stock": int(stock[identificador]),
+                "valor": float(valor[identificador]),
+                "filas": orden[inicio:fin]
+            }
+        inicio = fin
+    return totales
+
+
+def clasificar_stock(columnas, stock_minimo):
+    """
+    Separa los productos sin stock y con stock bajo usando
+    máscaras booleanas, con el mismo criterio que el
+    cálculo en Python puro (stock 0 es sin stock; cualquier
+    otro valor menor al umbral, incluso negativo, es bajo).
+
+    Parámetros:
+        columnas (dict): Resultado de extraer_columnas()
+        stock_minimo (int): Umbral de stock bajo
+    Retorna:
+        tuple: (codigos_sin_stock, codigos_stock_bajo)
+    """
+    np = _numpy()
+    stocks = columnas["stocks"]
+    codigos = columnas["codigos"]
+    sin_stock = np.flatnonzero(stocks == 0)
+    stock_bajo = np.flatnonzero((stocks != 0) & (stocks < stock_minimo))
+    return ([codigos[i] for i in sin_stock], [codigos[i] for i in stock_bajo])
@@ -0,0 +1,136 @@
+"""
+============================================================
+Pruebas: almacenamiento.py (diario e instantáneas)
+============================================================
+"""
+
+import contextlib
+import copy
+import io
+import os
+import tempfile
+import unittest
+
+from modulos.almacenamiento import abrir_almacen, cerrar_almacen, ARCHIVO_DIARIO, SUFIJO_DANADO
+from modulos.cambios import insertar_producto, modificar_campo, quitar_producto
+from modulos.codigos import marca_actual
+from modulos.datos import inventario as inventario_inicial
+
+
+def nuevo_inventario():
+    """Copia independiente del inventario de ejemplo."""
+    return copy.deepcopy(inventario_inicial)
+
+
+def producto(nombre="Mouse Prueba", precio=15000.0, stock=10):
+    """Producto válido para las altas de las pruebas."""
+    return {"nombre": nombre, "precio": precio, "stock": stock,
+            "categoria": "Accesorios", "proveedor": "OfficeSupply"}
+
+
+class PruebasAlmacenamiento(unittest.TestCase):
+
+    def setUp(self):
+        self.carpeta = tempfile.TemporaryDirectory()
+        self.ruta = self.carpeta.name
+        self.diario = os.path.join(self.ruta, ARCHIVO_DIARIO)
+
+    def tearDown(self):
+        self.carpeta.cleanup()
+
+    def abrir(self, inventario=None, umbral=1000):
+        inventario = {} if inventario is None else inventario
+        self.addCleanup(cerrar_almacen, inventario)
+        return inventario, abrir_almacen(inventario, self.ruta, umbral)
+
+    def lineas_diario(self):
+        with open(self.diario, encoding="utf-8") as archivo:
+            return archivo.readlines()
+
+    def test_reproduce_el_diario_tras_un_corte(self):
+        inventario, _ = self.abrir(nuevo_inventario())
+        insertar_producto(inventario, "P900", producto())
+        modificar_campo(inventario, "P001", "stock", 3)
+        quitar_producto(inventario, "P002")
+        cerrar_almacen(inventario)
+        # Corte a mitad de una escritura: la última línea queda incompleta
+        with open(self.diario, "a", encoding="utf-8") as archivo:
+            archivo.write('{"n": 4, "op": "guardar", "codigo": "P9')
+
+        recuperado, almacen = self.abrir()
+        self.assertEqual(recuperado, inventario)
+        self.assertEqual(almacen["secuencia"], 3)
+        self.assertEqual(len(self.lineas_diario()), 3)
+
+        # Las escrituras nuevas no quedan pegadas a la línea recortada
+        insertar_producto(recuperado, "P901", producto("Teclado Prueba"))
+        cerrar_almacen(recuperado)
+        otra_vez, _ = self.abrir()
+        self.assertEqual(otra_vez, recuperado)
+        self.assertIn("P901", otra_vez)
+
+    def test_informa_y_recorta_una_linea_danada(self):
+        inventario, _ = self.abrir(nuevo_inventario())
+        for numero in range(4):
+            modificar_campo(inventario, "P001", "stock", numero)
+        cerrar_almacen(inventario)
+        lineas = self.lineas_diario()
+        lineas[1] = "{dañada\n"
+        with open(self.diario, "w", encoding="utf-8") as archivo:
+            archivo.writelines(lineas)
+
+        avisos = io.StringIO()
+        with contextlib.redirect_stderr(avisos):
+            recuperado, almacen = self.abrir()
+        self.assertEqual(almacen["descartadas"], 3)
+        self.assertIn("se descartaron 3 entrada(s)", avisos.getvalue())
+        self.assertEqual(recuperado["P001"]["stock"], 0)
+        self.assertTrue(os.path.exists(self.diario + SUFIJO_DANADO))
+
+        # Lo escrito después de la línea dañada se recupera
+        modificar_campo(recuperado, "P001", "stock", 77)
+        cerrar_almacen(recuperado)
+        otra_vez, almacen = self.abrir()
+        self.assertEqual(otra_vez["P001"]["stock"], 77)
+        self.assertEqual(almacen["descartadas"], 0)
+
+    def test_recuerda_codigos_eliminados_del_diario(self):
+        inventario, _ = self.abrir(nuevo_inventario())
+        insertar_producto(inventario, "P950", producto())
+        quitar_producto(inventario, "P950")
+        cerrar_almacen(inventario)
+
+        recuperado, _ = self.abrir()
+        self.assertNotIn("P950", recuperado)
+        self.assertGreaterEqual(marca_actual(recuperado), 950)
+
+    def test_compacta_al_llegar_al_umbral(self):
+        inventario, almacen = self.abrir(nuevo_inventario(), umbral=len(inventario_inicial) + 2)
+        umbral = almacen["umbral"]
+        for numero in range(umbral - 1):
+            modificar_campo(inventario, "P001", "stock", numero)
+        self.assertEqual(len(self.lineas_diario()), umbral - 1)
+
+        modificar_campo(inventario, "P001", "stock", 99)
+        self.assertEqual(self.lineas_diario(), [])
+        self.assertEqual(almacen["pendientes"], 0)
+
+        # La instantánea ya tiene todos los cambios
+        cerrar_almacen(inventario)
+        recuperado, _ = self.abrir()
+        self.assertEqual(recuperado, inventario)
+        self.assertEqual(recuperado["P001"]["stock"], 99)
+
+    def test_el_umbral_crece_con_el_inventario(self):
+        inventario, _ = self.abrir(nuevo_inventario(), umbral=2)
+        tamano = len(inventario)
+        for numero in range(tamano - 1):
+            modificar_campo(inventario, "P001", "stock", numero)
+        # Con umbral 2 no compacta: manda el tamaño del inventario
+        self.assertEqual(len(self.lineas_diario()), tamano - 1)
+        modificar_campo(inventario, "P001", "stock", 50)
+        self.assertEqual(self.lineas_diario(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
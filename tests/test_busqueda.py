@@ -0,0 +1,40 @@
+"""
+============================================================
+Pruebas: busqueda.py
+============================================================
+"""
+
+import copy
+import unittest
+
+from modulos.busqueda import buscar_por_nombre
+from modulos.cambios import insertar_producto
+from modulos.datos import inventario as inventario_inicial
+
+
+def producto(nombre):
+    """Producto válido con el nombre indicado."""
+    return {"nombre": nombre, "precio": 1500.0, "stock": 1,
+            "categoria": "Accesorios", "proveedor": "OfficeSupply"}
+
+
+class PruebasBusqueda(unittest.TestCase):
+
+    def setUp(self):
+        self.inventario = copy.deepcopy(inventario_inicial)
+
+    def test_empates_por_numero_de_codigo(self):
+        for codigo in ("P1000", "P999"):
+            insertar_producto(self.inventario, codigo, producto("Cable Igual"))
+        self.assertEqual(buscar_por_nombre(self.inventario, "cable igual"), ["P999", "P1000"])
+
+    def test_encuentra_palabras_que_contienen_la_consulta(self):
+        self.assertEqual(buscar_por_nombre(self.inventario, "tech"), ["P002", "P006"])
+        self.assertEqual(buscar_por_nombre(self.inventario, "mouse tech"), ["P002"])
+        # Prefijo antes que subcadena
+        insertar_producto(self.inventario, "P900", producto("Cable Techno"))
+        self.assertEqual(buscar_por_nombre(self.inventario, "tech")[0], "P900")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,35 @@
+"""
+============================================================
+Pruebas: cache_reportes.py
+============================================================
+"""
+
+import copy
+import unittest
+
+from modulos import servicios
+from modulos.cache_reportes import estadisticas_cache
+from modulos.cambios import modificar_campo
+from modulos.datos import inventario as inventario_inicial
+
+
+class PruebasCacheReportes(unittest.TestCase):
+
+    def setUp(self):
+        self.inventario = copy.deepcopy(inventario_inicial)
+
+    def test_parametros_por_nombre_y_por_defecto_comparten_clave(self):
+        calcular = servicios.calcular_reporte_stock_bajo
+        self.assertIs(calcular(self.inventario), calcular(self.inventario, None))
+        self.assertIs(calcular(self.inventario, 5), calcular(self.inventario, stock_minimo=5))
+        estadisticas = estadisticas_cache(self.inventario)
+        self.assertEqual((estadisticas["aciertos"], estadisticas["entradas"]), (2, 2))
+
+    def test_una_mutacion_vence_el_reporte(self):
+        anterior = servicios.calcular_reporte_stock_bajo(self.inventario, stock_minimo=5)
+        modificar_campo(self.inventario, "P001", "stock", 0)
+        self.assertIsNot(servicios.calcular_reporte_stock_bajo(self.inventario, stock_minimo=5), anterior)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+"""
+============================================================
+Pruebas: cambios.py (registro de estructuras auxiliares)
+============================================================
+"""
+
+import copy
+import gc
+import unittest
+
+from modulos import cambios
+from modulos.cambios import Inventario, obtener_auxiliar, liberar_auxiliares
+from modulos.datos import inventario as inventario_inicial
+from modulos.indices import obtener_indice_precios
+
+
+class PruebasAuxiliares(unittest.TestCase):
+
+    def test_la_copia_del_inventario_admite_referencias_debiles(self):
+        self.assertIsInstance(copy.deepcopy(inventario_inicial), Inventario)
+
+    def test_se_liberan_con_el_inventario(self):
+        inventario = Inventario(copy.deepcopy(inventario_inicial))
+        obtener_indice_precios(inventario)
+        identificador = id(inventario)
+        self.assertIn(identificador, cambios._auxiliares)
+        del inventario
+        gc.collect()
+        self.assertNotIn(identificador, cambios._auxiliares)
+
+    def test_dict_comun_se_libera_a_mano(self):
+        inventario = dict(inventario_inicial)
+        obtener_indice_precios(inventario)
+        liberar_auxiliares(inventario)
+        self.assertIsNone(obtener_auxiliar(inventario, "precios"))
+        self.assertNotIn(id(inventario), cambios._auxiliares)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+"""
+============================================================
+Pruebas: eventos.py (sumidero en archivo)
+============================================================
+"""
+
+import copy
+import os
+import tempfile
+import threading
+import unittest
+
+from modulos.cambios import modificar_campo
+from modulos.datos import inventario as inventario_inicial
+from modulos.eventos import conectar_archivo, desconectar_archivo, tomar_error, leer_eventos
+
+
+class ArchivoRoto:
+    """Archivo cuya escritura siempre falla (disco lleno)."""
+
+    def write(self, texto):
+        raise OSError("No queda espacio en el disco")
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class PruebasSumideroArchivo(unittest.TestCase):
+
+    def setUp(self):
+        self.carpeta = tempfile.TemporaryDirectory()
+        self.addCleanup(self.carpeta.cleanup)
+        self.ruta = os.path.join(self.carpeta.name, "eventos.jsonl")
+        self.inventario = copy.deepcopy(inventario_inicial)
+
+    def cerrar_con_limite(self, suscripcion, segundos=5):
+        """Cierra el sumidero en otro hilo; falla si no termina a tiempo."""
+        resultado = []
+
+        def cerrar():
+            try:
+                desconectar_archivo(self.inventario, *suscripcion)
+            except Exception as error:
+                resultado.append(error)
+
+        hilo = threading.Thread(target=cerrar, daemon=True)
+        hilo.start()
+        hilo.join(segundos)
+        self.assertFalse(hilo.is_alive(), "cerrar() quedó esperando al escritor")
+        return resultado
+
+    def test_escribe_los_eventos_al_cerrar(self):
+        suscripcion = conectar_archivo(self.inventario, self.ruta, intervalo=0.01)
+        modificar_campo(self.inventario, "P001", "stock", 3)
+        self.assertEqual(self.cerrar_con_limite(suscripcion), [])
+        eventos = list(leer_eventos(self.ruta))
+        self.assertEqual([evento["cambios"] for evento in eventos], [{"stock": [8, 3]}])
+
+    def test_falla_en_el_ultimo_lote_no_cuelga_cerrar(self):
+        suscripcion = conectar_archivo(self.inventario, self.ruta, intervalo=60)
+        suscripcion[1]._archivo.close()
+        suscripcion[1]._archivo = ArchivoRoto()
+        modificar_campo(self.inventario, "P001", "stock", 3)
+        errores = self.cerrar_con_limite(suscripcion)
+        self.assertEqual(len(errores), 1)
+        self.assertIsInstance(errores[0], OSError)
+
+    def test_falla_de_escritura_se_informa_a_quien_modifica(self):
+        suscripcion = conectar_archivo(self.inventario, self.ruta, intervalo=0.01)
+        sumidero = suscripcion[1]
+        sumidero._archivo.close()
+        sumidero._archivo = ArchivoRoto()
+        modificar_campo(self.inventario, "P001", "stock", 3)
+        with self.assertRaises(OSError):
+            sumidero.vaciar()
+        self.assertIsNone(tomar_error(self.inventario))
+
+        modificar_campo(self.inventario, "P001", "stock", 4)
+        cantidad, error = tomar_error(self.inventario)
+        self.assertEqual(cantidad, 1)
+        self.assertIsInstance(error, OSError)
+        self.assertEqual(self.inventario["P001"]["stock"], 4)
+        self.assertIsNone(tomar_error(self.inventario))
+        self.assertEqual(len(self.cerrar_con_limite(suscripcion)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+"""
+============================================================
+Pruebas: indices.py (índice de precios)
+============================================================
+"""
+
+import bisect
+import copy
+import random
+import unittest
+
+from modulos.cambios import insertar_producto, modificar_campo, quitar_producto
+from modulos.datos import inventario as inventario_inicial
+from modulos.indices import (
+    ListaOrdenada,
+    obtener_indice_precios,
+    productos_en_rango,
+    productos_mas_caros,
+    productos_mas_baratos,
+    percentil_precio
+)
+
+
+class ListaChica(ListaOrdenada):
+    """Bloques chicos para que las pruebas partan y unan bloques."""
+    CARGA = 4
+
+
+class PruebasListaOrdenada(unittest.TestCase):
+
+    def test_se_comporta_como_una_lista_ordenada(self):
+        azar = random.Random(7)
+        esperada = sorted(azar.randrange(200) for _ in range(60))
+        lista = ListaChica(esperada)
+        for _ in range(2000):
+            if esperada and azar.random() < 0.45:
+                valor = azar.choice(esperada)
+                esperada.remove(valor)
+                lista.quitar(valor)
+            else:
+                valor = azar.randrange(200)
+                bisect.insort(esperada, valor)
+                lista.agregar(valor)
+            valor = azar.randrange(-5, 205)
+            self.assertEqual(lista.bisect_left(valor), bisect.bisect_left(esperada, valor))
+            self.assertEqual(lista.bisect_right(valor), bisect.bisect_right(esperada, valor))
+            inicio, fin = sorted(azar.randrange(-3, len(esperada) + 3) for _ in range(2))
+            self.assertEqual(lista[inicio:fin], esperada[inicio:fin])
+        self.assertEqual(list(lista), esperada)
+        self.assertEqual(len(lista), len(esperada))
+        self.assertEqual(lista[-1], esperada[-1])
+        with self.assertRaises(ValueError):
+            lista.quitar(500)
+
+
+class PruebasIndicePrecios(unittest.TestCase):
+
+    def setUp(self):
+        self.inventario = copy.deepcopy(inventario_inicial)
+
+    def test_sigue_los_cambios_del_inventario(self):
+        obtener_indice_precios(self.inventario)
+        modificar_campo(self.inventario, "P001", "precio", 10.0)
+        quitar_producto(self.inventario, "P002")
+        insertar_producto(self.inventario, "P900", {"nombre": "Cable", "precio": 15.0, "stock": 1,
+                                                    "categoria": "Accesorios", "proveedor": "OfficeSupply"})
+        por_precio = sorted(self.inventario, key=lambda c: (self.inventario[c]["precio"], c))
+        self.assertEqual(productos_en_rango(self.inventario), por_precio)
+        self.assertEqual(productos_mas_baratos(self.inventario, 2), por_precio[:2])
+        self.assertEqual(productos_en_rango(self.inventario, 10.0, 15.0), ["P001", "P900"])
+        self.assertEqual(percentil_precio(self.inventario, 0), 10.0)
+
+    def test_mas_caros_desempata_por_codigo(self):
+        for codigo in ("P010", "P009", "P100", "P011"):
+            insertar_producto(self.inventario, codigo, {"nombre": "Igual", "precio": 2000000.0, "stock": 1,
+                                                        "categoria": "Accesorios", "proveedor": "OfficeSupply"})
+        self.assertEqual(productos_mas_caros(self.inventario, 2), ["P009", "P010"])
+        self.assertEqual(productos_mas_caros(self.inventario, 5), ["P009", "P010", "P011", "P100", "P001"])
+
+
+if __name__ == "__main__":
+    unittest.main()
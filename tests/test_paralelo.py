@@ -0,0 +1,35 @@
+"""
+============================================================
+Pruebas: paralelo.py y reporte ... procesos=N del lote
+============================================================
+"""
+
+import copy
+import io
+import unittest
+
+from modulos.datos import inventario as inventario_inicial
+from modulos.lotes import ejecutar_lote
+from modulos.paralelo import particionar, calcular_reportes_paralelo, PARTICION_CATEGORIA
+
+
+class PruebasParalelo(unittest.TestCase):
+
+    def setUp(self):
+        self.inventario = copy.deepcopy(inventario_inicial)
+
+    def test_inventario_vacio(self):
+        self.assertEqual(particionar({}, 4), ([], []))
+        self.assertEqual(particionar({}, 4, PARTICION_CATEGORIA), ([], []))
+        self.assertIsNone(calcular_reportes_paralelo({}, 2)["valor"])
+
+    def test_lote_en_paralelo_igual_al_secuencial(self):
+        for reporte in ("categorias", "stock-bajo", "valor"):
+            secuencial, paralelo = io.StringIO(), io.StringIO()
+            ejecutar_lote(self.inventario, [f"reporte {reporte}"], salida=secuencial)
+            ejecutar_lote(self.inventario, [f"reporte {reporte} procesos=2 por=categoria"], salida=paralelo)
+            self.assertEqual(paralelo.getvalue(), secuencial.getvalue(), reporte)
+
+
+if __name__ == "__main__":
+    unittest.main()
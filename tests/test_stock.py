@@ -0,0 +1,192 @@
+"""
+============================================================
+Pruebas: stock.py y las rutas de stock del servidor
+============================================================
+"""
+
+import asyncio
+import contextlib
+import copy
+import io
+import threading
+import unittest
+
+from modulos import masivo, servicios, stock
+from modulos.lotes import ejecutar_lote
+from modulos.datos import inventario as inventario_inicial
+from modulos.servidor import ServidorInventario, solicitar
+
+
+def nuevo_inventario():
+    """Copia independiente del inventario de ejemplo."""
+    return copy.deepcopy(inventario_inicial)
+
+
+class PruebasReservas(unittest.TestCase):
+
+    def setUp(self):
+        self.inventario = nuevo_inventario()
+        self.inventario["P001"]["stock"] = 5
+
+    def test_confirmar_descuenta_stock(self):
+        _, id_reserva = stock.reservar(self.inventario, "P001", 2)
+        self.assertEqual(stock.confirmar(self.inventario, id_reserva), (True, 3))
+        self.assertEqual(stock.consultar_stock(self.inventario, "P001")["reservado"], 0)
+
+    def test_no_reserva_mas_que_lo_disponible(self):
+        self.assertTrue(stock.reservar(self.inventario, "P001", 4)[0])
+        es_valido, mensaje = stock.reservar(self.inventario, "P001", 2)
+        self.assertFalse(es_valido)
+        self.assertIn("Stock insuficiente", mensaje)
+
+    def test_fijar_no_deja_menos_que_lo_reservado(self):
+        stock.reservar(self.inventario, "P001", 5)
+        self.assertFalse(stock.fijar(self.inventario, "P001", 1)[0])
+        self.assertEqual(self.inventario["P001"]["stock"], 5)
+        self.assertEqual(stock.fijar(self.inventario, "P001", 7), (True, 7))
+
+    def test_actualizar_stock_desde_el_menu_respeta_reservas(self):
+        stock.reservar(self.inventario, "P001", 5)
+        es_valido, _ = servicios.actualizar_campo(self.inventario, "P001", "stock", "1")
+        self.assertFalse(es_valido)
+        self.assertEqual(self.inventario["P001"]["stock"], 5)
+
+    def test_confirmar_no_deja_stock_negativo(self):
+        _, id_reserva = stock.reservar(self.inventario, "P001", 5)
+        # Escritura directa al diccionario, que saltea stock.py
+        self.inventario["P001"]["stock"] = 1
+        es_valido, _ = stock.confirmar(self.inventario, id_reserva)
+        self.assertFalse(es_valido)
+        self.assertEqual(self.inventario["P001"]["stock"], 1)
+        # La reserva sigue vigente y se puede liberar
+        self.assertEqual(stock.liberar(self.inventario, id_reserva), (True, 5))
+
+    def test_actualizacion_masiva_respeta_reservas(self):
+        stock.reservar(self.inventario, "P001", 5)
+        resultado = masivo.actualizar_en_masa(self.inventario, "stock", "fijar", 0)
+        self.assertFalse(resultado.aplicado)
+        self.assertEqual([codigo for codigo, _ in resultado.errores], ["P001"])
+        self.assertEqual(self.inventario["P001"]["stock"], 5)
+        self.assertEqual(stock.consultar_stock(self.inventario, "P001")["disponible"], 0)
+
+    def test_reserva_despues_de_simular_revierte_la_masiva(self):
+        resultado = masivo.actualizar_en_masa(self.inventario, "stock", "fijar", 1, simular=True)
+        # El último con stock para reservar: los anteriores ya se aplicaron y se revierten
+        ultimo = [codigo for codigo, anterior, _ in resultado.cambios if anterior >= 2][-1]
+        self.assertNotEqual(ultimo, resultado.cambios[0][0])
+        self.assertTrue(stock.reservar(self.inventario, ultimo, 2)[0])
+        anteriores = {codigo: datos["stock"] for codigo, datos in self.inventario.items()}
+        with self.assertRaises(ValueError):
+            masivo.aplicar_cambios(self.inventario, "stock", resultado.cambios)
+        self.assertEqual({codigo: datos["stock"] for codigo, datos in self.inventario.items()},
+                         anteriores)
+
+    def test_lote_con_stock_bajo_lo_reservado_falla(self):
+        stock.reservar(self.inventario, "P001", 5)
+        avisos = io.StringIO()
+        with contextlib.redirect_stderr(avisos):
+            errores = ejecutar_lote(self.inventario, ["actualizar P001 nombre=Otro stock=1"],
+                                    salida=io.StringIO())
+        self.assertEqual(errores, 1)
+        self.assertIn("Stock insuficiente", avisos.getvalue())
+        self.assertEqual(self.inventario["P001"]["stock"], 5)
+        self.assertEqual(self.inventario["P001"]["nombre"], "Laptop Dell XPS")
+
+    def test_stock_fuera_de_64_bits_se_rechaza(self):
+        # Más de lo que entra en el array("q") de las instantáneas
+        es_valido, _ = servicios.actualizar_campo(self.inventario, "P001", "stock", "99999999999999999999")
+        self.assertFalse(es_valido)
+        self.assertFalse(stock.ajustar(self.inventario, "P001", 2 ** 63)[0])
+        resultado = masivo.actualizar_en_masa(self.inventario, "stock", "sumar", 2 ** 63)
+        self.assertFalse(resultado.aplicado)
+        self.assertEqual(self.inventario["P001"]["stock"], 5)
+
+    def test_version_distinta_se_rechaza(self):
+        version = stock.consultar_stock(self.inventario, "P001")["version"]
+        stock.ajustar(self.inventario, "P001", 1)
+        self.assertEqual(stock.ajustar(self.inventario, "P001", -1, version),
+                         (False, stock.MENSAJE_VERSION))
+        self.assertEqual(stock.reservar(self.inventario, "P001", 1, version),
+                         (False, stock.MENSAJE_VERSION))
+
+    def test_reservas_concurrentes_no_venden_de_mas(self):
+        self.inventario["P001"]["stock"] = 100
+        confirmadas = []
+
+        def vender():
+            for _ in range(50):
+                es_valido, id_reserva = stock.reservar(self.inventario, "P001", 1)
+                if es_valido and stock.confirmar(self.inventario, id_reserva)[0]:
+                    confirmadas.append(id_reserva)
+
+        hilos = [threading.Thread(target=vender) for _ in range(8)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        self.assertEqual(len(confirmadas), 100)
+        self.assertEqual(self.inventario["P001"]["stock"], 0)
+
+
+class PruebasServidorStock(unittest.TestCase):
+
+    def ejecutar(self, *solicitudes):
+        """Levanta un servidor en un puerto libre y envía las solicitudes en orden."""
+        async def probar():
+            servidor = ServidorInventario(nuevo_inventario())
+            puerto = await servidor.iniciar(puerto=0)
+            respuestas = []
+            try:
+                for metodo, ruta, datos in solicitudes:
+                    respuestas.append(await solicitar(metodo, ruta, datos, puerto=puerto))
+            finally:
+                await servidor.detener()
+            return respuestas
+        return asyncio.run(probar())
+
+    def test_version_distinta_responde_409(self):
+        respuestas = self.ejecutar(
+            ("POST", "/productos/P001/stock", {"cantidad": 1}),
+            ("POST", "/productos/P001/stock", {"cantidad": -1, "version": 0})
+        )
+        self.assertEqual(respuestas[0][0], 200)
+        self.assertEqual(respuestas[1][0], 409)
+
+    def test_patch_stock_bajo_lo_reservado_responde_409(self):
+        respuestas = self.ejecutar(
+            ("POST", "/productos/P001/reservas", {"cantidad": 8}),
+            ("PATCH", "/productos/P001", {"stock": 1, "nombre": "Otro nombre"}),
+            ("GET", "/productos/P001", None)
+        )
+        self.assertEqual(respuestas[0][0], 201)
+        self.assertEqual(respuestas[1][0], 409)
+        producto = respuestas[2][1]
+        self.assertEqual(producto["stock"], 8)
+        self.assertEqual(producto["nombre"], "Laptop Dell XPS")
+
+    def test_content_length_no_valido_responde_400(self):
+        async def enviar(largo):
+            servidor = ServidorInventario(nuevo_inventario())
+            puerto = await servidor.iniciar(puerto=0)
+            try:
+                lector, escritor = await asyncio.open_connection("127.0.0.1", puerto)
+                escritor.write(f"POST /productos HTTP/1.1\r\nContent-Length: {largo}\r\n\r\n".encode())
+                linea = await lector.readline()
+                escritor.close()
+                await escritor.wait_closed()
+                return linea
+            finally:
+                await servidor.detener()
+        for largo in ("abc", "-5"):
+            self.assertTrue(asyncio.run(enviar(largo)).startswith(b"HTTP/1.1 400"), largo)
+
+    def test_stock_minimo_cero_no_usa_los_umbrales(self):
+        respuestas = self.ejecutar(
+            ("GET", "/reportes/stock-bajo", None),
+            ("GET", "/reportes/stock-bajo?stock_minimo=0", None)
+        )
+        self.assertNotEqual(respuestas[0][1], respuestas[1][1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,37 @@
+"""
+============================================================
+Pruebas: validaciones.py (reglas de precio y stock)
+============================================================
+"""
+
+import unittest
+
+from modulos.validaciones import (
+    ERROR_PRECIO_FORMATO,
+    ERROR_STOCK_FORMATO,
+    ERROR_STOCK_MAXIMO,
+    regla_precio,
+    regla_stock
+)
+
+
+class PruebasReglas(unittest.TestCase):
+
+    def test_precio_que_no_es_numero(self):
+        for valor in (None, "abc", "nan", 10 ** 400):
+            self.assertEqual(regla_precio(valor, 1, 10), (ERROR_PRECIO_FORMATO, None), valor)
+        self.assertEqual(regla_precio("5.5", 1, 10), (None, 5.5))
+
+    def test_stock_con_decimales_no_se_trunca(self):
+        for valor in (5.7, "5.7", None, float("inf")):
+            self.assertEqual(regla_stock(valor), (ERROR_STOCK_FORMATO, None), valor)
+        self.assertEqual(regla_stock(5.0), (None, 5))
+        self.assertEqual(regla_stock(" 12 "), (None, 12))
+
+    def test_stock_fuera_de_64_bits(self):
+        self.assertEqual(regla_stock("99999999999999999999"), (ERROR_STOCK_MAXIMO, None))
+        self.assertEqual(regla_stock(str(2 ** 63 - 1)), (None, 2 ** 63 - 1))
+
+
+if __name__ == "__main__":
+    unittest.main()